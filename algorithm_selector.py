@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+"""
+Sujet  :  Coloration de graphes appliquée à la France
+Choix automatique de l'algorithme à partir des caractéristiques du graphe
+et de l'historique des résultats
+"""
+
+# Import libs
+import inspect
+import json
+import numpy as np
+import pandas as pd
+
+from app.AntColonyAlgorithm import AntColonyAlgorithm
+from app.GeneticAlgorithm import GeneticAlgorithm
+from app.HybridEvolutionaryAlgorithm import HybridEvolutionaryAlgorithm
+from app.IslandGeneticAlgorithm import IslandGeneticAlgorithm
+from app.PSOAlgorithm import PSOAlgorithm
+from app.ParallelMinConflictsAlgorithm import ParallelMinConflictsAlgorithm
+from app.ParallelTemperingAlgorithm import ParallelTemperingAlgorithm
+from app.PartialColAlgorithm import PartialColAlgorithm
+from app.SimulatedAnnealingAlgorithm import SimulatedAnnealingAlgorithm
+from app.TabuSearchAlgorithm import TabuSearchAlgorithm
+from results_statistics import aggregate_results, get_results_version
+from utils import get_adjacency_lists, get_max_clique, read_results_from_csv
+
+# Classes behind each name of the app, the first one accepting the recorded parameters is used
+ALGORITHM_CLASSES = {
+    'Recuit simulé': (SimulatedAnnealingAlgorithm, ParallelTemperingAlgorithm),
+    'Algorithme génétique': (GeneticAlgorithm, IslandGeneticAlgorithm),
+    'ACO': (AntColonyAlgorithm,),
+    'Recherche tabou': (TabuSearchAlgorithm,),
+    'PSO': (PSOAlgorithm,),
+    'Hybride évolutionnaire': (HybridEvolutionaryAlgorithm,),
+    'Min-conflits parallèle': (ParallelMinConflictsAlgorithm,),
+    'Coloration partielle (PartialCol)': (PartialColAlgorithm,),
+}
+
+# Default parameters of the app, for the results saved without their parameters
+DEFAULT_PARAMETERS = {
+    'Recuit simulé': {'initial_temperature': None, 'factor': None, 'iterations': 50000},
+    'Algorithme génétique': {'pop_size': 50, 'nb_generations': 500, 'mutation_rate': 0.5, 'crossover_rate': 0.8},
+    'ACO': {'evaporation_rate': 0.5, 'alpha': 1.0, 'beta': 3.0, 'nb_iterations': 100, 'pheromone_quantity': 10.0},
+    'Recherche tabou': {'max_iterations': 500, 'tabu_tenure': 5},
+    'PSO': {'max_iterations': 100, 'swarm_size': 30, 'inertia_weight': 0.7, 'cognitive_weight': 1.5, 'social_weight': 1.5},
+    'Hybride évolutionnaire': {'pop_size': 10, 'nb_generations': 500, 'tabu_iterations': 1000, 'tabu_tenure': 10},
+    'Min-conflits parallèle': {'max_iterations': 5000, 'tabu_tenure': 10, 'noise': 0.05},
+    'Coloration partielle (PartialCol)': {'max_iterations': 5000, 'tabu_tenure': 10, 'tabu_factor': 0.6},
+}
+
+# Algorithms whose default parameters have changed: their results saved without parameters
+# were run with the old defaults, which can not be created anymore, and are not used by the selector
+LEGACY_DEFAULTS = ('Recuit simulé',)
+
+# Used when no result is available yet
+FALLBACK_ALGORITHM = 'Coloration partielle (PartialCol)'
+
+FEATURES = ['nb_nodes', 'density', 'mean_degree', 'max_degree', 'degree_std', 'degeneracy', 'clique_size']
+
+def get_degeneracy(adjacency_matrix: np.ndarray) -> int:
+    """
+    Computes the degeneracy of the graph, ie. the largest k such that the graph has a
+    k-core, by removing all the nodes of degree at most k at once until none is left.
+
+    Returns:
+        int: The degeneracy, an upper bound of the chromatic number minus one.
+    """
+    indptr, indices = get_adjacency_lists(adjacency_matrix)
+    rows = np.repeat(np.arange(len(adjacency_matrix)), np.diff(indptr))
+    degrees = np.diff(indptr)
+    alive = np.ones(len(degrees), dtype=bool)
+
+    k = 0
+    while alive.any():
+        k = max(k, int(degrees[alive].min()))
+        removed = alive & (degrees <= k)
+        while removed.any():
+            alive &= ~removed
+            # Each removed node lowers the degree of its neighbours
+            lost = removed[indices]
+            np.subtract.at(degrees, rows[lost], 1)
+            removed = alive & (degrees <= k)
+    return k
+
+def get_graph_features(adjacency_matrix: np.ndarray) -> dict[str, float]:
+    """
+    Computes cheap features describing a graph.
+
+    Args:
+        adjacency_matrix (np.ndarray): The adjacency matrix of the graph.
+
+    Returns:
+        dict[str, float]: The number of nodes, the density, the mean, maximum and standard
+                          deviation of the degrees, the degeneracy and the size of the
+                          largest clique found.
+    """
+    nb_nodes = len(adjacency_matrix)
+    degrees = (adjacency_matrix == 1).sum(axis=1)
+    return {
+        'nb_nodes': nb_nodes,
+        'density': float(degrees.sum() / max(nb_nodes * (nb_nodes - 1), 1)),
+        'mean_degree': float(degrees.mean()) if nb_nodes else 0.0,
+        'max_degree': int(degrees.max()) if nb_nodes else 0,
+        'degree_std': float(degrees.std()) if nb_nodes else 0.0,
+        'degeneracy': get_degeneracy(adjacency_matrix),
+        'clique_size': len(get_max_clique(adjacency_matrix)),
+    }
+
+def save_graph_features(map_choice: str, features: dict[str, float], file_path: str = 'data/graph_features.json') -> None:
+    """
+    Saves the features of a map, so that its results can be used for similar graphs.
+
+    Args:
+        map_choice (str): The name of the map.
+        features (dict[str, float]): The features returned by `get_graph_features`.
+        file_path (str): The path of the JSON file.
+
+    Returns:
+        None
+    """
+    all_features = read_graph_features(file_path)
+    if all_features.get(map_choice) == features:
+        return
+    all_features[map_choice] = features
+    with open(file_path, mode='w', encoding='utf-8') as file:
+        json.dump(all_features, file, indent=4, ensure_ascii=False)
+
+def read_graph_features(file_path: str = 'data/graph_features.json') -> dict[str, dict[str, float]]:
+    """
+    Reads the features of the maps saved by `save_graph_features`.
+
+    Returns:
+        dict[str, dict[str, float]]: The features of each map.
+    """
+    try:
+        with open(file_path, encoding='utf-8') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+
+def create_algorithm(name: str, parameters: dict, adjacency_matrix: np.ndarray, max_colors: int):
+    """
+    Creates an algorithm of the app from its name and its recorded parameters.
+
+    Args:
+        name (str): The name of the algorithm in the app, eg. 'Recherche tabou'.
+        parameters (dict): The parameters of the algorithm, the defaults of the app when empty.
+        adjacency_matrix (np.ndarray): The adjacency matrix of the graph.
+        max_colors (int): The number of colors.
+
+    Returns:
+        The algorithm, ready to be launched.
+    """
+    parameters = dict(parameters or DEFAULT_PARAMETERS[name])
+    parameters.pop('max_colors', None)
+    for algorithm_class in ALGORITHM_CLASSES[name]:
+        accepted = inspect.signature(algorithm_class).parameters
+        if set(parameters) <= set(accepted):
+            break
+
+    # Parameters recorded without some required arguments, eg. by an older version of the
+    # app, get the defaults of the app
+    for argument, value in DEFAULT_PARAMETERS[name].items():
+        if argument in accepted and accepted[argument].default is inspect.Parameter.empty:
+            parameters.setdefault(argument, value)
+
+    kwargs = dict(parameters, adjacency_matrix=adjacency_matrix, max_colors=max_colors)
+    if 'nb_nodes' in accepted:
+        kwargs['nb_nodes'] = len(adjacency_matrix)
+    return algorithm_class(**kwargs)
+
+
+class AlgorithmSelector:
+    # Summaries of the results, by version of the results and features files
+    _history_cache: dict[tuple, pd.DataFrame] = {}
+
+    def __init__(
+            self,
+            results_path: str = 'data/results.csv',
+            features_path: str = 'data/graph_features.json',
+            min_success_rate: float = 0.5
+        ):
+        """
+        Chooses the algorithm and parameters expected to be the fastest on a graph.
+
+        The runs of each (map, algorithm, parameters) configuration are summarized by
+        their expected time to reach 0 conflicts when restarting after each failure,
+        ie. the median time divided by the success rate. For a new graph, the map whose
+        features are the closest (on a logarithmic scale) is looked up and its best
+        configuration is returned. The summaries are cached until the results change,
+        so a selection only costs a distance computation.
+
+        Args:
+            results_path (str): The path of the results file.
+            features_path (str): The path of the features of the maps.
+            min_success_rate (float): The configurations less reliable than this are only
+                                      chosen when no other one is available.
+        """
+        self.results_path: str = results_path
+        self.features_path: str = features_path
+        self.min_success_rate: float = min_success_rate
+
+    def get_history(self) -> pd.DataFrame:
+        """
+        Returns the summary of each configuration with the features of its map,
+        recomputed only when the results or the features have changed. The results of
+        `LEGACY_DEFAULTS` saved without parameters are left out.
+
+        Returns:
+            pd.DataFrame: One row per (map, algorithm, parameters) with its statistics
+                          (see `aggregate_results`), its expected time and the features of the map.
+        """
+        key = (get_results_version(self.results_path), get_results_version(self.features_path))
+        history = self._history_cache.get(key)
+        if history is not None:
+            return history
+
+        results = read_results_from_csv(self.results_path)
+        parameters = results['Parameters'].fillna("") if 'Parameters' in results else pd.Series("", index=results.index)
+        results = results[~(results['Algorithm'].isin(LEGACY_DEFAULTS) & (parameters == ""))]
+        if results.empty:
+            return pd.DataFrame()  # `select` falls back to FALLBACK_ALGORITHM
+        summary = aggregate_results(results)
+        summary = summary[summary['Algorithm'].isin(ALGORITHM_CLASSES)]
+        summary = summary.assign(**{
+            'Expected time': np.where(
+                summary['Success rate'] > 0,
+                summary['Time median'] / summary['Success rate'].where(summary['Success rate'] > 0, 1),
+                np.inf
+            )
+        })
+        features = pd.DataFrame.from_dict(read_graph_features(self.features_path), orient='index', columns=FEATURES)
+        history = summary.join(features, on='Map', how='inner').reset_index(drop=True)
+
+        self._history_cache.clear()
+        self._history_cache[key] = history
+        return history
+
+    def select(self, features: dict[str, float]) -> tuple[str, dict, str]:
+        """
+        Chooses an algorithm for a graph.
+
+        Args:
+            features (dict[str, float]): The features of the graph (see `get_graph_features`).
+
+        Returns:
+            tuple[str, dict, str]: The name of the algorithm in the app, its parameters
+                                   (empty for the defaults of the app) and the reason of the choice.
+        """
+        history = self.get_history()
+        if history.empty:
+            return FALLBACK_ALGORITHM, {}, "aucun résultat enregistré"
+
+        # Closest benchmarked map on a logarithmic scale of the features
+        maps = history.drop_duplicates('Map')
+        distances = np.linalg.norm(
+            np.log1p(maps[FEATURES].to_numpy(dtype=float)) - np.log1p(np.array([features[f] for f in FEATURES], dtype=float)),
+            axis=1
+        )
+        map_name = maps['Map'].iloc[int(np.argmin(distances))]
+        candidates = history[history['Map'] == map_name]
+
+        reliable = candidates[candidates['Success rate'] >= self.min_success_rate]
+        if not reliable.empty:
+            best = reliable.loc[reliable['Expected time'].idxmin()]
+            reason = f"le plus rapide sur '{map_name}' ({best['Time median']:.2f} s médian, {best['Success rate']:.0%} de succès)"
+        else:
+            best = candidates.loc[candidates['Conflicts median'].idxmin()]
+            reason = f"le moins de conflits sur '{map_name}' ({best['Conflicts median']:.0f} en médiane)"
+
+        parameters = json.loads(best['Parameters']) if best['Parameters'] else {}
+        return best['Algorithm'], parameters, reason
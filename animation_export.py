@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+Sujet  :  Coloration de graphes appliquée à la France
+Export des solutions successives d'un algorithme en images et en animation
+"""
+
+# Import libs
+import os
+from concurrent.futures import ProcessPoolExecutor
+import geopandas as gpd
+import matplotlib.pyplot as plt
+from matplotlib.colors import to_rgba_array
+import numpy as np
+from PIL import Image
+
+from geo_environment import BORDER_COLOR, COLORS_LIST, NO_COLOR
+
+# Figure of the worker process, created once and reused for every frame
+_frame_figure = None
+
+class FrameFigure:
+    def __init__(self, geometries: gpd.GeoSeries, title: str, colors_list: list[str]):
+        """
+        Draws the map once. Rendering a frame then only updates the face colors of
+        the polygons and saves the figure.
+
+        Args:
+            geometries (gpd.GeoSeries): The geometry of each node, in the order of the solutions.
+            title (str): The title of the figure.
+            colors_list (list[str]): The color of each color index.
+        """
+        self.fig, self.ax = plt.subplots(1, 1, figsize=(10, 10))
+        gpd.GeoDataFrame(geometry=geometries.reset_index(drop=True)).plot(
+            ax=self.ax, color=NO_COLOR, edgecolor=BORDER_COLOR
+        )
+        self.ax.set_title(title, fontsize=16)
+        self.ax.axis('off')
+        self.ax.set_aspect('auto')
+        self.label = self.fig.text(0.5, 0.05, "", ha="center", fontsize=14)
+
+        # geopandas draws one path per geometry, a MultiPolygon being a single compound path,
+        # so the face colors are given in the order of the nodes
+        self.collection = self.ax.collections[0]
+        assert len(self.collection.get_paths()) == len(geometries), "Expected one drawn path per geometry"
+        self.palette: np.ndarray = to_rgba_array(colors_list)
+
+    def render(self, solution: list[int], path: str, label: str = None) -> None:
+        """
+        Colors the map with a solution and saves it.
+
+        Args:
+            solution (list[int]): The color of each node.
+            path (str): The path of the image.
+            label (str): An optional text shown under the title, eg. the number of conflicts.
+
+        Returns:
+            None
+        """
+        self.collection.set_facecolor(self.palette[np.asarray(solution)])
+        self.label.set_text(label or "")
+        self.fig.savefig(path)
+
+
+def _init_worker(geometries: gpd.GeoSeries, title: str, colors_list: list[str]) -> None:
+    global _frame_figure
+    _frame_figure = FrameFigure(geometries, title, colors_list)
+
+def _render_batch(batch: list[tuple[list[int], str, str]]) -> list[str]:
+    for solution, path, label in batch:
+        _frame_figure.render(solution, path, label)
+    return [path for _, path, _ in batch]
+
+
+def render_frames(
+        geometries: gpd.GeoSeries,
+        solutions: list[list[int]],
+        output_dir: str,
+        title: str = "Map",
+        labels: list[str] = None,
+        colors_list: list[str] = COLORS_LIST,
+        nb_workers: int = None
+    ) -> list[str]:
+    """
+    Renders a sequence of solutions (eg. `Instrumentation.solutions`) as PNG frames.
+
+    The frames are split in contiguous batches over a process pool. Each worker
+    draws the map once and only updates the face colors for each of its frames.
+
+    Args:
+        geometries (gpd.GeoSeries): The geometry of each node, eg. `geo_env.gdf.geometry`.
+        solutions (list[list[int]]): The solutions to render.
+        output_dir (str): The folder of the frames.
+        title (str): The title of the frames.
+        labels (list[str]): An optional text for each frame.
+        colors_list (list[str]): The color of each color index.
+        nb_workers (int): The number of processes, defaults to the number of CPUs.
+
+    Returns:
+        list[str]: The paths of the frames, in order.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    labels = labels or [None] * len(solutions)
+    tasks = [
+        (solution, os.path.join(output_dir, f"frame_{i:05d}.png"), label)
+        for i, (solution, label) in enumerate(zip(solutions, labels))
+    ]
+    if not tasks:
+        return []
+
+    nb_workers = min(nb_workers or os.cpu_count() or 1, len(tasks))
+    batch_size = -(-len(tasks) // nb_workers)
+    batches = [tasks[i:i + batch_size] for i in range(0, len(tasks), batch_size)]
+
+    with ProcessPoolExecutor(
+        max_workers=nb_workers,
+        initializer=_init_worker,
+        initargs=(geometries, title, colors_list)
+    ) as executor:
+        paths = [path for batch_paths in executor.map(_render_batch, batches) for path in batch_paths]
+    return paths
+
+def export_animation(frame_paths: list[str], output_path: str, fps: int = 10) -> None:
+    """
+    Assembles frames into an animated GIF, or an MP4 video if the output path ends with
+    '.mp4' (requires ffmpeg).
+
+    Args:
+        frame_paths (list[str]): The paths of the frames, in order.
+        output_path (str): The path of the animation.
+        fps (int): The number of frames per second.
+
+    Returns:
+        None
+    """
+    if output_path.endswith(".mp4"):
+        from matplotlib.animation import FFMpegWriter
+
+        first = plt.imread(frame_paths[0])
+        fig = plt.figure(figsize=(first.shape[1] / 100, first.shape[0] / 100), dpi=100)
+        ax = fig.add_axes([0, 0, 1, 1])
+        ax.axis('off')
+        image = ax.imshow(first)
+        writer = FFMpegWriter(fps=fps)
+        with writer.saving(fig, output_path, dpi=100):
+            for path in frame_paths:
+                image.set_data(plt.imread(path))
+                writer.grab_frame()
+        plt.close(fig)
+        return
+
+    frames = [Image.open(path).convert("P", palette=Image.ADAPTIVE) for path in frame_paths]
+    frames[0].save(output_path, save_all=True, append_images=frames[1:], duration=int(1000 / fps), loop=0)
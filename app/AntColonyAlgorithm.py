@@ -1,6 +1,14 @@
 import numpy as np
 
+from checkpoint import Checkpointer, get_global_rng_state, set_global_rng_state
+from instrumentation import DISABLED, Instrumentation
+from utils import get_nb_conflicts_bitset, pack_adjacency
+
 class AntColonyAlgorithm:    
+    instrumentation: Instrumentation = DISABLED
+    checkpointer: Checkpointer = None
+    target_conflicts: int = 0  # Proven optimum (see `utils.get_conflicts_lower_bound`), the search stops there
+
     def __init__(
         self,
         adjacency_matrix: np.ndarray,
@@ -11,6 +19,15 @@ class AntColonyAlgorithm:
         nb_iterations: int,
         pheromone_quantity: float
     ):
+        # Arguments describing the run, recorded with its results (see `results_statistics.get_algorithm_parameters`)
+        self.arguments: dict = {
+            'max_colors': max_colors,
+            'evaporation_rate': evaporation_rate,
+            'alpha': alpha,
+            'beta': beta,
+            'nb_iterations': nb_iterations,
+            'pheromone_quantity': pheromone_quantity
+        }
         self.adjacency_matrix: np.ndarray = adjacency_matrix
         self.nb_nodes: int = len(adjacency_matrix)
         self.max_colors: int = max_colors
@@ -20,12 +37,19 @@ class AntColonyAlgorithm:
         self.nb_ants: int = 5
         self.nb_iterations: int = nb_iterations
         self.pheromone_quantity: float = pheromone_quantity
+        self.packed_adjacency: np.ndarray = pack_adjacency(adjacency_matrix)
+
+        # Search state, saved in the checkpoints
+        self.pheromone_matrix: np.ndarray = np.ones((self.nb_nodes, self.max_colors))
+        self.best_solution: np.ndarray = None
+        self.best_conflicts: float = float('inf')
+        self.iteration: int = 0
 
     def get_probability(
             self,
             pheromone_matrix: np.ndarray,
             current_node: int,
-            solution: list[int]
+            solution: np.ndarray
         ) -> np.ndarray:
         """
         Calculates the probabilities of choosing a color for a given node.
@@ -33,7 +57,7 @@ class AntColonyAlgorithm:
         Args:
             pheromone_matrix (np.ndarray): The matrix of pheromone levels for each node-color pair.
             current_node (int): The node for which the color choice probability is calculated.
-            solution (List[int]): The current color assignment for all nodes.
+            solution (np.ndarray): The current color assignment for all nodes.
 
         Returns:
             np.ndarray: A probability distribution over the available colors for the current node.
@@ -53,7 +77,7 @@ class AntColonyAlgorithm:
         probability /= np.sum(probability)
         return probability
 
-    def get_fitness(self, solution: list[int]) -> int:
+    def get_fitness(self, solution: np.ndarray) -> int:
         """
         Calculates the fitness of a given solution.
 
@@ -61,19 +85,36 @@ class AntColonyAlgorithm:
         are assigned the same color.
 
         Args:
-            solution (List[int]): A list representing the color assignment for each node.
+            solution (np.ndarray): An array representing the color assignment for each node.
 
         Returns:
             int: The number of conflicts in the solution.
         """
-        conflicts = 0
-        for i in range(self.nb_nodes):
-            for j in range(i + 1, self.nb_nodes):
-                if self.adjacency_matrix[i][j] == 1 and solution[i] == solution[j]:
-                    conflicts += 1
-        return conflicts
+        return get_nb_conflicts_bitset(self.packed_adjacency, solution, self.max_colors)
 
 
+    def get_state(self) -> dict:
+        """
+        Returns the full search state of the algorithm, random generators included.
+        """
+        return {
+            'pheromone_matrix': self.pheromone_matrix,
+            'best_solution': self.best_solution,
+            'best_conflicts': self.best_conflicts,
+            'iteration': self.iteration,
+            'rng': get_global_rng_state(),
+        }
+
+    def set_state(self, state: dict) -> None:
+        """
+        Restores a state returned by `get_state`, so that `launch` resumes the search.
+        """
+        self.pheromone_matrix = state['pheromone_matrix'].copy()
+        self.best_solution = state['best_solution'].copy() if state['best_solution'] is not None else None
+        self.best_conflicts = state['best_conflicts']
+        self.iteration = state['iteration']
+        set_global_rng_state(state['rng'])
+
     def launch(self) -> list[int]:
         """
         Runs the Ant Colony Optimization algorithm to solve the graph coloring problem.
@@ -84,40 +125,51 @@ class AntColonyAlgorithm:
         Returns:
             List[int]: The best color assignment solution found by the algorithm.
         """
-        pheromone_matrix = np.ones((self.nb_nodes, self.max_colors))
-        best_solution: list[int] = None
-        best_conflicts = float('inf')
+        pheromone_matrix = self.pheromone_matrix
+        instrumentation = self.instrumentation
 
-        for i in range(self.nb_iterations):
-            print(i)
+        while self.iteration < self.nb_iterations:
             solutions = []
             conflicts = []
 
             # Each ant constructs a solution
             for ant in range(self.nb_ants):
-                solution = [-1] * self.nb_nodes
-                for node in range(self.nb_nodes):
-                    probabilities = self.get_probability(pheromone_matrix, node, solution)
-                    solution[node] = np.random.choice(range(self.max_colors), p=probabilities)
+                # Uncolored nodes hold max_colors, which matches no color. The construction is
+                # timed per ant rather than per node, to keep the instrumentation out of the node loop
+                solution = np.full(self.nb_nodes, self.max_colors, dtype=np.uint8)
+                with instrumentation.phase("construction"):
+                    for node in range(self.nb_nodes):
+                        probabilities = self.get_probability(pheromone_matrix, node, solution)
+                        solution[node] = np.random.choice(range(self.max_colors), p=probabilities)
 
                 solutions.append(solution)
-                conflicts.append(self.get_fitness(solution))
+                with instrumentation.phase("fitness"):
+                    conflicts.append(self.get_fitness(solution))
+                instrumentation.count("evaluations")
 
             # Update the best solution
             min_conflicts = min(conflicts)
-            if min_conflicts < best_conflicts:
-                best_conflicts = min_conflicts
-                best_solution = solutions[conflicts.index(min_conflicts)]
+            if min_conflicts < self.best_conflicts:
+                self.best_conflicts = min_conflicts
+                self.best_solution = solutions[conflicts.index(min_conflicts)]
+
+            instrumentation.trace(self.best_conflicts, self.best_solution)
 
             # Update pheromones
-            pheromone_matrix *= (1 - self.evaporation_rate)
-            for solution, conflict in zip(solutions, conflicts):
-                pheromone_increase = self.pheromone_quantity / (1 + conflict)
-                for node, color in enumerate(solution):
-                    pheromone_matrix[node][color] += pheromone_increase
-
-            # Stop if a perfect solution is found
-            if best_conflicts == 0:
+            with instrumentation.phase("pheromone_update"):
+                pheromone_matrix *= (1 - self.evaporation_rate)
+                for solution, conflict in zip(solutions, conflicts):
+                    pheromone_increase = self.pheromone_quantity / (1 + conflict)
+                    for node, color in enumerate(solution):
+                        pheromone_matrix[node][color] += pheromone_increase
+
+            self.iteration += 1
+
+            # Stop if an optimal solution is found
+            if self.best_conflicts <= self.target_conflicts:
                 break
 
-        return best_solution
\ No newline at end of file
+            if self.checkpointer is not None:
+                self.checkpointer.step(self)
+
+        return self.best_solution.tolist()
\ No newline at end of file
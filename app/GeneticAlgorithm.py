@@ -1,8 +1,17 @@
 import numpy as np
 import random as rd
+from collections import OrderedDict
 from random import randint
 
+from checkpoint import Checkpointer, get_global_rng_state, set_global_rng_state
+from instrumentation import DISABLED, Instrumentation
+from utils import get_nb_conflicts_bitset, pack_adjacency
+
 class GeneticAlgorithm:
+    instrumentation: Instrumentation = DISABLED
+    checkpointer: Checkpointer = None
+    target_conflicts: int = 0  # Proven optimum (see `utils.get_conflicts_lower_bound`), the search stops there
+
     def __init__(
             self,
             nb_nodes: int,
@@ -11,8 +20,20 @@ class GeneticAlgorithm:
             pop_size: int,
             nb_generations: int,
             mutation_rate : float,
-            crossover_rate: float
+            crossover_rate: float,
+            cache_size: int = 10000,
+            replace_duplicates: bool = True
         ):
+        # Arguments describing the run, recorded with its results (see `results_statistics.get_algorithm_parameters`)
+        self.arguments: dict = {
+            'max_colors': max_colors,
+            'pop_size': pop_size,
+            'nb_generations': nb_generations,
+            'mutation_rate': mutation_rate,
+            'crossover_rate': crossover_rate,
+            'cache_size': cache_size,
+            'replace_duplicates': replace_duplicates
+        }
         self.nb_nodes: int = nb_nodes
         self.adjacency_matrix: np.ndarray = adjacency_matrix
         self.max_colors: int = max_colors
@@ -20,7 +41,13 @@ class GeneticAlgorithm:
         self.nb_generations: int = nb_generations
         self.mutation_rate: float = mutation_rate
         self.crossover_rate: float = crossover_rate
+        self.cache_size: int = cache_size
+        self.replace_duplicates: bool = replace_duplicates
+        # Fitness of the last evaluated chromosomes, by canonical form (least recently used first)
+        self.fitness_cache: OrderedDict[bytes, int] = OrderedDict()
+        self.packed_adjacency: np.ndarray = pack_adjacency(adjacency_matrix)
         self.population: np.ndarray = self.generate_population()  # Random initial solution
+        self.generation: int = 0
 
     def generate_population(self) -> np.ndarray:
         """
@@ -34,27 +61,65 @@ class GeneticAlgorithm:
                         a chromosome and each element is a randomly assigned color 
                         for a node.
         """
-        population = np.random.randint(0, self.max_colors, size=(self.pop_size, self.nb_nodes))
+        population = np.random.randint(0, self.max_colors, size=(self.pop_size, self.nb_nodes), dtype=np.uint8)
         return population
 
+    def canonicalize(self, population: np.ndarray) -> np.ndarray:
+        """
+        Relabels the colors of each chromosome in order of first appearance, so that
+        chromosomes which only differ by a permutation of the colors, and thus have
+        the same fitness, get the same canonical form.
+
+        Args:
+            population (np.ndarray): A (nb_chromosomes x nb_nodes) array of chromosomes.
+
+        Returns:
+            np.ndarray: The canonical form of each chromosome.
+        """
+        # Index of the first node of each color, nb_nodes for the unused colors
+        first_nodes = np.empty((len(population), self.max_colors), dtype=np.intp)
+        for color in range(self.max_colors):
+            is_color = population == color
+            first_nodes[:, color] = np.where(is_color.any(axis=1), is_color.argmax(axis=1), self.nb_nodes)
+        order = np.argsort(first_nodes, axis=1, kind="stable")
+
+        labels = np.empty_like(order)
+        np.put_along_axis(labels, order, np.arange(self.max_colors)[None, :], axis=1)
+        return np.take_along_axis(labels, population.astype(np.intp), axis=1).astype(np.uint8)
+
     def get_fitness(self) -> np.ndarray:
         """
         Computes the fitness of each individual in the population, where the fitness 
         is defined as the number of conflicts in the solution.
 
+        The fitness of the chromosomes seen recently, up to a color permutation, is read
+        from a bounded cache instead of being evaluated again.
+
         Returns:
             np.ndarray: An array where each element represents the fitness (number of conflicts) 
                         of the corresponding individual in the population.
         """
         conflicts = np.zeros(self.pop_size, dtype=int)
+        nb_evaluations = 0
+
+        with self.instrumentation.phase("fitness"):
+            canonical = self.canonicalize(self.population)
+            # Iterate over each individual in the population
+            for idx, solution in enumerate(self.population):
+                key = canonical[idx].tobytes()
+                cached = self.fitness_cache.get(key)
+                if cached is not None:
+                    self.fitness_cache.move_to_end(key)
+                    conflicts[idx] = cached
+                    continue
 
-        # Iterate over each individual in the population
-        for idx, solution in enumerate(self.population):
-            # Check conflicts for each edge in the adjacency matrix
-            for i in range(self.nb_nodes):
-                for j in range(i + 1, self.nb_nodes):  # Only check upper triangle (i < j)
-                    if self.adjacency_matrix[i][j] == 1 and solution[i] == solution[j]:
-                        conflicts[idx] += 1
+                conflicts[idx] = get_nb_conflicts_bitset(self.packed_adjacency, solution, self.max_colors)
+                nb_evaluations += 1
+                self.fitness_cache[key] = conflicts[idx]
+                if len(self.fitness_cache) > self.cache_size:
+                    self.fitness_cache.popitem(last=False)
+        self.instrumentation.count("evaluations", nb_evaluations)
+        self.instrumentation.count("cache_hits", self.pop_size - nb_evaluations)
 
         return conflicts
 
@@ -71,7 +136,7 @@ class GeneticAlgorithm:
         Returns:
             np.ndarray: An array containing the selected parents.
         """
-        parents = np.empty((nb_parents, self.nb_nodes), dtype=int)
+        parents = np.empty((nb_parents, self.nb_nodes), dtype=np.uint8)
         sorted_indices = np.argsort(fitness)  # Sort indices by increasing fitness
         for i in range(nb_parents):
             parents[i, :] = self.population[sorted_indices[i], :]
@@ -89,7 +154,7 @@ class GeneticAlgorithm:
         Returns:
             conflicts (int) the number of conflicts in the solution
         """
-        children = np.empty((nb_children, self.nb_nodes), dtype=int)
+        children = np.empty((nb_children, self.nb_nodes), dtype=np.uint8)
 
         for i in range(nb_children):
             if rd.random() > self.crossover_rate:
@@ -105,7 +170,7 @@ class GeneticAlgorithm:
 
         return children
 
-    def mutation(self, child: list[int]) -> list[int]:
+    def mutation(self, child: np.ndarray) -> np.ndarray:
         """
         Introduces random mutations to diversify the population.
 
@@ -115,7 +180,7 @@ class GeneticAlgorithm:
         Returns:
             np.ndarray: A mutated version of the input child chromosome.
         """
-        mutants: list[int] = child.copy()
+        mutants: np.ndarray = child.copy()
 
         for i in range(mutants.shape[0]):
             if rd.random() < self.mutation_rate:
@@ -124,29 +189,94 @@ class GeneticAlgorithm:
 
         return mutants
 
-    def launch(self) -> list[int]:
+    def next_generation(self, fitness: np.ndarray) -> None:
         """
-        Launch the genetic algorithm to find a solution.
+        Replaces the population by the next generation: the best half is kept 
+        as parents and the other half is made of mutated children.
+
+        Args:
+            fitness (np.ndarray): The fitness of each individual of the current population.
 
         Returns:
-            list[int]: The solution found, or the solution with fitness 0 if it is encountered.
+            None
         """
         nb_parents = self.pop_size // 2
         nb_children = self.pop_size - nb_parents
 
-        for _ in range(self.nb_generations):
+        instrumentation = self.instrumentation
+        with instrumentation.phase("selection"):
+            parents = self.selection(fitness, nb_parents)
+        with instrumentation.phase("crossover"):
+            children = self.crossover(parents, nb_children)
+        with instrumentation.phase("mutation"):
+            mutants = self.mutation(children)
+        self.population[:nb_parents, :] = parents
+        self.population[nb_parents:, :] = mutants
+
+        if self.replace_duplicates:
+            with instrumentation.phase("deduplication"):
+                self.replace_duplicated_chromosomes()
+
+    def replace_duplicated_chromosomes(self) -> None:
+        """
+        Replaces the chromosomes equal to another one up to a color permutation by new
+        random chromosomes, to keep the diversity of the population. The first copy,
+        ie. the fittest one among the parents, is kept.
+
+        Returns:
+            None
+        """
+        seen = set()
+        duplicates = []
+        for idx, chromosome in enumerate(self.canonicalize(self.population)):
+            key = chromosome.tobytes()
+            if key in seen:
+                duplicates.append(idx)
+            seen.add(key)
+        self.population[duplicates] = np.random.randint(
+            0, self.max_colors, size=(len(duplicates), self.nb_nodes), dtype=np.uint8
+        )
+        self.instrumentation.count("duplicates_replaced", len(duplicates))
+
+    def get_state(self) -> dict:
+        """
+        Returns the full search state of the algorithm, random generators included.
+        """
+        return {
+            'population': self.population,
+            'generation': self.generation,
+            'rng': get_global_rng_state(),
+        }
+
+    def set_state(self, state: dict) -> None:
+        """
+        Restores a state returned by `get_state`, so that `launch` resumes the search.
+        """
+        self.population = state['population'].copy()
+        self.generation = state['generation']
+        set_global_rng_state(state['rng'])
+
+    def launch(self) -> list[int]:
+        """
+        Launch the genetic algorithm to find a solution.
+
+        Returns:
+            list[int]: The solution found, or the solution with fitness 0 if it is encountered.
+        """
+        while self.generation < self.nb_generations:
             fitness = self.get_fitness()
+            self.instrumentation.trace(fitness.min(), self.population[np.argmin(fitness)])
 
-            # Check if a solution with fitness 0 is found
-            if 0 in fitness:
+            # Check if an optimal solution is found
+            if fitness.min() <= self.target_conflicts:
                 best_index = np.argmin(fitness)
                 return self.population[best_index].tolist()
 
-            parents = self.selection(fitness, nb_parents)
-            children = self.crossover(parents, nb_children)
-            mutants = self.mutation(children)
-            self.population[:nb_parents, :] = parents
-            self.population[nb_parents:, :] = mutants
+            self.next_generation(fitness)
+            self.generation += 1
+
+            if self.checkpointer is not None:
+                self.checkpointer.step(self)
 
         # Finding the best solution after all generations
         fitness_final = self.get_fitness()
@@ -0,0 +1,259 @@
+import numpy as np
+
+from instrumentation import DISABLED, Instrumentation
+from utils import get_nb_conflicts_bitset, pack_adjacency
+
+class HybridEvolutionaryAlgorithm:
+    instrumentation: Instrumentation = DISABLED
+    target_conflicts: int = 0  # Proven optimum (see `utils.get_conflicts_lower_bound`), the search stops there
+
+    def __init__(
+            self,
+            nb_nodes: int,
+            adjacency_matrix: np.ndarray,
+            max_colors: int,
+            pop_size: int,
+            nb_generations: int,
+            tabu_iterations: int = 1000,
+            tabu_tenure: int = 10,
+            tabu_factor: float = 0.6,
+            quality_weight: float = 0.6,
+            seed: int = None
+        ):
+        # Arguments describing the run, recorded with its results (see `results_statistics.get_algorithm_parameters`)
+        self.arguments: dict = {
+            'max_colors': max_colors,
+            'pop_size': pop_size,
+            'nb_generations': nb_generations,
+            'tabu_iterations': tabu_iterations,
+            'tabu_tenure': tabu_tenure,
+            'tabu_factor': tabu_factor,
+            'quality_weight': quality_weight
+        }
+        self.nb_nodes: int = nb_nodes
+        self.adjacency_matrix: np.ndarray = adjacency_matrix
+        self.max_colors: int = max_colors
+        self.pop_size: int = max(pop_size, 2)
+        self.nb_generations: int = nb_generations
+        self.tabu_iterations: int = tabu_iterations
+        self.tabu_tenure: int = tabu_tenure
+        self.tabu_factor: float = tabu_factor
+        self.quality_weight: float = quality_weight
+        self.packed_adjacency: np.ndarray = pack_adjacency(adjacency_matrix)
+        self.rng: np.random.Generator = np.random.default_rng(seed)
+
+        self.population: np.ndarray = np.empty((self.pop_size, nb_nodes), dtype=np.uint8)
+        self.fitness: np.ndarray = np.empty(self.pop_size, dtype=int)
+        # Distances between the individuals, only the row and column of a replaced one are recomputed
+        self.distances: np.ndarray = np.full((self.pop_size, self.pop_size), nb_nodes)
+
+    def get_fitness(self, solution: np.ndarray) -> int:
+        """
+        Function that returns the fitness ie. the number of conflicts in the solution
+
+        Args:
+            solution (np.ndarray)
+
+        Returns:
+            conflicts (int) the number of conflicts in the solution
+        """
+        return get_nb_conflicts_bitset(self.packed_adjacency, solution, self.max_colors)
+
+    def tabu_search(self, solution: np.ndarray) -> tuple[np.ndarray, int]:
+        """
+        Improves a solution with a bounded number of tabu search iterations (TabuCol).
+
+        The number of neighbours of each node having each color is kept in a
+        (nb_nodes x max_colors) matrix so that every move is evaluated incrementally.
+        A move (node, color) stays tabu for `tabu_tenure + tabu_factor * nb_conflicting_nodes`
+        iterations, unless it leads to a better solution than the best one found.
+
+        Args:
+            solution (np.ndarray): The solution to improve.
+
+        Returns:
+            tuple[np.ndarray, int]: The best solution found and its number of conflicts.
+        """
+        solution = solution.copy()
+        nodes = np.arange(self.nb_nodes)
+        neighbors_colors = self.adjacency_matrix @ np.eye(self.max_colors, dtype=int)[solution]
+        tabu = np.zeros((self.nb_nodes, self.max_colors), dtype=int)
+
+        conflicts = int(neighbors_colors[nodes, solution].sum() // 2)
+        best_solution, best_conflicts = solution.copy(), conflicts
+        nb_evaluations = 0
+        nb_moves = 0
+
+        for iteration in range(self.tabu_iterations):
+            if best_conflicts <= self.target_conflicts:
+                break
+
+            conflicting = np.flatnonzero(neighbors_colors[nodes, solution] > 0)
+            delta = neighbors_colors[conflicting] - neighbors_colors[conflicting, solution[conflicting]][:, None]
+            delta[np.arange(len(conflicting)), solution[conflicting]] = np.iinfo(int).max // 2
+
+            # Tabu moves are forbidden unless they improve the best solution (aspiration)
+            allowed = (tabu[conflicting] <= iteration) | (conflicts + delta < best_conflicts)
+            delta = np.where(allowed, delta, np.iinfo(int).max // 2)
+            min_delta = delta.min()
+            nb_evaluations += delta.size
+            if min_delta == np.iinfo(int).max // 2:
+                continue
+
+            candidates = np.argwhere(delta == min_delta)
+            move, new_color = candidates[self.rng.integers(len(candidates))]
+            node = conflicting[move]
+            old_color = solution[node]
+
+            solution[node] = new_color
+            neighbors_colors[:, old_color] -= self.adjacency_matrix[node]
+            neighbors_colors[:, new_color] += self.adjacency_matrix[node]
+            conflicts += int(min_delta)
+            nb_moves += 1
+            tabu[node, old_color] = iteration + self.tabu_tenure + int(self.tabu_factor * len(conflicting))
+
+            if conflicts < best_conflicts:
+                best_solution, best_conflicts = solution.copy(), conflicts
+
+        self.instrumentation.count("evaluations", nb_evaluations)
+        self.instrumentation.count("accepted_moves", nb_moves)
+        return best_solution, best_conflicts
+
+    def crossover(self, parent1: np.ndarray, parent2: np.ndarray) -> np.ndarray:
+        """
+        Greedy partition crossover (GPX): the child alternately inherits the largest
+        remaining color class of each parent, the nodes left at the end get a random color.
+
+        Args:
+            parent1 (np.ndarray): The first parent chromosome.
+            parent2 (np.ndarray): The second parent chromosome.
+
+        Returns:
+            np.ndarray: The child chromosome.
+        """
+        child = np.full(self.nb_nodes, -1, dtype=int)
+        parents = (parent1, parent2)
+
+        for color in range(self.max_colors):
+            parent = parents[color % 2]
+            uncolored = child == -1
+            # Size of the color classes of the parent, restricted to the uncolored nodes
+            class_sizes = np.bincount(parent[uncolored], minlength=self.max_colors)
+            largest_class = np.argmax(class_sizes)
+            child[uncolored & (parent == largest_class)] = color
+
+        uncolored = child == -1
+        child[uncolored] = self.rng.integers(0, self.max_colors, size=uncolored.sum())
+        return child.astype(np.uint8)
+
+    def get_distance(self, solution1: np.ndarray, solution2: np.ndarray) -> int:
+        """
+        Computes an approximation of the partition distance between two solutions, ie.
+        the number of nodes to move so that both solutions have the same color classes.
+
+        Args:
+            solution1 (np.ndarray): The first solution.
+            solution2 (np.ndarray): The second solution.
+
+        Returns:
+            int: The distance between the two solutions.
+        """
+        overlap = np.zeros((self.max_colors, self.max_colors), dtype=int)
+        np.add.at(overlap, (solution1, solution2), 1)
+
+        # Greedy matching of the color classes of both solutions
+        matched = 0
+        for _ in range(self.max_colors):
+            i, j = np.unravel_index(np.argmax(overlap), overlap.shape)
+            matched += overlap[i, j]
+            overlap[i, :] = -1
+            overlap[:, j] = -1
+        return self.nb_nodes - matched
+
+    def get_distances_to_population(self, solution: np.ndarray) -> np.ndarray:
+        """
+        Computes the distance between a solution and each individual of the population.
+
+        Returns:
+            np.ndarray: The `pop_size` distances.
+        """
+        return np.array([self.get_distance(solution, individual) for individual in self.population])
+
+    def init_distances(self) -> None:
+        """
+        Computes the distances between all the individuals of the initial population.
+
+        Returns:
+            None
+        """
+        for i in range(self.pop_size):
+            for j in range(i + 1, self.pop_size):
+                self.distances[i, j] = self.distances[j, i] = self.get_distance(self.population[i], self.population[j])
+
+    def update_population(self, child: np.ndarray, child_fitness: int) -> None:
+        """
+        Inserts a child in the population with a quality and distance based replacement:
+        the individual of the pool (population + child) with the worst goodness score is
+        discarded, the score mixing the rank of its fitness and the rank of its distance
+        to the rest of the pool. Only the distances of the child are computed, those of the
+        population are kept up to date in `distances`.
+
+        Args:
+            child (np.ndarray): The child to insert.
+            child_fitness (int): The number of conflicts of the child.
+
+        Returns:
+            None
+        """
+        pool_fitness = np.append(self.fitness, child_fitness)
+        size = self.pop_size + 1
+
+        child_distances = self.get_distances_to_population(child)
+        distances = np.full((size, size), self.nb_nodes)
+        distances[:-1, :-1] = self.distances
+        distances[-1, :-1] = distances[:-1, -1] = child_distances
+        np.fill_diagonal(distances, self.nb_nodes)
+        min_distances = distances.min(axis=1)
+
+        # Low fitness is good, high distance to the pool is good
+        quality_rank = np.argsort(np.argsort(pool_fitness, kind="stable"), kind="stable")
+        distance_rank = np.argsort(np.argsort(-min_distances, kind="stable"), kind="stable")
+        score = self.quality_weight * quality_rank + (1 - self.quality_weight) * distance_rank
+
+        worst = int(np.argmax(score))
+        if worst == size - 1:
+            return  # The child is discarded
+        self.population[worst] = child
+        self.fitness[worst] = child_fitness
+        self.distances[worst, :] = self.distances[:, worst] = child_distances
+        self.distances[worst, worst] = self.nb_nodes
+
+    def launch(self) -> list[int]:
+        """
+        Launch the hybrid evolutionary algorithm to find a solution.
+
+        Returns:
+            list[int]: The best solution found.
+        """
+        instrumentation = self.instrumentation
+        for i in range(self.pop_size):
+            initial = self.rng.integers(0, self.max_colors, size=self.nb_nodes, dtype=np.uint8)
+            with instrumentation.phase("tabu_search"):
+                self.population[i], self.fitness[i] = self.tabu_search(initial)
+        with instrumentation.phase("update_population"):
+            self.init_distances()
+
+        for _ in range(self.nb_generations):
+            instrumentation.trace(self.fitness.min(), self.population[np.argmin(self.fitness)])
+            if self.fitness.min() <= self.target_conflicts:
+                break
+
+            parent1, parent2 = self.rng.choice(self.pop_size, size=2, replace=False)
+            with instrumentation.phase("crossover"):
+                child = self.crossover(self.population[parent1], self.population[parent2])
+            with instrumentation.phase("tabu_search"):
+                child, child_fitness = self.tabu_search(child)
+            with instrumentation.phase("update_population"):
+                self.update_population(child, child_fitness)
+
+        return self.population[np.argmin(self.fitness)].tolist()
@@ -0,0 +1,190 @@
+import numpy as np
+
+from instrumentation import DISABLED, Instrumentation
+
+class IncrementalRepairAlgorithm:
+    instrumentation: Instrumentation = DISABLED
+    target_conflicts: int = 0  # Proven optimum (see `utils.get_conflicts_lower_bound`), the search stops there
+
+    def __init__(
+            self,
+            adjacency_matrix: np.ndarray,
+            region_names: list[str],
+            solution: list[int],
+            max_colors: int,
+            max_iterations: int,
+            added_nodes: list[str] = (),
+            removed_nodes: list[str] = (),
+            added_edges: list[tuple[str, str]] = (),
+            removed_edges: list[tuple[str, str]] = (),
+            tabu_tenure: int = 5,
+            stagnation_limit: int = 20,
+            seed: int = None
+        ):
+        # Arguments describing the run, recorded with its results (see `results_statistics.get_algorithm_parameters`)
+        self.arguments: dict = {
+            'max_colors': max_colors,
+            'max_iterations': max_iterations,
+            'tabu_tenure': tabu_tenure,
+            'stagnation_limit': stagnation_limit
+        }
+        self.max_colors: int = max_colors
+        self.max_iterations: int = max_iterations
+        self.tabu_tenure: int = tabu_tenure
+        self.stagnation_limit: int = stagnation_limit
+        self.rng: np.random.Generator = np.random.default_rng(seed)
+
+        # The new graph and the previous solution projected on it
+        self.region_names: list[str] = []
+        self.adjacency_matrix: np.ndarray = None
+        self.solution: np.ndarray = None
+        self.affected: np.ndarray = None
+        self.apply_diff(adjacency_matrix, region_names, np.asarray(solution, dtype=np.uint8),
+                        added_nodes, removed_nodes, added_edges, removed_edges)
+        self.nb_nodes: int = len(self.region_names)
+
+    def apply_diff(
+            self,
+            adjacency_matrix: np.ndarray,
+            region_names: list[str],
+            solution: np.ndarray,
+            added_nodes: list[str],
+            removed_nodes: list[str],
+            added_edges: list[tuple[str, str]],
+            removed_edges: list[tuple[str, str]]
+        ) -> None:
+        """
+        Builds the new graph from the old one and the diff, keeps the color of every
+        remaining node and greedily colors the added nodes.
+
+        The nodes affected by the diff are the added nodes and the ends of the added
+        edges: removing nodes or edges can not create a conflict.
+
+        Args:
+            adjacency_matrix (np.ndarray): The adjacency matrix of the old graph.
+            region_names (list[str]): The names of the nodes of the old graph.
+            solution (np.ndarray): The previous solution on the old graph.
+            added_nodes (list[str]), removed_nodes (list[str]): The nodes of the diff.
+            added_edges (list[tuple[str, str]]), removed_edges (list[tuple[str, str]]): The edges of the diff.
+
+        Returns:
+            None
+        """
+        removed = set(removed_nodes)
+        kept = [i for i, name in enumerate(region_names) if name not in removed]
+        new_nodes = [name for name in added_nodes if name not in region_names or name in removed]
+        self.region_names = [region_names[i] for i in kept] + new_nodes
+        index = {name: i for i, name in enumerate(self.region_names)}
+
+        size = len(self.region_names)
+        self.adjacency_matrix = np.zeros((size, size), dtype=np.uint8)
+        self.adjacency_matrix[:len(kept), :len(kept)] = adjacency_matrix[np.ix_(kept, kept)]
+        for name1, name2 in removed_edges:
+            if name1 in index and name2 in index:
+                self.adjacency_matrix[index[name1], index[name2]] = 0
+                self.adjacency_matrix[index[name2], index[name1]] = 0
+
+        affected = {index[name] for name in new_nodes}
+        for name1, name2 in added_edges:
+            i, j = index[name1], index[name2]
+            self.adjacency_matrix[i, j] = self.adjacency_matrix[j, i] = 1
+            affected.update((i, j))
+        self.affected = np.array(sorted(affected), dtype=int)
+
+        self.solution = np.zeros(size, dtype=np.uint8)
+        self.solution[:len(kept)] = solution[kept]
+        # Greedy coloring of the new nodes, with the least used color among their colored neighbours
+        colored = np.zeros(size, dtype=bool)
+        colored[:len(kept)] = True
+        for name in new_nodes:
+            node = index[name]
+            neighbors = (self.adjacency_matrix[node] == 1) & colored
+            self.solution[node] = np.argmin(np.bincount(self.solution[neighbors], minlength=self.max_colors))
+            colored[node] = True
+
+    def expand(self, zone: np.ndarray) -> np.ndarray:
+        """
+        Adds the neighbours of the nodes of a zone to the zone.
+
+        Args:
+            zone (np.ndarray): The indices of the nodes of the zone.
+
+        Returns:
+            np.ndarray: The indices of the nodes of the expanded zone.
+        """
+        neighbors = np.flatnonzero(self.adjacency_matrix[zone].any(axis=0))
+        return np.union1d(zone, neighbors)
+
+    def launch(self) -> list[int]:
+        """
+        Repairs the projected solution with a tabu search restricted to the neighbourhood
+        of the changes. The zone grows by one ring of neighbours each time the search
+        stagnates, so that only the part of the map around the changes is recolored.
+
+        Returns:
+            list[int]: The repaired solution on the new graph, indexed like `region_names`.
+        """
+        solution = self.solution
+        if len(self.affected) == 0:
+            return solution.tolist()
+
+        zone = self.expand(self.affected)
+        one_hot = np.eye(self.max_colors, dtype=int)
+        # Number of neighbours of each zone node having each color
+        neighbors_colors = self.adjacency_matrix[zone].astype(int) @ one_hot[solution]
+        tabu = np.zeros((self.nb_nodes, self.max_colors), dtype=int)
+
+        conflicts = int((self.adjacency_matrix[solution[:, None] == solution] == 1).sum()) // 2
+        best_conflicts = conflicts
+        best_solution = solution.copy()
+        stagnation = 0
+
+        for iteration in range(self.max_iterations):
+            if best_conflicts <= self.target_conflicts:
+                break
+
+            conflicting = np.flatnonzero(neighbors_colors[np.arange(len(zone)), solution[zone]] > 0)
+            if len(conflicting) == 0:
+                best_solution = solution.copy()
+                break
+
+            if stagnation >= self.stagnation_limit and len(zone) < self.nb_nodes:
+                zone = self.expand(zone)
+                neighbors_colors = self.adjacency_matrix[zone].astype(int) @ one_hot[solution]
+                self.instrumentation.count("zone_expansions")
+                stagnation = 0
+                continue
+
+            nodes = zone[conflicting]
+            delta = neighbors_colors[conflicting] - neighbors_colors[conflicting, solution[nodes]][:, None]
+            delta[np.arange(len(nodes)), solution[nodes]] = np.iinfo(int).max // 2
+            allowed = (tabu[nodes] <= iteration) | (conflicts + delta < best_conflicts)
+            delta = np.where(allowed, delta, np.iinfo(int).max // 2)
+            self.instrumentation.count("evaluations", delta.size)
+
+            min_delta = delta.min()
+            if min_delta == np.iinfo(int).max // 2:
+                stagnation += 1
+                continue
+
+            candidates = np.argwhere(delta == min_delta)
+            move, new_color = candidates[self.rng.integers(len(candidates))]
+            node = nodes[move]
+            old_color = solution[node]
+
+            solution[node] = new_color
+            neighbors_colors[:, old_color] -= self.adjacency_matrix[zone, node]
+            neighbors_colors[:, new_color] += self.adjacency_matrix[zone, node]
+            conflicts += int(min_delta)
+            tabu[node, old_color] = iteration + self.tabu_tenure
+            self.instrumentation.count("accepted_moves")
+
+            if conflicts < best_conflicts:
+                best_conflicts = conflicts
+                best_solution = solution.copy()
+                stagnation = 0
+            else:
+                stagnation += 1
+            self.instrumentation.trace(best_conflicts, best_solution)
+
+        return best_solution.tolist()
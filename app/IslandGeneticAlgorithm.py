@@ -0,0 +1,257 @@
+import multiprocessing as mp
+import random as rd
+from multiprocessing import shared_memory
+from threading import BrokenBarrierError
+import numpy as np
+
+from app.GeneticAlgorithm import GeneticAlgorithm
+from instrumentation import DISABLED, Instrumentation
+from shared_graph_store import SharedArrayDescriptor, SharedGraphStore, attach
+
+TOPOLOGIES = ("ring", "random")
+
+
+def _island_worker(
+        island: int,
+        seed: int,
+        adjacency: SharedArrayDescriptor,
+        nb_nodes: int,
+        max_colors: int,
+        pop_size: int,
+        nb_generations: int,
+        mutation_rate: float,
+        crossover_rate: float,
+        nb_islands: int,
+        nb_migrants: int,
+        migration_interval: int,
+        topology: str,
+        migrants_name: str,
+        best_name: str,
+        barrier,
+        stop_event,
+        target_conflicts: int = 0
+    ) -> None:
+    """
+    Evolves one island of the archipelago inside a worker process.
+
+    Every `migration_interval` generations the elites of the island are written into
+    the shared migrants buffer, and the migrants of another island replace the worst
+    individuals of the population. The best solution of the island and its fitness
+    are written in the shared best buffer at the end of the run. If the island fails,
+    the barrier is aborted so that the other islands stop instead of waiting for it.
+
+    Args:
+        island (int): The index of the island.
+        seed (int): The seed of the random generators of the island.
+        adjacency (SharedArrayDescriptor): The adjacency matrix in shared memory.
+        (other arguments): See `IslandGeneticAlgorithm`.
+
+    Returns:
+        None
+    """
+    rd.seed(seed)
+    np.random.seed(seed)
+
+    segments = []
+    try:
+        migrants_shm = shared_memory.SharedMemory(name=migrants_name)
+        segments.append(migrants_shm)
+        best_shm = shared_memory.SharedMemory(name=best_name)
+        segments.append(best_shm)
+        migrants = np.ndarray((nb_islands, nb_migrants, nb_nodes), dtype=np.uint8, buffer=migrants_shm.buf)
+        best = np.ndarray((nb_islands, nb_nodes + 1), dtype=np.int64, buffer=best_shm.buf)
+
+        algorithm = GeneticAlgorithm(
+            nb_nodes=nb_nodes,
+            adjacency_matrix=attach(adjacency),
+            max_colors=max_colors,
+            pop_size=pop_size,
+            nb_generations=nb_generations,
+            mutation_rate=mutation_rate,
+            crossover_rate=crossover_rate
+        )
+
+        fitness = algorithm.get_fitness()
+        for generation in range(1, nb_generations + 1):
+            if fitness.min() <= target_conflicts or stop_event.is_set():
+                break
+
+            algorithm.next_generation(fitness)
+            fitness = algorithm.get_fitness()
+
+            if generation % migration_interval != 0 or nb_islands == 1:
+                continue
+
+            # Publish the elites of the island
+            sorted_indices = np.argsort(fitness)
+            migrants[island] = algorithm.population[sorted_indices[:nb_migrants]]
+            try:
+                barrier.wait()
+            except BrokenBarrierError:
+                break
+
+            # Receive the elites of the source island in place of the worst individuals
+            if topology == "ring":
+                source = (island - 1) % nb_islands
+            else:
+                source = rd.choice([i for i in range(nb_islands) if i != island])
+            worst_indices = sorted_indices[-nb_migrants:]
+            algorithm.population[worst_indices] = migrants[source]
+            fitness = algorithm.get_fitness()
+
+            # Wait until every island has read its migrants before they are overwritten
+            try:
+                barrier.wait()
+            except BrokenBarrierError:
+                break
+
+        best_index = np.argmin(fitness)
+        best[island, :nb_nodes] = algorithm.population[best_index]
+        best[island, nb_nodes] = fitness[best_index]
+
+        # Stop the other islands as soon as an optimal solution is found
+        if fitness[best_index] <= target_conflicts:
+            stop_event.set()
+            barrier.abort()
+    except BaseException:
+        # The other islands would otherwise wait forever for this one at the barrier
+        barrier.abort()
+        raise
+    finally:
+        for segment in segments:
+            segment.close()
+
+
+class IslandGeneticAlgorithm:
+    instrumentation: Instrumentation = DISABLED
+    target_conflicts: int = 0  # Proven optimum (see `utils.get_conflicts_lower_bound`), the search stops there
+
+    def __init__(
+            self,
+            nb_nodes: int,
+            adjacency_matrix: np.ndarray,
+            max_colors: int,
+            pop_size: int,
+            nb_generations: int,
+            mutation_rate: float,
+            crossover_rate: float,
+            nb_islands: int = 4,
+            nb_migrants: int = 2,
+            migration_interval: int = 10,
+            topology: str = "ring",
+            mutation_rates: list[float] = None,
+            crossover_rates: list[float] = None,
+            seed: int = None
+        ):
+        if topology not in TOPOLOGIES:
+            raise ValueError(f"Unknown topology '{topology}', expected one of {TOPOLOGIES}")
+
+        # Arguments describing the run, recorded with its results (see `results_statistics.get_algorithm_parameters`)
+        self.arguments: dict = {
+            'max_colors': max_colors,
+            'pop_size': pop_size,
+            'nb_generations': nb_generations,
+            'mutation_rate': mutation_rate,
+            'crossover_rate': crossover_rate,
+            'nb_islands': nb_islands,
+            'nb_migrants': nb_migrants,
+            'migration_interval': migration_interval,
+            'topology': topology,
+            'mutation_rates': mutation_rates,
+            'crossover_rates': crossover_rates
+        }
+        self.nb_nodes: int = nb_nodes
+        self.adjacency_matrix: np.ndarray = adjacency_matrix
+        self.max_colors: int = max_colors
+        self.pop_size: int = pop_size
+        self.nb_generations: int = nb_generations
+        self.nb_islands: int = nb_islands
+        self.nb_migrants: int = min(nb_migrants, pop_size // 2)
+        self.migration_interval: int = migration_interval
+        self.topology: str = topology
+        # Each island may use its own mutation and crossover rates
+        self.mutation_rates: list[float] = mutation_rates or [mutation_rate] * nb_islands
+        self.crossover_rates: list[float] = crossover_rates or [crossover_rate] * nb_islands
+        self.seed: int = seed if seed is not None else rd.randrange(2**31)
+
+        if len(self.mutation_rates) != nb_islands or len(self.crossover_rates) != nb_islands:
+            raise ValueError("There must be one mutation rate and one crossover rate per island")
+
+    def launch(self) -> list[int]:
+        """
+        Launch the island model genetic algorithm to find a solution.
+
+        Each island evolves its own population in a separate process and the
+        elites migrate between the islands through shared memory.
+
+        Raises:
+            RuntimeError: If an island process failed.
+
+        Returns:
+            list[int]: The best solution found among all the islands.
+        """
+        migrants_size = self.nb_islands * max(self.nb_migrants, 1) * self.nb_nodes * np.dtype(np.uint8).itemsize
+        best_size = self.nb_islands * (self.nb_nodes + 1) * np.dtype(np.int64).itemsize
+        segments = []
+
+        # Every segment is created inside the try, so that a failure while creating the
+        # next ones still releases them
+        with SharedGraphStore() as store:
+            try:
+                adjacency = store.put("adjacency", adjacency_matrix=self.adjacency_matrix)["adjacency_matrix"]
+                migrants_shm = shared_memory.SharedMemory(create=True, size=migrants_size)
+                segments.append(migrants_shm)
+                best_shm = shared_memory.SharedMemory(create=True, size=best_size)
+                segments.append(best_shm)
+
+                best = np.ndarray((self.nb_islands, self.nb_nodes + 1), dtype=np.int64, buffer=best_shm.buf)
+                best[:, self.nb_nodes] = np.iinfo(np.int64).max
+
+                context = mp.get_context("spawn")
+                barrier = context.Barrier(self.nb_islands)
+                stop_event = context.Event()
+                processes = []
+                for island in range(self.nb_islands):
+                    process = context.Process(
+                        target=_island_worker,
+                        args=(
+                            island,
+                            self.seed + island,
+                            adjacency,
+                            self.nb_nodes,
+                            self.max_colors,
+                            self.pop_size,
+                            self.nb_generations,
+                            self.mutation_rates[island],
+                            self.crossover_rates[island],
+                            self.nb_islands,
+                            max(self.nb_migrants, 1),
+                            self.migration_interval,
+                            self.topology,
+                            migrants_shm.name,
+                            best_shm.name,
+                            barrier,
+                            stop_event,
+                            self.target_conflicts
+                        )
+                    )
+                    process.start()
+                    processes.append(process)
+
+                with self.instrumentation.phase("islands"):
+                    for process in processes:
+                        process.join()
+
+                # A failed island left its sentinel fitness, its solution must not be returned
+                failed = [island for island, process in enumerate(processes) if process.exitcode != 0]
+                if failed:
+                    raise RuntimeError(f"The islands {failed} failed, see the errors of their processes above")
+
+                best_island = np.argmin(best[:, self.nb_nodes])
+                best_solution = best[best_island, :self.nb_nodes].tolist()
+            finally:
+                for segment in segments:
+                    segment.close()
+                    segment.unlink()
+
+        return best_solution
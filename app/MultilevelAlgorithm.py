@@ -0,0 +1,181 @@
+import inspect
+import numpy as np
+
+from app.ParallelMinConflictsAlgorithm import ParallelMinConflictsAlgorithm
+from instrumentation import DISABLED, Instrumentation
+from utils import get_adjacency_lists, get_adjacency_matrix
+
+class MultilevelAlgorithm:
+    instrumentation: Instrumentation = DISABLED
+    target_conflicts: int = 0  # Proven optimum (see `utils.get_conflicts_lower_bound`), the search stops there
+
+    def __init__(
+            self,
+            nb_nodes: int,
+            adjacency_matrix: np.ndarray,
+            max_colors: int,
+            algorithm_class,
+            parameters: dict = None,
+            parent_groups: np.ndarray = None,
+            min_nodes: int = 20,
+            refine_iterations: int = 1000,
+            seed: int = None,
+            adjacency_lists: tuple[np.ndarray, np.ndarray] = None
+        ):
+        # Arguments describing the run, recorded with its results (see `results_statistics.get_algorithm_parameters`)
+        self.arguments: dict = {
+            'max_colors': max_colors,
+            'algorithm_class': algorithm_class.__name__,
+            'parameters': {name: value for name, value in (parameters or {}).items() if name != 'seed'},
+            'min_nodes': min_nodes,
+            'refine_iterations': refine_iterations
+        }
+        self.nb_nodes: int = nb_nodes
+        self.adjacency_matrix: np.ndarray = adjacency_matrix
+        self.max_colors: int = max_colors
+        self.algorithm_class = algorithm_class
+        self.parameters: dict = parameters or {}
+        self.parent_groups: np.ndarray = parent_groups
+        self.min_nodes: int = min_nodes
+        self.refine_iterations: int = refine_iterations
+        self.seed: int = seed
+        self.rng: np.random.Generator = np.random.default_rng(seed)
+
+        # Graph of each level in CSR form, the finest first, and the node of the next
+        # (coarser) level containing each node
+        self.levels: list[tuple[np.ndarray, np.ndarray]] = [adjacency_lists or get_adjacency_lists(adjacency_matrix)]
+        self.groups: list[np.ndarray] = []
+
+    def match(self, indptr: np.ndarray, indices: np.ndarray) -> np.ndarray:
+        """
+        Pairs each node, in random order, with the unmatched non-adjacent node sharing
+        the most neighbours with it. The two nodes of a pair are never adjacent, so this
+        level adds no conflict when a coloring is projected through it.
+
+        Args:
+            indptr (np.ndarray), indices (np.ndarray): The graph in CSR form.
+
+        Returns:
+            np.ndarray: The coarse node of each node.
+        """
+        nb_nodes = len(indptr) - 1
+        groups = np.full(nb_nodes, -1)
+        nb_groups = 0
+        for node in self.rng.permutation(nb_nodes):
+            if groups[node] >= 0:
+                continue
+            groups[node] = nb_groups
+
+            neighbors = indices[indptr[node]:indptr[node + 1]]
+            if len(neighbors) > 0:
+                two_hops = np.concatenate([indices[indptr[neighbor]:indptr[neighbor + 1]] for neighbor in neighbors])
+                candidates, nb_common = np.unique(two_hops, return_counts=True)
+                free = (groups[candidates] < 0) & ~np.isin(candidates, neighbors)
+                if free.any():
+                    groups[candidates[free][np.argmax(nb_common[free])]] = nb_groups
+            nb_groups += 1
+        return groups
+
+    def contract(self, indptr: np.ndarray, indices: np.ndarray, groups: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Builds the coarse graph: two coarse nodes are adjacent if any of their nodes are.
+
+        Args:
+            indptr (np.ndarray), indices (np.ndarray): The fine graph in CSR form.
+            groups (np.ndarray): The coarse node of each fine node.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The coarse graph in CSR form.
+        """
+        nb_groups = int(groups.max()) + 1
+        rows = groups[np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))]
+        columns = groups[indices]
+        edges = np.unique(rows[rows != columns] * nb_groups + columns[rows != columns])
+        rows, columns = np.divmod(edges, nb_groups)
+        return np.searchsorted(rows, np.arange(nb_groups + 1)), columns
+
+    def coarsen(self) -> None:
+        """
+        Coarsens the graph until it has at most `min_nodes` nodes or stops shrinking.
+        The first level groups the nodes by `parent_groups` when it is given (eg. the
+        région of each département), the next ones merge matched nodes.
+
+        The nodes of a parent group are usually adjacent, so unlike the matched levels,
+        projecting a legal coloring through the first level gives all the nodes of a group
+        the same color and leaves conflicts between them, which the refinement repairs.
+
+        Returns:
+            None
+        """
+        if self.parent_groups is not None:
+            groups = np.unique(self.parent_groups, return_inverse=True)[1].ravel()
+            self.groups.append(groups)
+            self.levels.append(self.contract(*self.levels[-1], groups))
+
+        while len(self.levels[-1][0]) - 1 > self.min_nodes:
+            groups = self.match(*self.levels[-1])
+            nb_groups = int(groups.max()) + 1
+            # Stop when matching no longer shrinks the graph, eg. on a clique
+            if nb_groups > 0.9 * len(groups):
+                break
+            self.groups.append(groups)
+            self.levels.append(self.contract(*self.levels[-1], groups))
+        self.instrumentation.count("levels", len(self.levels))
+
+    def solve_coarsest(self) -> np.ndarray:
+        """
+        Colors the coarsest graph with `algorithm_class`, which stops at `target_conflicts`
+        like the other levels.
+
+        Returns:
+            np.ndarray: The coloring of the coarsest graph.
+        """
+        indptr, indices = self.levels[-1]
+        nb_nodes = len(indptr) - 1
+        adjacency_matrix = get_adjacency_matrix(indptr, indices)
+
+        accepted = inspect.signature(self.algorithm_class).parameters
+        kwargs = dict(self.parameters, adjacency_matrix=adjacency_matrix, max_colors=self.max_colors)
+        if 'nb_nodes' in accepted:
+            kwargs['nb_nodes'] = nb_nodes
+        solver = self.algorithm_class(**kwargs)
+        solver.target_conflicts = self.target_conflicts
+        return np.array(solver.launch(), dtype=np.uint8)
+
+    def launch(self) -> list[int]:
+        """
+        Launches the multilevel coloring: the graph is coarsened, the coarsest graph is
+        colored by `algorithm_class`, then the coloring is projected back one level at a
+        time and repaired by a parallel min-conflicts search, which only moves the nodes
+        in conflict and is therefore local. The conflicts to repair come from the coarse
+        coloring itself and, with `parent_groups`, from the nodes merged by region. The original graph gets `refine_iterations`
+        iterations and the coarser levels a number proportional to their size, since
+        their conflicts are mostly left to the finer levels anyway.
+
+        Returns:
+            list[int]: The coloring of the original graph.
+        """
+        instrumentation = self.instrumentation
+        with instrumentation.phase("coarsening"):
+            self.coarsen()
+        with instrumentation.phase("coarsest_solve"):
+            colors = self.solve_coarsest()
+
+        for level in range(len(self.groups) - 1, -1, -1):
+            indptr, indices = self.levels[level]
+            nb_nodes = len(indptr) - 1
+            with instrumentation.phase("refinement"):
+                refinement = ParallelMinConflictsAlgorithm(
+                    nb_nodes=nb_nodes,
+                    adjacency_matrix=None,
+                    max_colors=self.max_colors,
+                    max_iterations=max(self.refine_iterations * nb_nodes // self.nb_nodes, 1),
+                    seed=self.rng.integers(2 ** 32),
+                    colors=colors[self.groups[level]],
+                    adjacency_lists=(indptr, indices)
+                )
+                refinement.target_conflicts = self.target_conflicts
+                instrumentation.count("projected_conflicts", refinement.conflicts)
+                colors = np.array(refinement.launch(), dtype=np.uint8)
+
+        return colors.tolist()
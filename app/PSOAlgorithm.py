@@ -1,7 +1,15 @@
 import random
 import numpy as np
 
+from checkpoint import Checkpointer, get_global_rng_state, set_global_rng_state
+from instrumentation import DISABLED, Instrumentation
+from utils import get_nb_conflicts_bitset, pack_adjacency
+
 class PSOAlgorithm:
+    instrumentation: Instrumentation = DISABLED
+    checkpointer: Checkpointer = None
+    target_conflicts: int = 0  # Proven optimum (see `utils.get_conflicts_lower_bound`), the search stops there
+
     def __init__(
             self,
             nb_nodes: int,
@@ -14,6 +22,15 @@ class PSOAlgorithm:
             social_weight: float
         ):
 
+        # Arguments describing the run, recorded with its results (see `results_statistics.get_algorithm_parameters`)
+        self.arguments: dict = {
+            'max_colors': max_colors,
+            'max_iterations': max_iterations,
+            'swarm_size': swarm_size,
+            'inertia_weight': inertia_weight,
+            'cognitive_weight': cognitive_weight,
+            'social_weight': social_weight
+        }
         self.nb_nodes: int = nb_nodes
         self.adjacency_matrix: np.ndarray  = adjacency_matrix
         self.max_colors: int = max_colors
@@ -22,10 +39,12 @@ class PSOAlgorithm:
         self.inertia_weight: float = inertia_weight
         self.cognitive_weight: float = cognitive_weight
         self.social_weight: float = social_weight
+        self.packed_adjacency: np.ndarray = pack_adjacency(adjacency_matrix)
         
         self.particles = []
         self.best_solution = []
         self.best_conflicts: float = float('inf')
+        self.iteration: int = 0
 
     def initialize_particles(self) -> None:
         """Initializes the particles with random colorations.
@@ -36,30 +55,25 @@ class PSOAlgorithm:
         """
         self.particles = []
         for _ in range(self.swarm_size):
-            colors = [random.randint(0, self.max_colors - 1) for _ in range(self.nb_nodes)]
+            colors = np.random.randint(0, self.max_colors, size=self.nb_nodes, dtype=np.uint8)
             self.particles.append({
                 'position': colors,         # Position de la particule (coloration)
                 'velocity': [0] * self.nb_nodes,  # Vitesse de la particule (changement dans la coloration)
-                'best_position': colors,    # Meilleure position de la particule
+                'best_position': colors.copy(),    # Meilleure position de la particule
                 'best_conflicts': self.get_fitness(colors)  # Conflits pour cette position
             })
 
-    def get_fitness(self, colors: list[int]) -> int:
+    def get_fitness(self, colors: np.ndarray) -> int:
         """
         Function that returns the fitness ie. the number of conflicts in the solution
 
         Args:
-            colors (list[int])
+            colors (np.ndarray)
 
         Returns:
             conflicts (int) the number of conflicts in the solution
         """
-        conflicts = 0
-        for i in range(self.nb_nodes):
-            for j in range(self.nb_nodes):
-                if self.adjacency_matrix[i][j] == 1 and colors[i] == colors[j]:  # Conflict
-                    conflicts += 1
-        return conflicts // 2  # Each conflict is counted twice (i -> j and j -> i)
+        return get_nb_conflicts_bitset(self.packed_adjacency, colors, self.max_colors)
     
     def update_velocity(self, particle: dict) -> None:
         """Updates the velocity of the particle.
@@ -77,8 +91,9 @@ class PSOAlgorithm:
             r1 = random.random()  # Random factor for cognitive component
             r2 = random.random()  # Random factor for social component
 
-            cognitive_component = self.cognitive_weight * r1 * (particle['best_position'][i] - particle['position'][i])
-            social_component = self.social_weight * r2 * (self.best_solution[i] - particle['position'][i])
+            position = int(particle['position'][i])
+            cognitive_component = self.cognitive_weight * r1 * (int(particle['best_position'][i]) - position)
+            social_component = self.social_weight * r2 * (int(self.best_solution[i]) - position)
             inertia_component = self.inertia_weight * particle['velocity'][i]
 
             particle['velocity'][i] = inertia_component + cognitive_component + social_component
@@ -97,7 +112,7 @@ class PSOAlgorithm:
             particle (dict): A dictionary representing the particle, containing 'position' and 'velocity'.
         """
         for i in range(self.nb_nodes):
-            particle['position'][i] = (particle['position'][i] + int(particle['velocity'][i])) % self.max_colors
+            particle['position'][i] = (int(particle['position'][i]) + int(particle['velocity'][i])) % self.max_colors
 
 
     def update_personal_best(self, particle: dict) -> None:
@@ -110,9 +125,11 @@ class PSOAlgorithm:
             particle (dict): A dictionary representing the particle, containing 'position', 
                             'best_position', and 'best_conflicts'.
         """
-        current_conflicts = self.get_fitness(particle['position'])
+        with self.instrumentation.phase("fitness"):
+            current_conflicts = self.get_fitness(particle['position'])
+        self.instrumentation.count("evaluations")
         if current_conflicts < particle['best_conflicts']:
-            particle['best_position'] = particle['position']
+            particle['best_position'] = particle['position'].copy()
             particle['best_conflicts'] = current_conflicts
 
 
@@ -126,9 +143,44 @@ class PSOAlgorithm:
         """
         for particle in self.particles:
             if particle['best_conflicts'] < self.best_conflicts:
-                self.best_solution = particle['best_position']
+                self.best_solution = particle['best_position'].copy()
                 self.best_conflicts = particle['best_conflicts']
 
+    def get_state(self) -> dict:
+        """
+        Returns the full search state of the algorithm, random generators included.
+        """
+        return {
+            'positions': np.array([particle['position'] for particle in self.particles]),
+            'velocities': np.array([particle['velocity'] for particle in self.particles], dtype=float),
+            'best_positions': np.array([particle['best_position'] for particle in self.particles]),
+            'best_conflicts_particles': [particle['best_conflicts'] for particle in self.particles],
+            'best_solution': self.best_solution,
+            'best_conflicts': self.best_conflicts,
+            'iteration': self.iteration,
+            'rng': get_global_rng_state(),
+        }
+
+    def set_state(self, state: dict) -> None:
+        """
+        Restores a state returned by `get_state`, so that `launch` resumes the search.
+        """
+        self.particles = [
+            {
+                'position': position.copy(),
+                'velocity': velocity.tolist(),
+                'best_position': best_position.copy(),
+                'best_conflicts': best_conflicts
+            }
+            for position, velocity, best_position, best_conflicts in zip(
+                state['positions'], state['velocities'], state['best_positions'], state['best_conflicts_particles']
+            )
+        ]
+        self.best_solution = state['best_solution'].copy()
+        self.best_conflicts = state['best_conflicts']
+        self.iteration = state['iteration']
+        set_global_rng_state(state['rng'])
+
     def launch(self) -> list[int]:
         """
         Launches the PSO search algorithm for graph coloring.
@@ -137,22 +189,28 @@ class PSOAlgorithm:
             list[int]: The best coloring solution found, represented as a list where 
                         each element is the color assigned to the corresponding node.
         """
-        self.initialize_particles()
-        self.best_solution = self.particles[0]['position']
-        self.best_conflicts = self.particles[0]['best_conflicts']
+        if self.iteration == 0:
+            self.initialize_particles()
+            self.best_solution = self.particles[0]['position'].copy()
+            self.best_conflicts = self.particles[0]['best_conflicts']
 
-        iteration = 0
-        while iteration < self.max_iterations and self.best_conflicts > 0:
+        while self.iteration < self.max_iterations and self.best_conflicts > self.target_conflicts:
             for particle in self.particles:
                 # Mettre à jour la vitesse et la position de chaque particule
-                self.update_velocity(particle)
-                self.update_position(particle)
+                with self.instrumentation.phase("velocity"):
+                    self.update_velocity(particle)
+                with self.instrumentation.phase("position"):
+                    self.update_position(particle)
                 # Mettre à jour la meilleure position de la particule
                 self.update_personal_best(particle)
 
             # Mettre à jour la meilleure solution globale
             self.update_global_best()
+            self.instrumentation.trace(self.best_conflicts, self.best_solution)
+
+            self.iteration += 1
 
-            iteration += 1
+            if self.checkpointer is not None:
+                self.checkpointer.step(self)
 
-        return self.best_solution
+        return self.best_solution.tolist()
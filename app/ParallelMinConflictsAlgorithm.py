@@ -0,0 +1,163 @@
+import numpy as np
+
+from instrumentation import DISABLED, Instrumentation
+from utils import get_adjacency_lists
+
+class ParallelMinConflictsAlgorithm:
+    instrumentation: Instrumentation = DISABLED
+    target_conflicts: int = 0  # Proven optimum (see `utils.get_conflicts_lower_bound`), the search stops there
+
+    def __init__(
+            self,
+            nb_nodes: int,
+            adjacency_matrix: np.ndarray,
+            max_colors: int,
+            max_iterations: int,
+            tabu_tenure: int = 10,
+            noise: float = 0.05,
+            seed: int = None,
+            colors: np.ndarray = None,
+            adjacency_lists: tuple[np.ndarray, np.ndarray] = None
+        ):
+        # Arguments describing the run, recorded with its results (see `results_statistics.get_algorithm_parameters`)
+        self.arguments: dict = {
+            'max_colors': max_colors,
+            'max_iterations': max_iterations,
+            'tabu_tenure': tabu_tenure,
+            'noise': noise
+        }
+        self.nb_nodes: int = nb_nodes
+        self.adjacency_matrix: np.ndarray = adjacency_matrix
+        self.max_colors: int = max_colors
+        self.max_iterations: int = max_iterations
+        self.tabu_tenure: int = tabu_tenure
+        self.noise: float = noise
+        self.rng: np.random.Generator = np.random.default_rng(seed)
+
+        # Adjacency lists in CSR form, so that a step only visits the edges of the nodes involved.
+        # They can be given directly for graphs too large for a dense adjacency matrix.
+        self.indptr, self.indices = adjacency_lists or get_adjacency_lists(adjacency_matrix)
+        rows = np.repeat(np.arange(nb_nodes), np.diff(self.indptr))
+
+        # Starting from a good coloring instead of a random one makes the search a local repair
+        if colors is None:
+            colors = self.rng.integers(0, max_colors, size=nb_nodes, dtype=np.uint8)
+        self.colors: np.ndarray = np.asarray(colors, dtype=np.uint8).copy()
+        # Number of neighbours of each node having each color
+        self.neighbors_colors: np.ndarray = np.zeros((nb_nodes, max_colors), dtype=np.int32)
+        np.add.at(self.neighbors_colors, (rows, self.colors[self.indices]), 1)
+        self.conflicts: int = int(self.neighbors_colors[np.arange(nb_nodes), self.colors].sum()) // 2
+        # Iteration until which giving back a color to a node is tabu
+        self.tabu_until: np.ndarray = np.zeros((nb_nodes, max_colors), dtype=int)
+
+        self.best_solution: np.ndarray = self.colors.copy()
+        self.best_conflicts: int = self.conflicts
+
+    def get_edges(self, nodes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Lists the edges of a set of nodes.
+
+        Args:
+            nodes (np.ndarray): The nodes.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: For each edge, the position of its end in `nodes`
+                                           and the neighbour at its other end.
+        """
+        degrees = self.indptr[nodes + 1] - self.indptr[nodes]
+        positions = np.repeat(np.arange(len(nodes)), degrees)
+        offsets = np.arange(degrees.sum()) - np.repeat(np.cumsum(degrees) - degrees, degrees)
+        return positions, self.indices[self.indptr[nodes][positions] + offsets]
+
+    def select_moving_nodes(self) -> np.ndarray:
+        """
+        Selects an independent set of conflicting nodes with one round of Luby's
+        algorithm: a conflicting node moves if its random priority is higher than the
+        priorities of all its conflicting neighbours.
+
+        Since no two selected nodes are adjacent, the delta of each move does not depend
+        on the other moves, and all of them can be applied at once.
+
+        Returns:
+            np.ndarray: The selected nodes.
+        """
+        conflicting = np.flatnonzero(self.neighbors_colors[np.arange(self.nb_nodes), self.colors] > 0)
+        priorities = np.full(self.nb_nodes, -1.0)
+        priorities[conflicting] = self.rng.random(len(conflicting))
+
+        positions, neighbors = self.get_edges(conflicting)
+        neighbors_priorities = np.full(len(conflicting), -1.0)
+        np.maximum.at(neighbors_priorities, positions, priorities[neighbors])
+        return conflicting[priorities[conflicting] > neighbors_priorities]
+
+    def step(self, iteration: int) -> None:
+        """
+        Moves every node of an independent set of conflicting nodes to its best non-tabu
+        color, which may be its current one, or with probability `noise` to a random other
+        color, in one vectorised operation.
+
+        Args:
+            iteration (int): The current iteration, for the tabu restrictions.
+
+        Returns:
+            None
+        """
+        # With a single color there is no other color to move to
+        if self.max_colors < 2:
+            return
+
+        instrumentation = self.instrumentation
+        with instrumentation.phase("selection"):
+            nodes = self.select_moving_nodes()
+        if len(nodes) == 0:
+            return
+
+        with instrumentation.phase("moves"):
+            old_colors = self.colors[nodes]
+            costs = self.neighbors_colors[nodes].astype(float)
+            costs[self.tabu_until[nodes] > iteration] = np.inf
+            # Random tie-breaking between colors with the same number of conflicts
+            costs += self.rng.random(costs.shape) * 0.5
+            new_colors = np.argmin(costs, axis=1).astype(np.uint8)
+
+            # Random walk to leave the plateaus, and fallback when every color is tabu
+            random_walk = (self.rng.random(len(nodes)) < self.noise) | np.isinf(costs.min(axis=1))
+            new_colors[random_walk] = (
+                old_colors[random_walk] + self.rng.integers(1, self.max_colors, size=random_walk.sum())
+            ) % self.max_colors
+
+        with instrumentation.phase("update"):
+            delta = self.neighbors_colors[nodes, new_colors] - self.neighbors_colors[nodes, old_colors]
+            self.conflicts += int(delta.sum())
+            self.colors[nodes] = new_colors
+            changed = new_colors != old_colors
+            self.tabu_until[nodes[changed], old_colors[changed]] = iteration + self.tabu_tenure
+            instrumentation.count("moves", int(changed.sum()))
+            # Only the neighbours of the moved nodes change, one (moved node, neighbour) pair per edge
+            moved, neighbors = self.get_edges(nodes)
+            np.subtract.at(self.neighbors_colors, (neighbors, old_colors[moved]), 1)
+            np.add.at(self.neighbors_colors, (neighbors, new_colors[moved]), 1)
+
+    def launch(self) -> list[int]:
+        """
+        Launches the parallel min-conflicts search: at each iteration, an independent
+        set of conflicting nodes is recolored at once, which makes hundreds of moves
+        per iteration on large sparse graphs.
+
+        Returns:
+            list[int]: The best coloring solution found, represented as a list where
+                        each element is the color assigned to the corresponding node.
+        """
+        instrumentation = self.instrumentation
+        for iteration in range(self.max_iterations):
+            if self.best_conflicts <= self.target_conflicts:
+                break
+
+            self.step(iteration)
+            if self.conflicts < self.best_conflicts:
+                self.best_conflicts = self.conflicts
+                self.best_solution = self.colors.copy()
+
+            instrumentation.trace(self.best_conflicts, self.best_solution)
+
+        return self.best_solution.tolist()
@@ -0,0 +1,145 @@
+import numpy as np
+
+from instrumentation import DISABLED, Instrumentation
+
+class ParallelTemperingAlgorithm:
+    instrumentation: Instrumentation = DISABLED
+    target_conflicts: int = 0  # Proven optimum (see `utils.get_conflicts_lower_bound`), the search stops there
+
+    def __init__(
+            self,
+            nb_nodes: int,
+            adjacency_matrix: np.ndarray,
+            max_colors: int,
+            iterations: int,
+            nb_replicas: int = 16,
+            min_temperature: float = 0.05,
+            max_temperature: float = 5.0,
+            swap_interval: int = 10,
+            seed: int = None
+        ):
+        # Arguments describing the run, recorded with its results (see `results_statistics.get_algorithm_parameters`)
+        self.arguments: dict = {
+            'max_colors': max_colors,
+            'iterations': iterations,
+            'nb_replicas': nb_replicas,
+            'min_temperature': min_temperature,
+            'max_temperature': max_temperature,
+            'swap_interval': swap_interval
+        }
+        self.nb_nodes: int = nb_nodes
+        self.adjacency_matrix: np.ndarray = adjacency_matrix
+        self.max_colors: int = max_colors
+        self.iterations: int = iterations
+        self.nb_replicas: int = nb_replicas
+        self.swap_interval: int = swap_interval
+        self.rng: np.random.Generator = np.random.default_rng(seed)
+
+        # Geometric ladder of temperatures, one per replica (coldest first)
+        self.temperatures: np.ndarray = np.geomspace(min_temperature, max_temperature, nb_replicas)
+
+        # Random initial states, one row per replica
+        self.states: np.ndarray = self.rng.integers(0, max_colors, size=(nb_replicas, nb_nodes), dtype=np.uint8)
+        self.fitness: np.ndarray = self.get_fitness(self.states)
+
+        best_replica = np.argmin(self.fitness)
+        self.min_fitness: int = int(self.fitness[best_replica])
+        self.min_sol: np.ndarray = self.states[best_replica].copy()
+
+    def get_fitness(self, states: np.ndarray) -> np.ndarray:
+        """
+        Computes the number of conflicts of every replica at once.
+
+        Args:
+            states (np.ndarray): A (replicas x nb_nodes) array of colorings.
+
+        Returns:
+            np.ndarray: The number of conflicts of each replica.
+        """
+        same_color = states[:, :, None] == states[:, None, :]
+        return (same_color & (self.adjacency_matrix == 1)).sum(axis=(1, 2)) // 2
+
+    def step(self) -> None:
+        """
+        Proposes one move to every replica and accepts or rejects all of them with
+        the Metropolis criterion at the temperature of each replica.
+
+        Returns:
+            None
+        """
+        # With a single color there is no other color to move to
+        if self.max_colors < 2:
+            return
+
+        replicas = np.arange(self.nb_replicas)
+        nodes = self.rng.integers(0, self.nb_nodes, size=self.nb_replicas)
+        old_colors = self.states[replicas, nodes]
+        # Draw a new color different from the current one
+        new_colors = (old_colors + self.rng.integers(1, self.max_colors, size=self.nb_replicas)) % self.max_colors
+
+        neighbors = self.adjacency_matrix[nodes] == 1
+        delta = (
+            (neighbors & (self.states == new_colors[:, None])).sum(axis=1)
+            - (neighbors & (self.states == old_colors[:, None])).sum(axis=1)
+        )
+
+        # Improving moves are always accepted, exp is only evaluated for worse ones
+        accepted = delta <= 0
+        worse = ~accepted
+        if worse.any():
+            accepted[worse] = self.rng.random(worse.sum()) < np.exp(-delta[worse] / self.temperatures[worse])
+
+        self.states[replicas[accepted], nodes[accepted]] = new_colors[accepted]
+        self.fitness[accepted] += delta[accepted]
+        self.instrumentation.count("evaluations", self.nb_replicas)
+        self.instrumentation.count("accepted_moves", int(accepted.sum()))
+
+    def swap_replicas(self, offset: int) -> None:
+        """
+        Attempts to exchange the states of neighbouring temperatures (i, i + 1),
+        starting at `offset`, with the replica exchange Metropolis criterion.
+
+        Args:
+            offset (int): 0 to try the pairs (0, 1), (2, 3)... and 1 for (1, 2), (3, 4)...
+
+        Returns:
+            None
+        """
+        low = np.arange(offset, self.nb_replicas - 1, 2)
+        high = low + 1
+        betas = 1 / self.temperatures
+        log_ratio = (betas[low] - betas[high]) * (self.fitness[low] - self.fitness[high])
+        swap = np.log(self.rng.random(len(low))) < np.minimum(log_ratio, 0)
+
+        low, high = low[swap], high[swap]
+        self.instrumentation.count("swaps", len(low))
+        self.states[[*low, *high]] = self.states[[*high, *low]]
+        self.fitness[[*low, *high]] = self.fitness[[*high, *low]]
+
+    def launch(self) -> list[int]:
+        """
+        Launch the replica exchange simulated annealing to find a solution.
+
+        Returns:
+            list[int]: The best solution found over all the replicas.
+        """
+        instrumentation = self.instrumentation
+        for iteration in range(1, self.iterations + 1):
+            with instrumentation.phase("step"):
+                self.step()
+
+            best_replica = np.argmin(self.fitness)
+            if self.fitness[best_replica] < self.min_fitness:
+                self.min_fitness = int(self.fitness[best_replica])
+                self.min_sol = self.states[best_replica].copy()
+            instrumentation.trace(self.min_fitness, self.min_sol)
+
+            # if the optimum is reached, then return the solution
+            if self.min_fitness <= self.target_conflicts:
+                break
+
+            if iteration % self.swap_interval == 0:
+                with instrumentation.phase("swap_replicas"):
+                    self.swap_replicas((iteration // self.swap_interval) % 2)
+
+        return self.min_sol.tolist()
@@ -0,0 +1,151 @@
+import numpy as np
+
+from instrumentation import DISABLED, Instrumentation
+from utils import get_adjacency_lists, get_nb_conflicts_bitset, pack_adjacency
+
+class PartialColAlgorithm:
+    instrumentation: Instrumentation = DISABLED
+    target_conflicts: int = 0  # Proven optimum (see `utils.get_conflicts_lower_bound`), the search stops there
+
+    def __init__(
+            self,
+            nb_nodes: int,
+            adjacency_matrix: np.ndarray,
+            max_colors: int,
+            max_iterations: int,
+            tabu_tenure: int = 10,
+            tabu_factor: float = 0.6,
+            seed: int = None
+        ):
+        # Arguments describing the run, recorded with its results (see `results_statistics.get_algorithm_parameters`)
+        self.arguments: dict = {
+            'max_colors': max_colors,
+            'max_iterations': max_iterations,
+            'tabu_tenure': tabu_tenure,
+            'tabu_factor': tabu_factor
+        }
+        self.nb_nodes: int = nb_nodes
+        self.adjacency_matrix: np.ndarray = adjacency_matrix
+        self.max_colors: int = max_colors
+        self.max_iterations: int = max_iterations
+        self.tabu_tenure: int = tabu_tenure
+        self.tabu_factor: float = tabu_factor
+        self.packed_adjacency: np.ndarray = pack_adjacency(adjacency_matrix)
+        self.rng: np.random.Generator = np.random.default_rng(seed)
+
+        # Adjacency lists in CSR form, a move only visits the neighbours of one node
+        self.indptr, self.indices = get_adjacency_lists(adjacency_matrix)
+
+        # Legal partial coloring, the uncolored nodes have the color max_colors
+        self.colors: np.ndarray = np.full(nb_nodes, max_colors, dtype=np.uint8)
+        # Number of colored neighbours of each node having each color
+        self.neighbors_colors: np.ndarray = np.zeros((nb_nodes, max_colors), dtype=np.int32)
+        # Iteration until which putting a node back in a color class is tabu
+        self.tabu_until: np.ndarray = np.zeros((nb_nodes, max_colors), dtype=int)
+
+    def get_neighbors(self, node: int) -> np.ndarray:
+        """
+        Returns the neighbours of a node.
+        """
+        return self.indices[self.indptr[node]:self.indptr[node + 1]]
+
+    def set_color(self, node: int, color: int) -> None:
+        """
+        Colors an uncolored node and updates the color counts of its neighbours.
+        """
+        self.colors[node] = color
+        self.neighbors_colors[self.get_neighbors(node), color] += 1
+
+    def uncolor(self, nodes: np.ndarray) -> None:
+        """
+        Moves colored nodes to the pool of uncolored nodes.
+        """
+        for node in nodes:
+            self.neighbors_colors[self.get_neighbors(node), self.colors[node]] -= 1
+            self.colors[node] = self.max_colors
+
+    def greedy_coloring(self) -> None:
+        """
+        Builds the initial partial coloring: the nodes, in random order, get the first
+        color none of their neighbours has, or stay uncolored.
+
+        Returns:
+            None
+        """
+        for node in self.rng.permutation(self.nb_nodes):
+            free_colors = np.flatnonzero(self.neighbors_colors[node] == 0)
+            if len(free_colors) > 0:
+                self.set_color(node, free_colors[0])
+
+    def complete(self) -> np.ndarray:
+        """
+        Completes the partial coloring: each uncolored node gets the color with the
+        fewest neighbours, so that the solution can be compared with the other algorithms.
+
+        Returns:
+            np.ndarray: A complete coloring.
+        """
+        solution = self.colors.copy()
+        for node in np.flatnonzero(solution == self.max_colors):
+            neighbors = self.get_neighbors(node)
+            counts = np.bincount(solution[neighbors], minlength=self.max_colors + 1)[:self.max_colors]
+            solution[node] = np.argmin(counts)
+        return solution
+
+    def launch(self) -> list[int]:
+        """
+        Launches the PartialCol tabu search: the coloring always stays legal and the
+        search minimizes the number of uncolored nodes instead of the number of conflicts.
+
+        A move gives a color to an uncolored node and uncolors its neighbours having
+        that color, so it only evaluates the (pool size x max_colors) moves of the pool.
+        A node leaving a color class cannot come back to it for
+        `tabu_factor * pool size + random(tabu_tenure)` iterations, unless the move
+        leads to a smaller pool than the best one found.
+
+        Returns:
+            list[int]: The best coloring found, completed with the color with the fewest
+                        conflicts for the nodes left uncolored.
+        """
+        instrumentation = self.instrumentation
+        self.greedy_coloring()
+        pool = np.flatnonzero(self.colors == self.max_colors)
+
+        best_pool_size = len(pool)
+        best_solution = self.complete()
+        best_conflicts = get_nb_conflicts_bitset(self.packed_adjacency, best_solution, self.max_colors)
+
+        for iteration in range(self.max_iterations):
+            instrumentation.trace(best_conflicts, best_solution)
+            if best_pool_size == 0 or best_conflicts <= self.target_conflicts:
+                break
+
+            with instrumentation.phase("evaluation"):
+                # Change of the pool size for each (uncolored node, color) move
+                delta = self.neighbors_colors[pool] - 1
+                allowed = (self.tabu_until[pool] <= iteration) | (len(pool) + delta < best_pool_size)
+                if not allowed.any():
+                    allowed[:] = True
+                delta = np.where(allowed, delta, np.iinfo(np.int32).max)
+                candidates = np.argwhere(delta == delta.min())
+                position, color = candidates[self.rng.integers(len(candidates))]
+                node = pool[position]
+            instrumentation.count("evaluations", delta.size)
+
+            with instrumentation.phase("move"):
+                neighbors = self.get_neighbors(node)
+                removed = neighbors[self.colors[neighbors] == color]
+                self.uncolor(removed)
+                self.set_color(node, color)
+
+                tenure = int(self.tabu_factor * len(pool)) + int(self.rng.integers(0, max(self.tabu_tenure, 1)))
+                self.tabu_until[removed, color] = iteration + tenure
+                pool = np.concatenate((np.delete(pool, position), removed))
+            instrumentation.count("moves")
+
+            if len(pool) < best_pool_size:
+                best_pool_size = len(pool)
+                best_solution = self.complete()
+                best_conflicts = get_nb_conflicts_bitset(self.packed_adjacency, best_solution, self.max_colors)
+
+        return best_solution.tolist()
@@ -1,92 +1,298 @@
+import math
 import random
 import numpy as np
 
+from checkpoint import Checkpointer, get_global_rng_state, set_global_rng_state
+from cooling_schedules import SCHEDULES, CoolingSchedule, estimate_initial_temperature
+from instrumentation import DISABLED, Instrumentation
+from utils import get_adjacency_lists, get_nb_conflicts_bitset, pack_adjacency
+
+# Above this value of delta / T, exp(-delta / T) < 1e-17 and the move is rejected without computing it
+MAX_EXPONENT = 40
+# A level is frozen when less than this rate of its moves are accepted worsening moves
+FROZEN_RATE = 0.01
+
 class SimulatedAnnealingAlgorithm:
+    instrumentation: Instrumentation = DISABLED
+    checkpointer: Checkpointer = None
+    target_conflicts: int = 0  # Proven optimum (see `utils.get_conflicts_lower_bound`), the search stops there
+
     def __init__(
             self,
             nb_nodes: int,
             adjacency_matrix: np.ndarray,
             max_colors: int,
-            initial_temperature: float,
-            factor: float,
-            iterations: int,
+            initial_temperature: float = None,
+            factor: float = None,
+            iterations: int = 500,
+            schedule: str = 'geometric',
+            moves_per_level: int = None,
+            reheat_after: int = 10,
+            reheat_ratio: float = 0.25
         ):
+        """
+        Args:
+            initial_temperature (float): The temperature of the first level, estimated from
+                                         random moves of the initial solution when None.
+            factor (float): The cooling factor of each level of the geometric schedule, chosen
+                            to reach the final temperature at the last level when None.
+            iterations (int): The total number of moves.
+            schedule (str): 'geometric', 'linear' or 'adaptive' (see `cooling_schedules`).
+            moves_per_level (int): The number of moves at each temperature, n * (k - 1) ie.
+                                   the size of the neighbourhood when None.
+            reheat_after (int): The number of frozen levels without improvement of the best
+                                solution after which the temperature goes back up, 0 to never reheat.
+            reheat_ratio (float): The reheating temperature, relative to the initial one.
+        """
+        # Arguments describing the run, recorded with its results (see `results_statistics.get_algorithm_parameters`)
+        self.arguments: dict = {
+            'max_colors': max_colors,
+            'initial_temperature': initial_temperature,
+            'factor': factor,
+            'iterations': iterations,
+            'schedule': schedule,
+            'moves_per_level': moves_per_level,
+            'reheat_after': reheat_after,
+            'reheat_ratio': reheat_ratio
+        }
         self.nb_nodes: int = nb_nodes
         self.adjacency_matrix: np.ndarray = adjacency_matrix
         self.max_colors: int = max_colors
-        self.initial_temperature: float = initial_temperature
         self.factor: float = factor
-        self.solution: list[int] = [random.randint(0, max_colors - 1) for _ in range(nb_nodes)]  # Random initial solution
+        self.packed_adjacency: np.ndarray = pack_adjacency(adjacency_matrix)
+        self.solution: np.ndarray = np.random.randint(0, max_colors, size=nb_nodes, dtype=np.uint8)  # Random initial solution
         self.min_fitness: int = self.get_fitness(self.solution)  # Initial cost
-        self.min_sol: list[int] = self.solution[:]
+        self.min_sol: np.ndarray = self.solution.copy()
         self.iterations: int = iterations
+        self.moves_per_level: int = moves_per_level or max(nb_nodes * (max_colors - 1), 1)
+        self.reheat_after: int = reheat_after
+        self.reheat_ratio: float = reheat_ratio
+
+        # Adjacency lists in CSR form and number of neighbours of each node having each color,
+        # so that the delta of a move is read in O(1) and only an accepted move costs O(degree)
+        self.indptr, self.indices = get_adjacency_lists(adjacency_matrix)
+        self.neighbors_colors: np.ndarray = self.count_neighbors_colors(self.solution)
 
-    def get_fitness(self, solution: list[int]) -> int:
+        self.initial_temperature: float = initial_temperature
+        # Temperature of the first level, the parameter itself is kept to describe the run in the results
+        self.start_temperature: float = initial_temperature or estimate_initial_temperature(self.sample_deltas())
+        self.schedule: str = schedule
+        self.cooling_schedule: CoolingSchedule = self.create_schedule()
+
+        # Search state, saved in the checkpoints
+        self.iteration: int = 0
+        self.temperature: float = self.start_temperature
+        self.current_fitness: int = self.min_fitness
+        # Statistics of the current level: moves, accepted worsening moves, sum and sum of squares of the costs
+        self.level_moves: int = 0
+        self.level_uphill: int = 0
+        self.level_costs: float = 0.0
+        self.level_squared_costs: float = 0.0
+        self.stagnant_levels: int = 0
+        self.level_start_fitness: int = self.min_fitness
+
+    def get_fitness(self, solution: np.ndarray) -> int:
         """
         Function that returns the fitness ie. the number of conflicts in the solution
 
         Args:
-            solution (list[int])
+            solution (np.ndarray)
 
         Returns:
             conflicts (int) the number of conflicts in the solution
         """
-        conflicts = 0
-        for i in range(self.nb_nodes):
-            for j in range(self.nb_nodes):
-                if self.adjacency_matrix[i][j] == 1 and solution[i] == solution[j]:  # Conflict
-                    conflicts += 1
-        return conflicts // 2  # Each conflict is counted twice (i -> j and j -> i)
+        return get_nb_conflicts_bitset(self.packed_adjacency, solution, self.max_colors)
+
+    def count_neighbors_colors(self, solution: np.ndarray) -> np.ndarray:
+        """
+        Counts the neighbours of each node having each color.
+
+        Returns:
+            np.ndarray: A (nb_nodes, max_colors) array.
+        """
+        counts = np.zeros((self.nb_nodes, self.max_colors), dtype=np.int32)
+        rows = np.repeat(np.arange(self.nb_nodes), np.diff(self.indptr))
+        np.add.at(counts, (rows, solution[self.indices]), 1)
+        return counts
+
+    def sample_deltas(self, nb_samples: int = 1000) -> np.ndarray:
+        """
+        Computes the change of the number of conflicts of random moves of the current solution.
+
+        Returns:
+            np.ndarray: The deltas of `nb_samples` moves, at most the size of the neighbourhood,
+                        none with a single color.
+        """
+        if self.max_colors < 2:
+            return np.zeros(0, dtype=np.int32)
+        nb_samples = min(nb_samples, self.moves_per_level)
+        nodes = np.random.randint(0, self.nb_nodes, size=nb_samples)
+        colors = (self.solution[nodes] + np.random.randint(1, self.max_colors, size=nb_samples)) % self.max_colors
+        return self.neighbors_colors[nodes, colors] - self.neighbors_colors[nodes, self.solution[nodes]]
 
-    def neighborhood(self, solution: list[int]) -> list[int]:
+    def neighborhood(self, solution: np.ndarray) -> tuple[int, int]:
         """
-        Generates the adjacency matrix for the regions of France.
+        Draws a random neighbour of the solution, ie. a node and a new color for it.
 
         Args:
-            solution (list[int])
+            solution (np.ndarray)
 
         Returns:
-            conflicts (int) the number of conflicts in the solution
+            tuple[int, int]: The node and its new color, its current one with a single color.
         """
-        voisin = solution[:]
         sommet = random.randint(0, self.nb_nodes - 1)
-        nouvelle_couleur = random.choice([c for c in range(self.max_colors) if c != solution[sommet]])
-        voisin[sommet] = nouvelle_couleur
-        return voisin
+        if self.max_colors < 2:
+            return sommet, int(solution[sommet])
+        nouvelle_couleur = (int(solution[sommet]) + random.randint(1, self.max_colors - 1)) % self.max_colors
+        return sommet, nouvelle_couleur
 
-    def launch(self) -> list[int]:
+    def create_schedule(self) -> CoolingSchedule:
         """
-        Launch the simulated annealing algorithm to find a solution.
+        Creates the cooling schedule, with the cooling factor for the geometric one.
+        """
+        if self.schedule == 'geometric':
+            return SCHEDULES['geometric'](self.factor)
+        return SCHEDULES[self.schedule]()
+
+    def move(self, node: int, color: int) -> None:
+        """
+        Gives a new color to a node and updates the color counts of its neighbours.
+        """
+        neighbors = self.indices[self.indptr[node]:self.indptr[node + 1]]
+        self.neighbors_colors[neighbors, self.solution[node]] -= 1
+        self.neighbors_colors[neighbors, color] += 1
+        self.solution[node] = color
+
+    def end_level(self) -> None:
+        """
+        Lowers the temperature according to the schedule, or reheats the search when the
+        best solution has not improved for `reheat_after` frozen levels, ie. levels where
+        almost no worsening move is accepted anymore.
 
         Returns:
-            self.min_sol (list[int]) the solution with the minimum fitness found
+            None
+        """
+        mean = self.level_costs / self.level_moves
+        cost_std = math.sqrt(max(self.level_squared_costs / self.level_moves - mean ** 2, 0.0))
+        frozen = self.level_uphill < FROZEN_RATE * self.level_moves
+        stagnant = frozen and self.min_fitness >= self.level_start_fitness
+        self.stagnant_levels = self.stagnant_levels + 1 if stagnant else 0
+
+        if self.reheat_after and self.stagnant_levels >= self.reheat_after:
+            self.temperature = max(self.reheat_ratio * self.start_temperature, self.temperature)
+            self.stagnant_levels = 0
+            self.instrumentation.count("reheats")
+        else:
+            remaining_levels = (self.iterations - self.iteration) // self.moves_per_level
+            self.temperature = self.cooling_schedule.next_temperature(self.temperature, remaining_levels, cost_std)
+        self.instrumentation.count("levels")
+
+        self.level_moves = self.level_uphill = 0
+        self.level_costs = self.level_squared_costs = 0.0
+        self.level_start_fitness = self.min_fitness
+
+    def get_state(self) -> dict:
+        """
+        Returns the full search state of the algorithm, random generators included.
+        """
+        return {
+            'solution': self.solution,
+            'min_sol': self.min_sol,
+            'min_fitness': self.min_fitness,
+            'iteration': self.iteration,
+            'start_temperature': self.start_temperature,
+            'temperature': self.temperature,
+            'current_fitness': self.current_fitness,
+            'level': (self.level_moves, self.level_uphill, self.level_costs, self.level_squared_costs,
+                      self.stagnant_levels, self.level_start_fitness),
+            'rng': get_global_rng_state(),
+        }
+
+    def set_state(self, state: dict) -> None:
+        """
+        Restores a state returned by `get_state`, so that `launch` resumes the search.
+        """
+        self.solution = state['solution'].copy()
+        self.min_sol = state['min_sol'].copy()
+        self.min_fitness = state['min_fitness']
+        self.iteration = state['iteration']
+        self.start_temperature = state['start_temperature']
+        self.temperature = state['temperature']
+        self.current_fitness = state['current_fitness']
+        (self.level_moves, self.level_uphill, self.level_costs, self.level_squared_costs,
+         self.stagnant_levels, self.level_start_fitness) = state['level']
+        set_global_rng_state(state['rng'])
+
+        self.neighbors_colors = self.count_neighbors_colors(self.solution)
+
+    def run_level(self) -> int:
+        """
+        Makes the moves of the current level, until it ends, the optimum is reached or
+        the iterations are exhausted. The loop is not instrumented, so that it costs the
+        same whether the instrumentation is enabled or not.
+
+        Returns:
+            int: The number of accepted moves.
         """
-        # Initialization
-        T = self.initial_temperature
-        current_fitness = self.min_fitness
-        for _ in range(self.iterations):
-            # Update temperature
-            T *= self.factor
+        accepted_moves = 0
+        while self.iteration < self.iterations:
+            T = self.temperature
+            current_fitness = self.current_fitness
 
             # randomly select a neighbor of s uniformly
-            neighbor_sol = self.neighborhood(self.solution) 
-            neighbor_fitness = self.get_fitness(neighbor_sol)  
-            
-            if neighbor_fitness < current_fitness:
-                self.solution = neighbor_sol
-                current_fitness = neighbor_fitness
+            node, color = self.neighborhood(self.solution)
+            delta = int(self.neighbors_colors[node, color] - self.neighbors_colors[node, self.solution[node]])
+
+            # Accept worse solution with a certain probability
+            if delta <= 0 or (delta < MAX_EXPONENT * T and np.random.uniform() < math.exp(-delta / T)):
+                self.move(node, color)
+                current_fitness += delta
+                self.level_uphill += delta > 0
+                accepted_moves += 1
                 # Update the best solution
-                if neighbor_fitness < self.min_fitness:
-                    self.min_fitness = neighbor_fitness
-                    self.min_sol = neighbor_sol
-            else:  # Accept worse solution with a certain probability
-                prob = np.random.uniform()
-                if prob < np.exp((current_fitness - neighbor_fitness) / T):
-                    self.solution = neighbor_sol
-                    current_fitness = neighbor_fitness
-            
-            # if there is no more conflict, then return the solution
-            if self.min_fitness == 0:
+                if current_fitness < self.min_fitness:
+                    self.min_fitness = current_fitness
+                    self.min_sol = self.solution.copy()
+            self.current_fitness = current_fitness
+            self.iteration += 1
+
+            self.level_moves += 1
+            self.level_costs += current_fitness
+            self.level_squared_costs += current_fitness ** 2
+            level_ended = self.level_moves >= self.moves_per_level
+            if level_ended:
+                self.end_level()
+
+            # if the optimum is reached, then return the solution
+            if self.min_fitness <= self.target_conflicts:
+                break
+
+            if self.checkpointer is not None:
+                self.checkpointer.step(self)
+
+            if level_ended:
                 break
+        return accepted_moves
+
+    def launch(self) -> list[int]:
+        """
+        Launch the simulated annealing algorithm to find a solution.
+
+        The temperature stays the same for `moves_per_level` moves, then the schedule
+        lowers it. A move is only evaluated through the color counts of its node, and a
+        worsening move is rejected without computing the exponential when it could not
+        be accepted anyway. The instrumentation times and traces whole levels.
+
+        Returns:
+            self.min_sol (list[int]) the solution with the minimum fitness found
+        """
+        instrumentation = self.instrumentation
+        while self.iteration < self.iterations and self.min_fitness > self.target_conflicts:
+            start = self.iteration
+            with instrumentation.phase("moves"):
+                accepted_moves = self.run_level()
+            instrumentation.count("evaluations", self.iteration - start)
+            instrumentation.count("accepted_moves", accepted_moves)
+            instrumentation.trace(self.min_fitness, self.min_sol)
 
-        return self.min_sol  # Return the best solution found
\ No newline at end of file
+        return self.min_sol.tolist()  # Return the best solution found
@@ -1,7 +1,15 @@
 import random
 import numpy as np
 
+from checkpoint import Checkpointer, get_global_rng_state, set_global_rng_state
+from instrumentation import DISABLED, Instrumentation
+from utils import get_nb_conflicts_bitset, pack_adjacency
+
 class TabuSearchAlgorithm:
+    instrumentation: Instrumentation = DISABLED
+    checkpointer: Checkpointer = None
+    target_conflicts: int = 0  # Proven optimum (see `utils.get_conflicts_lower_bound`), the search stops there
+
     def __init__(
             self,
             nb_nodes: int,
@@ -10,16 +18,20 @@ class TabuSearchAlgorithm:
             max_iterations: int,
             tabu_tenure: int
         ):
+        # Arguments describing the run, recorded with its results (see `results_statistics.get_algorithm_parameters`)
+        self.arguments: dict = {'max_colors': max_colors, 'max_iterations': max_iterations, 'tabu_tenure': tabu_tenure}
         self.nb_nodes: int = nb_nodes
         self.adjacency_matrix: np.ndarray = adjacency_matrix
         self.max_colors: int = max_colors
         self.max_iterations: int = max_iterations
         self.tabu_tenure: int = tabu_tenure
+        self.packed_adjacency: np.ndarray = pack_adjacency(adjacency_matrix)
 
-        self.colors = [0 for _ in range(self.nb_nodes)]
+        self.colors = np.zeros(self.nb_nodes, dtype=np.uint8)
         self.tabu_list = []
         self.best_solution = []
         self.best_conflicts = float('inf')
+        self.iteration: int = 0
         
 
     def get_fitness(self) -> int:
@@ -29,12 +41,7 @@ class TabuSearchAlgorithm:
         Returns:
             conflicts (int) the number of conflicts in the solution
         """
-        conflicts = 0
-        for i in range(self.nb_nodes):
-            for j in range(self.nb_nodes):
-                if self.adjacency_matrix[i][j] == 1 and self.colors[i] == self.colors[j]:  # Conflict
-                    conflicts += 1
-        return conflicts // 2  # Each conflict is counted twice (i -> j and j -> i)
+        return get_nb_conflicts_bitset(self.packed_adjacency, self.colors, self.max_colors)
 
 
     def update_tabu_list(self, move: tuple[int, int]) -> None:
@@ -91,6 +98,30 @@ class TabuSearchAlgorithm:
         
         return tab
 
+    def get_state(self) -> dict:
+        """
+        Returns the full search state of the algorithm, random generators included.
+        """
+        return {
+            'colors': self.colors,
+            'tabu_list': np.array(self.tabu_list, dtype=int).reshape(-1, 2),
+            'best_solution': self.best_solution,
+            'best_conflicts': self.best_conflicts,
+            'iteration': self.iteration,
+            'rng': get_global_rng_state(),
+        }
+
+    def set_state(self, state: dict) -> None:
+        """
+        Restores a state returned by `get_state`, so that `launch` resumes the search.
+        """
+        self.colors = state['colors'].copy()
+        self.tabu_list = [tuple(move) for move in state['tabu_list'].tolist()]
+        self.best_solution = state['best_solution'].copy()
+        self.best_conflicts = state['best_conflicts']
+        self.iteration = state['iteration']
+        set_global_rng_state(state['rng'])
+
     def launch(self) -> list[int]:
         """
         Launches the tabu search algorithm for graph coloring. The algorithm 
@@ -101,13 +132,15 @@ class TabuSearchAlgorithm:
             list[int]: The best coloring solution found, represented as a list where 
                         each element is the color assigned to the corresponding node.
         """
-        self.best_solution = self.colors.copy()
-        self.best_conflicts = self.get_fitness()
+        if self.iteration == 0:
+            self.best_solution = self.colors.copy()
+            self.best_conflicts = self.get_fitness()
 
-        iteration = 0
-        while iteration < self.max_iterations and self.best_conflicts > 0:
+        instrumentation = self.instrumentation
+        while self.iteration < self.max_iterations and self.best_conflicts > self.target_conflicts:
             # Construire la matrice Tabou pour l'itération en cours
-            tab = self.mat_tabou()
+            with instrumentation.phase("mat_tabou"):
+                tab = self.mat_tabou()
 
             # Trouver le nœud à changer en cherchant le minimum dans la matrice Tabou
             min_value = np.min(tab)
@@ -120,15 +153,24 @@ class TabuSearchAlgorithm:
             if (node_to_change, color_to_change) not in self.tabu_list:
                 self.colors[node_to_change] = color_to_change
                 self.update_tabu_list((node_to_change, color_to_change))
+                instrumentation.count("accepted_moves")
 
                 # Évaluer la solution actuelle
-                current_conflicts = self.get_fitness()
+                with instrumentation.phase("fitness"):
+                    current_conflicts = self.get_fitness()
+                instrumentation.count("evaluations")
 
                 # Si la solution actuelle est meilleure, mettre à jour la meilleure solution
                 if current_conflicts < self.best_conflicts:
                     self.best_solution = self.colors.copy()
                     self.best_conflicts = current_conflicts
+            else:
+                instrumentation.count("tabu_rejections")
+
+            instrumentation.trace(self.best_conflicts, self.best_solution)
+            self.iteration += 1
 
-            iteration += 1
+            if self.checkpointer is not None:
+                self.checkpointer.step(self)
 
-        return self.best_solution
\ No newline at end of file
+        return self.best_solution.tolist()
\ No newline at end of file
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+Sujet  :  Coloration de graphes appliquée à la France
+Sauvegarde et reprise de l'état de recherche des algorithmes
+"""
+
+# Import libs
+import hashlib
+import json
+import os
+import random
+import time
+import numpy as np
+
+def get_global_rng_state() -> dict:
+    """
+    Returns the state of the global random generators used by the algorithms
+    (`random` and `np.random`).
+    """
+    return {'random': random.getstate(), 'np_random': np.random.get_state()}
+
+def set_global_rng_state(state: dict) -> None:
+    """
+    Restores the state returned by `get_global_rng_state`.
+    """
+    random.setstate(state['random'])
+    np.random.set_state(state['np_random'])
+
+def rng_state_to_arrays(state: dict) -> tuple[dict[str, np.ndarray], dict]:
+    """
+    Splits a state returned by `get_global_rng_state` into the Mersenne Twister keys,
+    stored as arrays, and the remaining small fields, stored as JSON.
+
+    Returns:
+        tuple[dict[str, np.ndarray], dict]: The key arrays and the other fields.
+    """
+    version, internal_state, gauss_next = state['random']
+    name, key, pos, has_gauss, cached_gaussian = state['np_random']
+    arrays = {'random_key': np.array(internal_state, dtype=np.uint32), 'np_random_key': np.asarray(key, dtype=np.uint32)}
+    fields = {
+        'random': {'version': version, 'gauss_next': gauss_next},
+        'np_random': {'name': name, 'pos': int(pos), 'has_gauss': int(has_gauss), 'cached_gaussian': float(cached_gaussian)},
+    }
+    return arrays, fields
+
+def rng_state_from_arrays(arrays: dict[str, np.ndarray], fields: dict) -> dict:
+    """
+    Rebuilds the state split by `rng_state_to_arrays`.
+    """
+    np_fields = fields['np_random']
+    return {
+        'random': (fields['random']['version'], tuple(int(x) for x in arrays['random_key']), fields['random']['gauss_next']),
+        'np_random': (np_fields['name'], arrays['np_random_key'], np_fields['pos'], np_fields['has_gauss'], np_fields['cached_gaussian']),
+    }
+
+def is_rng_state(value) -> bool:
+    return isinstance(value, dict) and set(value) == {'random', 'np_random'}
+
+def to_json(value):
+    """
+    Converts the NumPy values left in the JSON part of a checkpoint.
+    """
+    if isinstance(value, (np.generic, np.ndarray)):
+        return value.tolist()
+    raise TypeError(f"Cannot save a value of type {type(value).__name__} in a checkpoint")
+
+def get_signature(*parts) -> str:
+    """
+    Hashes what describes a run, eg. the parameters of the algorithm and the names of the
+    nodes, so that a checkpoint is only resumed by the same run.
+
+    Returns:
+        str: The hexadecimal SHA-256 of the parts, which must be JSON serializable.
+    """
+    return hashlib.sha256(json.dumps(parts, default=to_json).encode('utf-8')).hexdigest()
+
+def save_checkpoint(path: str, state: dict, signature: str = "") -> None:
+    """
+    Saves the search state of an algorithm in a compressed binary file.
+
+    The arrays of the state are stored as compressed NumPy arrays and the numbers as
+    0-d arrays. The random generator states are split into their key arrays and a few
+    fields, which are stored as JSON with the other values (None, lists) and the
+    signature. Nothing is pickled, so loading a file cannot run code. The file is
+    written next to its destination and then renamed, so that an interrupted save
+    never corrupts the previous checkpoint.
+
+    Args:
+        path (str): The path of the checkpoint file.
+        state (dict): The state returned by the `get_state` method of an algorithm.
+        signature (str): Describes the run (parameters, graph), see `load_checkpoint`.
+
+    Returns:
+        None
+    """
+    arrays = {}
+    meta = {'signature': signature, 'values': {}, 'rng': {}}
+    for name, value in state.items():
+        if isinstance(value, np.ndarray):
+            arrays[name] = value
+        elif isinstance(value, (bool, int, float, np.number)):
+            arrays[name] = np.array(value)
+        elif is_rng_state(value):
+            rng_arrays, meta['rng'][name] = rng_state_to_arrays(value)
+            arrays.update({f"{name}__{key}": array for key, array in rng_arrays.items()})
+        else:
+            meta['values'][name] = value
+
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, mode='wb') as file:
+        np.savez_compressed(file, __meta__=np.frombuffer(json.dumps(meta, default=to_json).encode('utf-8'), dtype=np.uint8), **arrays)
+    os.replace(temporary_path, path)
+
+def load_checkpoint(path: str, signature: str = None) -> dict:
+    """
+    Loads a state saved by `save_checkpoint`.
+
+    Args:
+        path (str): The path of the checkpoint file.
+        signature (str): If given, the signature the checkpoint must have been saved with.
+
+    Raises:
+        ValueError: If the checkpoint was saved by a run with another signature, eg.
+                    other parameters, which `set_state` must not resume.
+
+    Returns:
+        dict: The state, to give to the `set_state` method of an algorithm.
+    """
+    with np.load(path, allow_pickle=False) as data:
+        meta = json.loads(data['__meta__'].tobytes().decode('utf-8'))
+        if signature is not None and meta['signature'] != signature:
+            raise ValueError(f"The checkpoint {path} was saved by another run")
+
+        rng_arrays = {f"{name}__{key}" for name in meta['rng'] for key in ('random_key', 'np_random_key')}
+        state = {}
+        for name in data.files:
+            if name == '__meta__' or name in rng_arrays:
+                continue
+            array = data[name]
+            state[name] = array.item() if array.ndim == 0 else array
+        for name, fields in meta['rng'].items():
+            arrays = {key: data[f"{name}__{key}"] for key in ('random_key', 'np_random_key')}
+            state[name] = rng_state_from_arrays(arrays, fields)
+        state.update(meta['values'])
+    return state
+
+
+class Checkpointer:
+    def __init__(self, path: str, every_iterations: int = None, every_seconds: float = None, signature: str = ""):
+        """
+        Saves the state of an algorithm periodically. The algorithms call `step` at the
+        end of each of their iterations.
+
+        Args:
+            path (str): The path of the checkpoint file.
+            every_iterations (int): Save every `every_iterations` iterations.
+            every_seconds (float): Save when `every_seconds` seconds have passed since the last save.
+            signature (str): Saved with the states, see `load_checkpoint`.
+        """
+        self.path: str = path
+        self.every_iterations: int = every_iterations
+        self.every_seconds: float = every_seconds
+        self.signature: str = signature
+        self.nb_steps: int = 0
+        self.last_save: float = time.monotonic()
+
+    def step(self, algorithm) -> None:
+        """
+        Saves the state of the algorithm if the interval has passed.
+
+        Args:
+            algorithm: An algorithm with a `get_state` method.
+
+        Returns:
+            None
+        """
+        self.nb_steps += 1
+        due = self.every_iterations is not None and self.nb_steps % self.every_iterations == 0
+        due |= self.every_seconds is not None and time.monotonic() - self.last_save >= self.every_seconds
+        if due:
+            save_checkpoint(self.path, algorithm.get_state(), self.signature)
+            self.last_save = time.monotonic()
@@ -9,37 +9,41 @@ Sujet  :  Coloration de graphes appliquée à la France
 from matplotlib import pyplot as plt
 import pandas as pd
 import streamlit as st
-from geo_environment import GeoEnv
+from geo_environment import COLORS_LIST, DEFAULT_EXCLUSIONS, GeoEnv, get_zone_names
+from geo_ingestion import get_parent_groups
 import time
+import tempfile
+import os
 
 # Import algorithms
 from app.SimulatedAnnealingAlgorithm import SimulatedAnnealingAlgorithm
+from app.ParallelTemperingAlgorithm import ParallelTemperingAlgorithm
 from app.GeneticAlgorithm import GeneticAlgorithm
+from app.IslandGeneticAlgorithm import IslandGeneticAlgorithm
 from app.PSOAlgorithm import PSOAlgorithm
 from app.TabuSearchAlgorithm import TabuSearchAlgorithm
 from app.AntColonyAlgorithm import AntColonyAlgorithm
-from utils import get_nb_conflicts, read_results_from_csv, save_results_to_csv
+from app.HybridEvolutionaryAlgorithm import HybridEvolutionaryAlgorithm
+from app.IncrementalRepairAlgorithm import IncrementalRepairAlgorithm
+from app.ParallelMinConflictsAlgorithm import ParallelMinConflictsAlgorithm
+from app.PartialColAlgorithm import PartialColAlgorithm
+from app.MultilevelAlgorithm import MultilevelAlgorithm
+from algorithm_selector import AlgorithmSelector, create_algorithm, get_graph_features, save_graph_features
+from animation_export import export_animation, render_frames
+from checkpoint import Checkpointer, get_signature, load_checkpoint
+from instrumentation import Instrumentation, profile_launch
+from results_statistics import aggregate_results, get_algorithm_parameters, get_results_version, time_to_target
+from utils import get_conflicts_lower_bound, get_graph_diff, get_max_clique, get_nb_conflicts, read_profiles_from_csv, read_results_from_csv, save_profile_to_csv, save_results_to_csv
 
 # Constants
-COLORS_LIST = [
-    "#FF0000",  # Red
-    "#0000FF",  # Blue
-    "#FFFF00",  # Yellow
-    "#00FF00",  # Green
-    "#FF00FF",  # Magenta
-    "#00FFFF",  # Cyan
-    "#800000",  # Brown
-    "#808000",  # Olive
-    "#008080",  # Turquoise
-    "#800080"   # Purple
-]
-
 NB_ITERATIONS = 500
 
 NB_COULEURS = 4
 
 DO_SAVE_RESULT = False
 
+CHECKPOINTS_DIR = "data/checkpoints"
+
 # Streamlit UI
 # Title
 st.markdown("""<h1 style='text-align: center; color: black;'>Coloration de Graphes : Régions Métropolitaines de France</h1><hr style='border: 2px solid blue;'>""", unsafe_allow_html=True)
@@ -47,12 +51,27 @@ st.markdown("""<h1 style='text-align: center; color: black;'>Coloration de Graph
 # Navigation bar
 add_sidebar = st.sidebar.selectbox('Choisir la page', ('Algorithmes', 'Résultats'))
 
+@st.cache_data
+def get_map_features(map_choice: str, excluded: tuple[str, ...] = None) -> dict[str, float]:
+    # Features of the graph of a map, computed once per map and excluded zones
+    return get_graph_features(GeoEnv(map_choice, excluded).adjacency_matrix()[0])
+
+@st.cache_data
+def get_clique_size(map_choice: str, excluded: tuple[str, ...] = None) -> int:
+    # Size of the largest clique found, computed once per map and excluded zones
+    return len(get_max_clique(GeoEnv(map_choice, excluded).adjacency_matrix()[0]))
+
+@st.cache_data
+def load_zone_names(map_choice: str) -> list[str]:
+    return get_zone_names(map_choice)
+
 # Algorithm page
 if add_sidebar == 'Algorithmes':
     elapsed_time = None
     nb_conflicts = None
     st.subheader('Test et démonstration des algorithmes')
     geojson_choice = st.selectbox('Choisir une carte', ('Régions', 'Départements'))
+    excluded = tuple(sorted(st.multiselect('Zones exclues', load_zone_names(geojson_choice), default=DEFAULT_EXCLUSIONS[geojson_choice])))
 
     # Reset colors
     solution_colors = None
@@ -61,23 +80,80 @@ if add_sidebar == 'Algorithmes':
     col1, col2 = st.columns(2)
 
     # Initialiser l'environnement et la figure sans couleur
-    geo_env = GeoEnv(geojson_choice)
+    geo_env = GeoEnv(geojson_choice, excluded)
     adjacency_matrix, region_names = geo_env.adjacency_matrix()
     nb_nodes = len(region_names)
 
+    # Borne inférieure : les sommets d'une clique ont tous des couleurs différentes
+    clique_size = get_clique_size(geojson_choice, excluded)
+    target_conflicts = get_conflicts_lower_bound(clique_size, NB_COULEURS)
+    if NB_COULEURS < clique_size:
+        col2.warning(
+            f"Cette carte contient une clique de {clique_size} sommets : il faut au moins {clique_size} couleurs. "
+            f"Avec {NB_COULEURS} couleurs, toute solution a au moins {target_conflicts} conflits."
+        )
+
+    # Quand les zones exclues changent, la dernière solution est réparée autour des changements
+    # au lieu d'être recalculée depuis une solution aléatoire
+    last_coloring = st.session_state.get('last_coloring')
+    if last_coloring is not None and last_coloring['map'] == geojson_choice and last_coloring['excluded'] != excluded:
+        repair = IncrementalRepairAlgorithm(
+            adjacency_matrix=last_coloring['adjacency_matrix'],
+            region_names=last_coloring['region_names'],
+            solution=last_coloring['solution'],
+            max_colors=NB_COULEURS,
+            max_iterations=NB_ITERATIONS * 10,
+            **get_graph_diff(last_coloring['adjacency_matrix'], last_coloring['region_names'], adjacency_matrix, region_names)
+        )
+        repair.target_conflicts = target_conflicts
+        start_time = time.time()
+        repaired = repair.launch()
+        repair_time = time.time() - start_time
+
+        # La réparation renvoie les sommets dans son propre ordre
+        positions = {name: i for i, name in enumerate(repair.region_names)}
+        solution = [repaired[positions[name]] for name in region_names]
+        solution_colors = [COLORS_LIST[color] for color in solution]
+        col2.info(
+            f"Solution précédente réparée en {repair_time * 1000:.1f} ms : "
+            f"{get_nb_conflicts(adjacency_matrix, solution, nb_nodes)} conflits"
+        )
+        st.session_state['last_coloring'] = {
+            'map': geojson_choice, 'excluded': excluded, 'adjacency_matrix': adjacency_matrix,
+            'region_names': region_names, 'solution': solution
+        }
+
     # Colonne 2 : Sélection de l'algorithme
-    algo_selected = col2.selectbox('Choisir un Algorithme', ('Recuit simulé', 'Algorithme génétique', 'ACO', 'Recherche tabou', 'PSO'))
+    algo_selected = col2.selectbox('Choisir un Algorithme', ('Recuit simulé', 'Algorithme génétique', 'ACO', 'Recherche tabou', 'PSO', 'Hybride évolutionnaire', 'Min-conflits parallèle', 'Coloration partielle (PartialCol)', 'Multiniveau', 'Auto'))
     
     expander = col2.expander("Plus de paramètres")
 
     if algo_selected == 'Recuit simulé':
-        temperature_initiale = expander.number_input("Température initiale", min_value=1, value=1000, step=1)
-        facteur = expander.number_input("Facteur de réduction", min_value=0.01, max_value=1.0, value=0.95, step=0.01)
+        annealing_mode = expander.selectbox("Mode", ('Chaîne unique', 'Multi-chaînes (échange de répliques)'))
+        if annealing_mode == 'Chaîne unique':
+            schedule = expander.selectbox("Refroidissement", ('Géométrique', 'Linéaire', 'Adaptatif'))
+            temperature_initiale = None
+            if not expander.checkbox("Température initiale automatique", value=True):
+                temperature_initiale = expander.number_input("Température initiale", min_value=0.01, value=2.0, step=0.1)
+            facteur = None
+            if schedule == 'Géométrique' and not expander.checkbox("Facteur de réduction automatique", value=True):
+                facteur = expander.number_input("Facteur de réduction par palier", min_value=0.01, max_value=1.0, value=0.95, step=0.01)
+            reheat_after = expander.number_input("Paliers figés avant réchauffe (0 : jamais)", min_value=0, value=10, step=1)
+        else:
+            nb_replicas = expander.number_input("Nombre de répliques", min_value=2, value=16, step=1)
+            min_temperature = expander.number_input("Température minimale", min_value=0.01, value=0.05, step=0.01)
+            max_temperature = expander.number_input("Température maximale", min_value=0.1, value=5.0, step=0.1)
+            swap_interval = expander.number_input("Itérations entre échanges", min_value=1, value=10, step=1)
 
     if algo_selected == 'Algorithme génétique':
         pop_size = expander.number_input("Taille de la population", min_value=1, value=50, step=1)
         mutation_rate = expander.number_input("Taux de mutation", min_value=0.1, max_value=1.0, value=0.5, step=0.1)
         crossover_rate = expander.number_input("Taux de croisement", min_value=0.1, max_value=1.0, value=0.8, step=0.1)
+        nb_islands = expander.number_input("Nombre d'îles (processus)", min_value=1, value=1, step=1)
+        if nb_islands > 1:
+            migration_interval = expander.number_input("Générations entre migrations", min_value=1, value=10, step=1)
+            nb_migrants = expander.number_input("Nombre de migrants", min_value=1, value=2, step=1)
+            topology = expander.selectbox("Topologie de migration", ('ring', 'random'))
 
     if algo_selected == 'ACO':
         evaporation_rate = expander.number_input("Taux d'évaporation", min_value=0.01, value=0.5, step=0.01, max_value=1.0)
@@ -94,19 +170,69 @@ if add_sidebar == 'Algorithmes':
         cognitive_weight = expander.number_input("Poids cognitif", min_value=0.1, value=1.5, step=0.1)
         social_weight = expander.number_input("Poids social", min_value=0.1, value=1.5, step=0.1)
 
+    if algo_selected == 'Hybride évolutionnaire':
+        hybrid_pop_size = expander.number_input("Taille de la population", min_value=2, value=10, step=1)
+        hybrid_tabu_iterations = expander.number_input("Itérations tabou par enfant", min_value=1, value=1000, step=100)
+        hybrid_tabu_tenure = expander.number_input("Longueur de la liste tabou", min_value=1, value=10, step=1)
+
+    if algo_selected == 'Min-conflits parallèle':
+        min_conflicts_tabu_tenure = expander.number_input("Durée tabou d'une couleur quittée", min_value=0, value=10, step=1)
+        min_conflicts_noise = expander.number_input("Probabilité de couleur aléatoire", min_value=0.0, max_value=1.0, value=0.05, step=0.01)
+
+    if algo_selected == 'Coloration partielle (PartialCol)':
+        partial_tabu_tenure = expander.number_input("Durée tabou aléatoire maximale", min_value=1, value=10, step=1)
+        partial_tabu_factor = expander.number_input("Durée tabou par sommet non coloré", min_value=0.0, value=0.6, step=0.1)
+
+    if algo_selected == 'Multiniveau':
+        multilevel_solver = expander.selectbox("Algorithme du graphe le plus grossier", ('Coloration partielle (PartialCol)', 'Recherche tabou', 'Min-conflits parallèle'))
+        multilevel_min_nodes = expander.number_input("Nombre de sommets du graphe le plus grossier", min_value=2, value=20, step=1)
+        multilevel_refine_iterations = expander.number_input("Itérations de raffinement", min_value=1, value=1000, step=100)
+        multilevel_by_region = geojson_choice == 'Départements' and expander.checkbox("Regrouper d'abord les départements par région", value=True)
+
+    if algo_selected == 'Auto':
+        # Choix à partir des résultats enregistrés sur la carte la plus proche
+        map_features = get_map_features(geojson_choice, excluded)
+        save_graph_features(geojson_choice, map_features)
+        auto_name, auto_parameters, auto_reason = AlgorithmSelector().select(map_features)
+        col2.info(f"Algorithme choisi : {auto_name}, {auto_reason}")
+
+    do_instrument = col2.checkbox("Mesurer les phases (instrumentation)")
+    do_profile = col2.checkbox("Profiler l'exécution (cProfile)")
+    do_animation = col2.checkbox("Animation de la convergence (GIF)")
+    do_checkpoint = col2.checkbox("Sauvegarde périodique (checkpoint)")
+    if do_checkpoint:
+        checkpoint_interval = col2.number_input("Secondes entre deux sauvegardes", min_value=1, value=30, step=1)
+        checkpoint_path = os.path.join(CHECKPOINTS_DIR, f"{algo_selected}_{geojson_choice}.npz")
+        do_resume = os.path.exists(checkpoint_path) and col2.checkbox("Reprendre depuis la dernière sauvegarde")
+    instrumentation = None
+    profile_report = None
 
     if col2.button("Lancer"):
-        if algo_selected == 'Recuit simulé':
+        if algo_selected == 'Recuit simulé' and annealing_mode == 'Chaîne unique':
             algorithm = SimulatedAnnealingAlgorithm(
                 nb_nodes=nb_nodes,
                 adjacency_matrix=adjacency_matrix,
                 max_colors=NB_COULEURS,
                 initial_temperature=temperature_initiale,
                 factor=facteur,
-                iterations=NB_ITERATIONS,
+                iterations=NB_ITERATIONS * 100,
+                schedule={'Géométrique': 'geometric', 'Linéaire': 'linear', 'Adaptatif': 'adaptive'}[schedule],
+                reheat_after=reheat_after,
+            )
+
+        if algo_selected == 'Recuit simulé' and annealing_mode != 'Chaîne unique':
+            algorithm = ParallelTemperingAlgorithm(
+                nb_nodes=nb_nodes,
+                adjacency_matrix=adjacency_matrix,
+                max_colors=NB_COULEURS,
+                iterations=NB_ITERATIONS * 10,
+                nb_replicas=nb_replicas,
+                min_temperature=min_temperature,
+                max_temperature=max_temperature,
+                swap_interval=swap_interval
             )
 
-        if algo_selected == 'Algorithme génétique':
+        if algo_selected == 'Algorithme génétique' and nb_islands == 1:
             algorithm = GeneticAlgorithm(
                 nb_nodes=nb_nodes,
                 adjacency_matrix=adjacency_matrix,
@@ -117,6 +243,21 @@ if add_sidebar == 'Algorithmes':
                 crossover_rate = crossover_rate
             )
 
+        if algo_selected == 'Algorithme génétique' and nb_islands > 1:
+            algorithm = IslandGeneticAlgorithm(
+                nb_nodes=nb_nodes,
+                adjacency_matrix=adjacency_matrix,
+                max_colors=NB_COULEURS,
+                pop_size=pop_size,
+                nb_generations=NB_ITERATIONS,
+                mutation_rate = mutation_rate,
+                crossover_rate = crossover_rate,
+                nb_islands=nb_islands,
+                nb_migrants=nb_migrants,
+                migration_interval=migration_interval,
+                topology=topology
+            )
+
         if algo_selected == 'ACO':
             algorithm = AntColonyAlgorithm(
                 adjacency_matrix=adjacency_matrix,
@@ -148,18 +289,98 @@ if add_sidebar == 'Algorithmes':
                 cognitive_weight=cognitive_weight,
                 social_weight=social_weight
             )
-        
+
+        if algo_selected == 'Hybride évolutionnaire':
+            algorithm = HybridEvolutionaryAlgorithm(
+                nb_nodes=nb_nodes,
+                adjacency_matrix=adjacency_matrix,
+                max_colors=NB_COULEURS,
+                pop_size=hybrid_pop_size,
+                nb_generations=NB_ITERATIONS,
+                tabu_iterations=hybrid_tabu_iterations,
+                tabu_tenure=hybrid_tabu_tenure
+            )
+
+        if algo_selected == 'Min-conflits parallèle':
+            algorithm = ParallelMinConflictsAlgorithm(
+                nb_nodes=nb_nodes,
+                adjacency_matrix=adjacency_matrix,
+                max_colors=NB_COULEURS,
+                max_iterations=NB_ITERATIONS * 10,
+                tabu_tenure=min_conflicts_tabu_tenure,
+                noise=min_conflicts_noise
+            )
+
+        if algo_selected == 'Coloration partielle (PartialCol)':
+            algorithm = PartialColAlgorithm(
+                nb_nodes=nb_nodes,
+                adjacency_matrix=adjacency_matrix,
+                max_colors=NB_COULEURS,
+                max_iterations=NB_ITERATIONS * 10,
+                tabu_tenure=partial_tabu_tenure,
+                tabu_factor=partial_tabu_factor
+            )
+
+        if algo_selected == 'Multiniveau':
+            coarsest_solvers = {
+                'Coloration partielle (PartialCol)': (PartialColAlgorithm, {'max_iterations': NB_ITERATIONS * 10}),
+                'Recherche tabou': (TabuSearchAlgorithm, {'max_iterations': NB_ITERATIONS, 'tabu_tenure': 5}),
+                'Min-conflits parallèle': (ParallelMinConflictsAlgorithm, {'max_iterations': NB_ITERATIONS * 10}),
+            }
+            coarsest_class, coarsest_parameters = coarsest_solvers[multilevel_solver]
+            algorithm = MultilevelAlgorithm(
+                nb_nodes=nb_nodes,
+                adjacency_matrix=adjacency_matrix,
+                max_colors=NB_COULEURS,
+                algorithm_class=coarsest_class,
+                parameters=coarsest_parameters,
+                parent_groups=get_parent_groups(geo_env.gdf.geometry, GeoEnv('Régions').gdf.geometry) if multilevel_by_region else None,
+                min_nodes=multilevel_min_nodes,
+                refine_iterations=multilevel_refine_iterations
+            )
+
+        if algo_selected == 'Auto':
+            algorithm = create_algorithm(auto_name, auto_parameters, adjacency_matrix, NB_COULEURS)
+
+        # Arrêt dès que la borne inférieure est atteinte
+        algorithm.target_conflicts = target_conflicts
+
+        if do_checkpoint and hasattr(algorithm, 'get_state'):
+            os.makedirs(CHECKPOINTS_DIR, exist_ok=True)
+            # La sauvegarde n'est reprise que par une exécution avec les mêmes paramètres et zones
+            checkpoint_signature = get_signature(algo_selected, get_algorithm_parameters(algorithm), region_names, NB_COULEURS)
+            if do_resume:
+                try:
+                    algorithm.set_state(load_checkpoint(checkpoint_path, checkpoint_signature))
+                except ValueError:
+                    st.warning("La sauvegarde a été faite avec d'autres paramètres, l'exécution repart de zéro.")
+            algorithm.checkpointer = Checkpointer(checkpoint_path, every_seconds=checkpoint_interval, signature=checkpoint_signature)
+
+        if do_instrument or do_animation:
+            instrumentation = Instrumentation(record_solutions=do_animation)
+            algorithm.instrumentation = instrumentation
 
         # Démarrer le chronomètre
         start_time = time.time()
         
-        solution = algorithm.launch()
+        if do_profile:
+            solution, profile_report = profile_launch(algorithm)
+        else:
+            solution = algorithm.launch()
+
+        # L'exécution est terminée, sa sauvegarde ne doit plus être reprise
+        if do_checkpoint and os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
 
         # Calculer le temps écoulé
         elapsed_time = time.time() - start_time
 
         solution_colors = [COLORS_LIST[color] for color in solution]
         nb_conflicts = get_nb_conflicts(adjacency_matrix, solution, nb_nodes)
+        st.session_state['last_coloring'] = {
+            'map': geojson_choice, 'excluded': excluded, 'adjacency_matrix': adjacency_matrix,
+            'region_names': region_names, 'solution': solution
+        }
 
     # Mettre à jour la figure colorée dans le placeholder
     fig = geo_env.show_graph(colors=solution_colors, title=geojson_choice)
@@ -175,43 +396,121 @@ if add_sidebar == 'Algorithmes':
         # Column for number of conflicts
         col4.markdown(f"**Nombre de conflits**: {nb_conflicts}")
 
-        save_results_to_csv(algo_selected, geojson_choice, elapsed_time, nb_conflicts)
+        save_results_to_csv(
+            auto_name if algo_selected == 'Auto' else algo_selected,
+            geojson_choice,
+            elapsed_time,
+            nb_conflicts,
+            get_algorithm_parameters(algorithm)
+        )
+        save_graph_features(geojson_choice, get_map_features(geojson_choice, excluded))
+        if instrumentation is not None:
+            save_profile_to_csv(algo_selected, geojson_choice, instrumentation.to_rows())
+
+    if instrumentation is not None:
+        st.subheader("Instrumentation")
+        col5, col6 = st.columns(2)
+        col5.dataframe(pd.DataFrame(instrumentation.to_rows(), columns=['Type', 'Nom', 'Valeur']))
+        if instrumentation.convergence:
+            col6.line_chart(pd.DataFrame({'Meilleur nombre de conflits': instrumentation.convergence}))
+
+    if instrumentation is not None and instrumentation.solutions:
+        st.subheader("Animation de la convergence")
+        # Les images sont supprimées avec le dossier, l'animation est affichée depuis ses octets
+        with tempfile.TemporaryDirectory() as frames_dir:
+            frame_paths = render_frames(
+                geo_env.gdf.geometry,
+                instrumentation.solutions,
+                frames_dir,
+                title=geojson_choice,
+                labels=[f"{conflicts} conflits" for conflicts in instrumentation.solutions_conflicts],
+                colors_list=COLORS_LIST
+            )
+            gif_path = os.path.join(frames_dir, "convergence.gif")
+            export_animation(frame_paths, gif_path, fps=4)
+            with open(gif_path, 'rb') as gif:
+                st.image(gif.read())
+
+    if profile_report is not None:
+        st.subheader("Profil cProfile")
+        st.text(profile_report)
+        st.download_button("Télécharger le profil", profile_report, file_name="profile.txt")
         
 # Page Résultats
+@st.cache_data
+def load_results_statistics(version: tuple[float, int]) -> tuple[pd.DataFrame, pd.DataFrame]:
+    # The version of the results file is the cache key: the statistics are only
+    # recomputed when new results have been saved
+    results = read_results_from_csv()
+    return aggregate_results(results), time_to_target(results)
+
+@st.cache_data
+def load_profiles_statistics(version: tuple[float, int]) -> pd.DataFrame:
+    profiles = read_profiles_from_csv()
+    if profiles.empty:
+        return profiles
+    return profiles.groupby(['Map', 'Algorithm', 'Kind', 'Name'])['Value'].mean().unstack('Name')
+
 if add_sidebar == 'Résultats':
     st.subheader('Résultats des Algorithmes')
 
-    # Charger les résultats depuis le CSV
-    results: pd.DataFrame = read_results_from_csv()
+    # Statistiques par (map, algorithme, paramètres), recalculées seulement si le CSV change
+    summary, curves = load_results_statistics(get_results_version())
 
-    if results.empty:
+    if summary.empty:
         st.write("Aucun résultat disponible.")
-    else:       
-        # Séparer les résultats en fonction de la "Map"
-        maps = results['Map'].unique()
-        
-        for map_name in maps:
+    else:
+        for map_name, map_summary in summary.groupby('Map', sort=False):
             st.subheader(f"Résultats pour la Map: {map_name}")
-            
-            # Filtrer les résultats pour cette map
-            filtered_results = results[results['Map'] == map_name]
-            
-            # Créer les graphiques pour chaque map
-            fig, ax = plt.subplots(1, 2, figsize=(14, 6))
-
-            # Graphique du temps de calcul
-            ax[0].bar(filtered_results['Algorithm'], filtered_results['Computation Time (s)'])
-            ax[0].set_title(f"Temps de Calcul par Algorithme ({map_name})")
-            ax[0].set_ylabel("Temps (secondes)")
-            ax[0].set_xticklabels(filtered_results['Algorithm'].unique(), rotation=45)
 
-            # Graphique du nombre de conflits
-            ax[1].bar(filtered_results['Algorithm'], filtered_results['Number of Conflicts'])
-            ax[1].set_title(f"Nombre de Conflits par Algorithme ({map_name})")
-            ax[1].set_ylabel("Nombre de Conflits")
-            ax[1].set_xticklabels(filtered_results['Algorithm'].unique(), rotation=45)
+            # Un libellé par configuration, numéroté quand un algorithme a plusieurs paramétrages
+            labels = map_summary['Algorithm'].where(
+                ~map_summary['Algorithm'].duplicated(keep=False),
+                map_summary['Algorithm'] + " #" + (map_summary.groupby('Algorithm').cumcount() + 1).astype(str)
+            ).tolist()
+            positions = range(len(labels))
+
+            fig, ax = plt.subplots(1, 3, figsize=(18, 6))
+
+            # Temps médian, barres d'erreur entre les quartiles
+            ax[0].bar(positions, map_summary['Time median'], yerr=[
+                map_summary['Time median'] - map_summary['Time p25'],
+                map_summary['Time p75'] - map_summary['Time median']
+            ], capsize=4)
+            ax[0].set_title(f"Temps de Calcul médian ({map_name})")
+            ax[0].set_ylabel("Temps (secondes)")
 
+            # Taux de succès (0 conflit)
+            ax[1].bar(positions, map_summary['Success rate'] * 100)
+            ax[1].set_title(f"Taux de succès ({map_name})")
+            ax[1].set_ylabel("Exécutions sans conflit (%)")
+            ax[1].set_ylim(0, 100)
+
+            for axis in ax[:2]:
+                axis.set_xticks(positions)
+                axis.set_xticklabels(labels, rotation=45, ha='right')
+
+            # Courbes temps-cible : probabilité d'atteindre 0 conflit en un temps donné
+            map_curves = curves[curves['Map'] == map_name]
+            for label, (_, row) in zip(labels, map_summary.iterrows()):
+                curve = map_curves[(map_curves['Algorithm'] == row['Algorithm']) & (map_curves['Parameters'] == row['Parameters'])]
+                ax[2].step(curve['Time (s)'], curve['Probability'], where='post', label=label)
+            ax[2].set_xscale('log')
+            ax[2].set_title(f"Temps pour atteindre 0 conflit ({map_name})")
+            ax[2].set_xlabel("Temps (secondes)")
+            ax[2].set_ylabel("Probabilité")
+            ax[2].set_ylim(0, 1.05)
+            ax[2].legend()
+
+            fig.tight_layout()
             st.pyplot(fig)
+            plt.close(fig)
+
+            # Tableau récapitulatif pour cette map
+            st.dataframe(map_summary.assign(Configuration=labels).set_index('Configuration').drop(columns='Map'))
 
-        # Afficher les résultats sous forme de tableau pour cette map
-        st.dataframe(filtered_results)
+    # Temps moyen par phase des exécutions instrumentées
+    profiles: pd.DataFrame = load_profiles_statistics(get_results_version('data/profiles.csv'))
+    if not profiles.empty:
+        st.subheader("Profil des algorithmes instrumentés")
+        st.dataframe(profiles)
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+Sujet  :  Coloration de graphes appliquée à la France
+Schémas de refroidissement du recuit simulé
+"""
+
+# Import libs
+import math
+import numpy as np
+
+# Probability of accepting an average worsening move at the initial temperature (as in
+# Johnson et al. for graph coloring), and a move adding one conflict at the final temperature.
+# The search is almost a descent at the end, with moves keeping the number of conflicts.
+INITIAL_ACCEPTANCE = 0.4
+FINAL_ACCEPTANCE = 1e-8
+
+def estimate_initial_temperature(deltas: np.ndarray, acceptance: float = INITIAL_ACCEPTANCE) -> float:
+    """
+    Estimates the initial temperature from the cost changes of random moves, so that
+    a worsening move of average size is accepted with probability `acceptance`.
+
+    Args:
+        deltas (np.ndarray): The change of the number of conflicts of sampled moves.
+        acceptance (float): The initial acceptance probability of worsening moves.
+
+    Returns:
+        float: The initial temperature.
+    """
+    worsening = deltas[deltas > 0]
+    if len(worsening) == 0:
+        return get_final_temperature()
+    return float(worsening.mean() / -math.log(acceptance))
+
+def get_final_temperature(acceptance: float = FINAL_ACCEPTANCE) -> float:
+    """
+    Returns the temperature at which a move adding one conflict is accepted with
+    probability `acceptance`, below which the search is a plain descent.
+    """
+    return 1 / -math.log(acceptance)
+
+
+class CoolingSchedule:
+    """
+    Base class of the schedules. The temperature is lowered once per level, after a
+    fixed number of moves at the same temperature, and should reach the final temperature
+    at the end of the search.
+    """
+    def __init__(self, final_temperature: float = None):
+        self.final_temperature: float = final_temperature or get_final_temperature()
+
+    def next_temperature(self, temperature: float, remaining_levels: int, cost_std: float) -> float:
+        """
+        Returns the temperature of the next level.
+
+        Args:
+            temperature (float): The temperature of the level which ends.
+            remaining_levels (int): The number of levels left in the search.
+            cost_std (float): The standard deviation of the number of conflicts during the level.
+
+        Returns:
+            float: The next temperature.
+        """
+        raise NotImplementedError
+
+    def get_required_factor(self, temperature: float, remaining_levels: int) -> float:
+        """
+        Returns the constant factor leading from `temperature` to the final temperature
+        in `remaining_levels` levels.
+        """
+        if temperature <= self.final_temperature:
+            return 1.0
+        return (self.final_temperature / temperature) ** (1 / max(remaining_levels, 1))
+
+
+class GeometricSchedule(CoolingSchedule):
+    def __init__(self, factor: float = None, final_temperature: float = None):
+        """
+        Multiplies the temperature by `factor` at each level. When `factor` is None, it is
+        chosen so that the final temperature is reached at the last level.
+        """
+        super().__init__(final_temperature)
+        self.factor: float = factor
+
+    def next_temperature(self, temperature: float, remaining_levels: int, cost_std: float) -> float:
+        if self.factor is not None:
+            return temperature * self.factor
+        return temperature * self.get_required_factor(temperature, remaining_levels)
+
+
+class LinearSchedule(CoolingSchedule):
+    """
+    Lowers the temperature by the same amount at each level, from the current to the
+    final temperature.
+    """
+    def next_temperature(self, temperature: float, remaining_levels: int, cost_std: float) -> float:
+        step = (temperature - self.final_temperature) / max(remaining_levels, 1)
+        return max(temperature - step, self.final_temperature)
+
+
+class AdaptiveSchedule(CoolingSchedule):
+    def __init__(self, distance: float = 0.1, final_temperature: float = None):
+        """
+        Cools slowly when the number of conflicts varies a lot at the current temperature,
+        where the structure of the solutions is decided, and fast otherwise (Aarts and
+        van Laarhoven): T' = T / (1 + T * ln(1 + distance) / (3 * cost std)).
+
+        The levels saved by cooling fast are given to the next ones, but the temperature
+        never decreases more slowly than needed to reach the final temperature in the
+        remaining levels.
+
+        Args:
+            distance (float): How far the equilibrium distributions of two successive
+                              levels may be, smaller values cool more slowly.
+        """
+        super().__init__(final_temperature)
+        self.distance: float = distance
+
+    def next_temperature(self, temperature: float, remaining_levels: int, cost_std: float) -> float:
+        required = temperature * self.get_required_factor(temperature, remaining_levels)
+        if cost_std == 0:
+            return required
+        return min(temperature / (1 + temperature * math.log(1 + self.distance) / (3 * cost_std)), required)
+
+
+SCHEDULES = {
+    'geometric': GeometricSchedule,
+    'linear': LinearSchedule,
+    'adaptive': AdaptiveSchedule,
+}
@@ -10,10 +10,25 @@ import streamlit as st
 import geopandas as gpd
 import numpy as np
 import matplotlib.pyplot as plt
+from geo_ingestion import StreamedGeoGraph
+from utils import get_adjacency_matrix
 
 # Constants
 BORDER_COLOR = "#FFFFFF"
 NO_COLOR = "#808080"
+COLORS_LIST = [
+    "#FF0000",  # Red
+    "#0000FF",  # Blue
+    "#FFFF00",  # Yellow
+    "#00FF00",  # Green
+    "#FF00FF",  # Magenta
+    "#00FFFF",  # Cyan
+    "#800000",  # Brown
+    "#808000",  # Olive
+    "#008080",  # Turquoise
+    "#800080"   # Purple
+]
+SIMPLIFY_TOLERANCE = 0.001  # En degrés, les géométries ne servent plus qu'à l'affichage
 
 METROPOLITAN_REGIONS = [
     "Auvergne-Rhône-Alpes", "Bourgogne-Franche-Comté", "Bretagne", "Centre-Val de Loire", "Grand Est", "Hauts-de-France", "Île-de-France", "Normandie",
@@ -21,6 +36,18 @@ METROPOLITAN_REGIONS = [
 ]
 DEPARTEMENTS_INTERDITES = ["Corse-du-Sud", "Haute-Corse"]
 
+GEOJSON_PATHS = {"Régions": "data/regions.geojson", "Départements": "data/departements.geojson"}
+# Zones exclues par défaut de chaque carte
+DEFAULT_EXCLUSIONS = {"Régions": [], "Départements": DEPARTEMENTS_INTERDITES}
+
+def get_zone_names(choice: str) -> list[str]:
+    """
+    Returns the names of all the zones of a map which can be excluded, without reading the geometries.
+    """
+    if choice == "Régions":
+        return METROPOLITAN_REGIONS
+    return gpd.read_file(GEOJSON_PATHS[choice], columns=['nom'], ignore_geometry=True)['nom'].tolist()
+
 # Definition of the class
 class Region:
     def __init__(self, name="", color=NO_COLOR, neighbors=[]):
@@ -33,55 +60,36 @@ class Region:
 
 @st.cache_resource
 class GeoEnv:
-    def __init__(self, choice):
-        if choice == "Départements":
-            geojson_path = "data/departements.geojson"
+    def __init__(self, choice, excluded=None):
+        # Les zones exclues (tuple de noms) font partie de la clé du cache, par défaut celles de DEFAULT_EXCLUSIONS
+        if choice in DEFAULT_EXCLUSIONS and excluded is None:
+            excluded = DEFAULT_EXCLUSIONS[choice]
 
-            self.gdf = gpd.read_file(geojson_path)
-
-            self.gdf = self.gdf[~self.gdf['nom'].isin(DEPARTEMENTS_INTERDITES)]  # Exclure les departements interdits
+        if choice == "Départements":
+            # Exclure les departements interdits
+            graph = StreamedGeoGraph(GEOJSON_PATHS[choice], exclude=excluded, simplify_tolerance=SIMPLIFY_TOLERANCE)
         elif choice == "Régions":
-            geojson_path = "data/regions.geojson"
-
-            self.gdf = gpd.read_file(geojson_path)
-
-            # Filtrage des régions et gestion des erreurs si le GeoDataFrame est vide
-            self.gdf = self.gdf[self.gdf['nom'].isin(METROPOLITAN_REGIONS)]
-        
+            # Seulement les régions métropolitaines
+            graph = StreamedGeoGraph(GEOJSON_PATHS[choice], include=METROPOLITAN_REGIONS, exclude=excluded, simplify_tolerance=SIMPLIFY_TOLERANCE)
         else:
+            return  # Arrêter l'exécution si la carte est inconnue
+
+        if not graph.names:
+            self.gdf = gpd.GeoDataFrame()
             return  # Arrêter l'exécution si le GeoDataFrame est vide
-                
-        
-        # Vérification si le GeoDataFrame est vide
-        if self.gdf.empty:
-            print(f"Le fichier GeoJSON {geojson_path} est vide ou invalide.")
-            return  # Arrêter l'exécution si le GeoDataFrame est vide
-                
-        
-        # Vérification de la projection et transformation si nécessaire
-        if self.gdf.crs is None or self.gdf.crs.to_string() != "EPSG:4326":
-            print("Projection avant:", self.gdf.crs)
-            self.gdf = self.gdf.to_crs(epsg=4326)  # Projection en latitude/longitude (EPSG:4326)
-            print("Projection après:", self.gdf.crs)
+
+        # Seuls les noms, les listes d'adjacence et les géométries simplifiées restent en mémoire
+        self.gdf = gpd.GeoDataFrame({'nom': graph.names}, geometry=graph.geometries, crs="EPSG:4326")
+        (self.indptr, self.indices), self.region_names = graph.adjacency_lists()
 
         # Construction du graphe des voisins
         self.france_graph = {}
-        for _, region in self.gdf.iterrows():
-            region_name = region['nom']  # Nom de la région ou du département
-            neighbors = self.gdf[self.gdf.geometry.touches(region.geometry)]['nom'].tolist()
+        for i, region_name in enumerate(self.region_names):
+            neighbors = [self.region_names[j] for j in self.indices[self.indptr[i]:self.indptr[i + 1]]]
             self.france_graph[region_name] = Region(region_name, NO_COLOR, neighbors)
 
     def adjacency_matrix(self) -> tuple[np.ndarray, list[str]]:
-        region_names = list(self.france_graph.keys())
-        size = len(region_names)
-        adj_matrix = np.zeros((size, size), dtype=int)
-        for i, region in enumerate(region_names):
-            for neighbor in self.france_graph[region].neighbors:
-                if neighbor in region_names:
-                    j = region_names.index(neighbor)
-                    adj_matrix[i, j] = 1
-                    adj_matrix[j, i] = 1
-        return adj_matrix, region_names
+        return get_adjacency_matrix(self.indptr, self.indices), list(self.region_names)
     
     def show_graph(self, colors=None, title="Map"):
         if self.gdf.empty:
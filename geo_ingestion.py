@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""
+Sujet  :  Coloration de graphes appliquée à la France
+Lecture par morceaux de cartes GeoJSON volumineuses (communes)
+"""
+
+# Import libs
+import heapq
+import tempfile
+from collections import defaultdict
+import geopandas as gpd
+import numpy as np
+import pyogrio
+import shapely
+
+# Constants
+CHUNK_SIZE = 2000
+
+def read_chunks(geojson_path: str, chunk_size: int):
+    """
+    Streams the features of a GeoJSON file by chunks of `chunk_size` rows, with a single
+    sequential reader over the file.
+
+    Args:
+        geojson_path (str): The path of the GeoJSON file.
+        chunk_size (int): The number of features per chunk.
+
+    Yields:
+        tuple[list[str], np.ndarray]: The names and the geometries of the successive
+                                      chunks, projected in EPSG:4326.
+    """
+    with pyogrio.open_arrow(geojson_path, columns=['nom'], batch_size=chunk_size, use_pyarrow=True) as (meta, reader):
+        geometry_name = meta['geometry_name'] or 'wkb_geometry'
+        for batch in reader:
+            geometries = shapely.from_wkb(batch[geometry_name].to_numpy(zero_copy_only=False))
+            if meta['crs'] is not None and meta['crs'] != "EPSG:4326":
+                geometries = gpd.GeoSeries(geometries, crs=meta['crs']).to_crs(epsg=4326).to_numpy()
+            yield batch['nom'].to_pylist(), geometries
+
+def get_parent_groups(geometries: gpd.GeoSeries, parent_geometries: gpd.GeoSeries) -> np.ndarray:
+    """
+    Finds the parent of each geometry, eg. the région of each département, as the parent
+    containing a point of its interior. The files do not store this hierarchy.
+
+    Args:
+        geometries (gpd.GeoSeries): The geometries of the children.
+        parent_geometries (gpd.GeoSeries): The geometries of the parents, in the same projection.
+
+    Returns:
+        np.ndarray: The index of the parent of each child, in the order of `parent_geometries`.
+                    A child outside of every parent gets its own group, numbered after the parents.
+    """
+    points = gpd.GeoDataFrame(geometry=geometries.representative_point().reset_index(drop=True), crs=geometries.crs)
+    parents = gpd.GeoDataFrame(geometry=parent_geometries.reset_index(drop=True), crs=parent_geometries.crs)
+    joined = gpd.sjoin(points, parents, how="left", predicate="within")
+    joined = joined[~joined.index.duplicated()]
+
+    groups = joined["index_right"].to_numpy(dtype=float)
+    orphans = np.isnan(groups)
+    groups[orphans] = len(parents) + np.arange(orphans.sum())
+    return groups.astype(int)
+
+
+class StreamedGeoGraph:
+    def __init__(
+            self,
+            geojson_path: str,
+            include: list[str] = None,
+            exclude: list[str] = (),
+            chunk_size: int = CHUNK_SIZE,
+            cell_size: float = None,
+            simplify_tolerance: float = None
+        ):
+        """
+        Builds the adjacency graph of a GeoJSON file without keeping the whole
+        GeoDataFrame in memory.
+
+        The file is read once by chunks. Only the names and the bounding boxes of the
+        features stay in memory, the exact geometries are spilled as WKB to a temporary
+        file. The bounding boxes are indexed in a regular grid to find the candidate
+        pairs, which are then tested with `touches`, like `GeoEnv` did, reading the
+        spilled geometries back in order and keeping one in memory only until all its
+        candidates have been tested. The graph is kept as adjacency lists in CSR form.
+
+        Args:
+            geojson_path (str): The path of the GeoJSON file.
+            include (list[str]): If given, only the features with these names are kept.
+            exclude (list[str]): The names of the features to ignore.
+            chunk_size (int): The number of features read at once.
+            cell_size (float): The size of the cells of the grid, in degrees. Defaults
+                               to twice the median size of the bounding boxes.
+            simplify_tolerance (float): If given, a geometry simplified with this
+                                        tolerance is kept for each feature, for display.
+        """
+        self.geojson_path: str = geojson_path
+        self.include: set[str] = set(include) if include is not None else None
+        self.exclude: set[str] = set(exclude)
+        self.chunk_size: int = chunk_size
+
+        self.names: list[str] = []
+        self.indptr: np.ndarray = np.zeros(1, dtype=np.int64)
+        self.indices: np.ndarray = np.empty(0, dtype=np.int64)
+        self.geometries: gpd.GeoSeries = None
+
+        with tempfile.TemporaryFile() as spill:
+            bounds, offsets = self.read_features(spill, simplify_tolerance)
+            if not self.names:
+                print(f"Le fichier GeoJSON {geojson_path} est vide ou invalide.")
+                return
+
+            last_candidate, candidates = self.get_candidates(bounds, cell_size)
+            self.build_adjacency(spill, offsets, last_candidate, candidates)
+
+    def is_kept(self, name: str) -> bool:
+        return name not in self.exclude and (self.include is None or name in self.include)
+
+    def read_features(self, spill, simplify_tolerance: float) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Reads the file: keeps the name and the bounding box of every kept feature, and
+        writes its geometry as WKB in `spill`.
+
+        Args:
+            spill: A binary file receiving the geometries.
+            simplify_tolerance (float): See `__init__`.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: A (nb_features x 4) array of bounding boxes
+                                           (minx, miny, maxx, maxy) and the (nb_features + 1)
+                                           offsets of the geometries in `spill`.
+        """
+        bounds = []
+        offsets = [0]
+        simplified = []
+        for names, geometries in read_chunks(self.geojson_path, self.chunk_size):
+            kept = np.array([self.is_kept(name) for name in names], dtype=bool)
+            if not kept.any():
+                continue
+            geometries = geometries[kept]
+            self.names.extend(name for name, keep in zip(names, kept) if keep)
+            bounds.append(shapely.bounds(geometries))
+            for wkb in shapely.to_wkb(geometries):
+                spill.write(wkb)
+                offsets.append(offsets[-1] + len(wkb))
+            if simplify_tolerance is not None:
+                simplified.extend(shapely.simplify(geometries, simplify_tolerance))
+
+        if simplify_tolerance is not None:
+            self.geometries = gpd.GeoSeries(simplified, crs="EPSG:4326")
+        return (np.vstack(bounds) if bounds else np.empty((0, 4))), np.array(offsets)
+
+    def get_candidates(self, bounds: np.ndarray, cell_size: float) -> tuple[np.ndarray, list[list[int]]]:
+        """
+        Finds the pairs of features whose bounding boxes intersect with a grid index.
+
+        Args:
+            bounds (np.ndarray): The bounding boxes of the features.
+            cell_size (float): The size of the cells of the grid.
+
+        Returns:
+            tuple[np.ndarray, list[list[int]]]: For each feature, the largest index of its
+                                                candidates and the list of its candidates
+                                                with a smaller index.
+        """
+        if cell_size is None:
+            sizes = np.maximum(bounds[:, 2] - bounds[:, 0], bounds[:, 3] - bounds[:, 1])
+            cell_size = max(2 * float(np.median(sizes)), 1e-9)
+
+        cells = np.floor(bounds / cell_size).astype(np.int64)
+        grid = defaultdict(list)
+        for feature, (min_x, min_y, max_x, max_y) in enumerate(cells):
+            for x in range(min_x, max_x + 1):
+                for y in range(min_y, max_y + 1):
+                    grid[(x, y)].append(feature)
+
+        nb_features = len(bounds)
+        last_candidate = np.arange(nb_features)
+        candidates = [set() for _ in range(nb_features)]
+        for features in grid.values():
+            for a in range(len(features)):
+                i = features[a]
+                for b in range(a + 1, len(features)):
+                    j = features[b]  # j > i, the features are added in increasing order
+                    if (bounds[i, 0] <= bounds[j, 2] and bounds[j, 0] <= bounds[i, 2]
+                            and bounds[i, 1] <= bounds[j, 3] and bounds[j, 1] <= bounds[i, 3]):
+                        candidates[j].add(i)
+                        last_candidate[i] = max(last_candidate[i], j)
+        return last_candidate, [sorted(c) for c in candidates]
+
+    def build_adjacency(
+            self,
+            spill,
+            offsets: np.ndarray,
+            last_candidate: np.ndarray,
+            candidates: list[list[int]]
+        ) -> None:
+        """
+        Tests the candidate pairs on the exact geometries read back from `spill`. A
+        geometry is evicted as soon as every feature that may touch it has been tested.
+
+        Args:
+            spill: The binary file written by `read_features`.
+            offsets (np.ndarray): The offsets of the geometries in `spill`.
+            last_candidate (np.ndarray): The largest index of the candidates of each feature.
+            candidates (list[list[int]]): The candidates of each feature with a smaller index.
+
+        Returns:
+            None
+        """
+        rows, columns = [], []
+        resident = {}       # Geometries still needed by a feature not tested yet
+        evictions = []      # Heap of (last candidate, feature)
+
+        spill.seek(0)
+        for feature in range(len(self.names)):
+            geometry = shapely.from_wkb(spill.read(int(offsets[feature + 1] - offsets[feature])))
+            for other in candidates[feature]:
+                if geometry.touches(resident[other]):
+                    rows.extend((feature, other))
+                    columns.extend((other, feature))
+
+            if last_candidate[feature] > feature:
+                resident[feature] = geometry
+                heapq.heappush(evictions, (last_candidate[feature], feature))
+            while evictions and evictions[0][0] <= feature:
+                del resident[heapq.heappop(evictions)[1]]
+
+        order = np.lexsort((columns, rows))
+        rows = np.array(rows, dtype=np.int64)[order]
+        self.indices = np.array(columns, dtype=np.int64)[order]
+        self.indptr = np.searchsorted(rows, np.arange(len(self.names) + 1))
+
+    def adjacency_lists(self) -> tuple[tuple[np.ndarray, np.ndarray], list[str]]:
+        """
+        Returns the graph as adjacency lists in CSR form (see `utils.get_adjacency_lists`).
+
+        Returns:
+            tuple[tuple[np.ndarray, np.ndarray], list[str]]: The offsets and the neighbours,
+                                                             and the names of the nodes.
+        """
+        return (self.indptr, self.indices), self.names
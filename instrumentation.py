@@ -0,0 +1,120 @@
+import cProfile
+import io
+import pstats
+import time
+from contextlib import nullcontext
+
+# Shared no-op context manager returned by disabled instrumentations
+NO_PHASE = nullcontext()
+
+class Phase:
+    """
+    Context manager adding the time spent in its block to a timer of an instrumentation.
+    """
+    __slots__ = ("instrumentation", "name", "start")
+
+    def __init__(self, instrumentation: "Instrumentation", name: str):
+        self.instrumentation = instrumentation
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc) -> None:
+        timers = self.instrumentation.timers
+        timers[self.name] = timers.get(self.name, 0.0) + time.perf_counter() - self.start
+
+
+class Instrumentation:
+    def __init__(self, enabled: bool = True, record_solutions: bool = False):
+        self.enabled: bool = enabled
+        self.record_solutions: bool = record_solutions
+        self.timers: dict[str, float] = {}      # Total time spent in each phase, in seconds
+        self.counters: dict[str, int] = {}      # Evaluations, accepted moves, restarts...
+        self.convergence: list[int] = []        # Best number of conflicts at each iteration
+        self.solutions: list[list[int]] = []    # Best solution each time it improves
+        self.solutions_conflicts: list[int] = []
+
+    def phase(self, name: str):
+        """
+        Times a phase of an algorithm, to be used as `with instrumentation.phase("fitness"):`.
+
+        Args:
+            name (str): The name of the phase.
+
+        Returns:
+            A context manager, which does nothing when the instrumentation is disabled.
+        """
+        if not self.enabled:
+            return NO_PHASE
+        return Phase(self, name)
+
+    def count(self, name: str, value: int = 1) -> None:
+        """
+        Increments a counter.
+
+        Args:
+            name (str): The name of the counter.
+            value (int): The increment.
+
+        Returns:
+            None
+        """
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def trace(self, best_conflicts: int, best_solution=None) -> None:
+        """
+        Appends the best number of conflicts of the current iteration to the convergence trace.
+        When solutions are recorded, the best solution is also kept each time it improves.
+
+        Args:
+            best_conflicts (int): The best number of conflicts found so far.
+            best_solution: The best solution found so far.
+
+        Returns:
+            None
+        """
+        if not self.enabled:
+            return
+        self.convergence.append(int(best_conflicts))
+        if (self.record_solutions and best_solution is not None
+                and (not self.solutions_conflicts or best_conflicts < self.solutions_conflicts[-1])):
+            self.solutions.append([int(color) for color in best_solution])
+            self.solutions_conflicts.append(int(best_conflicts))
+
+    def to_rows(self) -> list[tuple[str, str, float]]:
+        """
+        Flattens the timers and counters for the results store.
+
+        Returns:
+            list[tuple[str, str, float]]: (kind, name, value) rows, where kind is
+                                          'timer' or 'counter'.
+        """
+        rows = [('timer', name, value) for name, value in self.timers.items()]
+        rows += [('counter', name, value) for name, value in self.counters.items()]
+        return rows
+
+
+# Instrumentation used by the algorithms unless another one is attached to them
+DISABLED = Instrumentation(enabled=False)
+
+def profile_launch(algorithm, nb_lines: int = 30) -> tuple[list[int], str]:
+    """
+    Launches an algorithm under cProfile.
+
+    Args:
+        algorithm: Any algorithm of the app folder.
+        nb_lines (int): The number of functions to keep in the report.
+
+    Returns:
+        tuple[list[int], str]: The solution found and the profile report, sorted by
+                               cumulative time.
+    """
+    profiler = cProfile.Profile()
+    solution = profiler.runcall(algorithm.launch)
+
+    report = io.StringIO()
+    pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(nb_lines)
+    return solution, report.getvalue()
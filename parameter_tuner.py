@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+"""
+Sujet  :  Coloration de graphes appliquée à la France
+Réglage automatique des paramètres des algorithmes par course (racing)
+"""
+
+# Import libs
+import inspect
+import json
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+import numpy as np
+
+from shared_graph_store import SharedArrayDescriptor, SharedGraphStore, attach
+from utils import get_nb_conflicts
+
+# Ranges of the parameters of each algorithm, as in the expander of the app:
+# name -> (minimum, maximum, type)
+PARAMETER_SPACES = {
+    'SimulatedAnnealingAlgorithm': {
+        'initial_temperature': (0.1, 10.0, float),
+        'factor': (0.5, 0.99, float),
+    },
+    'GeneticAlgorithm': {
+        'pop_size': (10, 200, int),
+        'mutation_rate': (0.1, 1.0, float),
+        'crossover_rate': (0.1, 1.0, float),
+    },
+    'AntColonyAlgorithm': {
+        'evaporation_rate': (0.01, 1.0, float),
+        'alpha': (0.1, 10.0, float),
+        'beta': (0.1, 10.0, float),
+        'pheromone_quantity': (0.1, 100.0, float),
+    },
+    'TabuSearchAlgorithm': {
+        'tabu_tenure': (1, 50, int),
+    },
+    'PSOAlgorithm': {
+        'swarm_size': (5, 100, int),
+        'inertia_weight': (0.1, 1.0, float),
+        'cognitive_weight': (0.1, 3.0, float),
+        'social_weight': (0.1, 3.0, float),
+    },
+    'ParallelMinConflictsAlgorithm': {
+        'tabu_tenure': (0, 30, int),
+        'noise': (0.0, 0.2, float),
+    },
+    'PartialColAlgorithm': {
+        'tabu_tenure': (1, 30, int),
+        'tabu_factor': (0.0, 2.0, float),
+    },
+}
+
+def _evaluate(algorithm_class, parameters: dict, adjacency: SharedArrayDescriptor, seed: int) -> tuple[int, float]:
+    """
+    Runs one configuration of an algorithm on one instance with one seed. The adjacency
+    matrix is attached from shared memory instead of being sent with the task.
+
+    Returns:
+        tuple[int, float]: The number of conflicts of the solution and the computation time.
+    """
+    adjacency_matrix = attach(adjacency)
+    random.seed(seed)
+    np.random.seed(seed)
+    nb_nodes = len(adjacency_matrix)
+
+    accepted = inspect.signature(algorithm_class).parameters
+    kwargs = dict(parameters, adjacency_matrix=adjacency_matrix)
+    if 'nb_nodes' in accepted:
+        kwargs['nb_nodes'] = nb_nodes
+    if 'seed' in accepted:
+        kwargs['seed'] = seed
+
+    start_time = time.time()
+    solution = algorithm_class(**kwargs).launch()
+    elapsed_time = time.time() - start_time
+    return get_nb_conflicts(adjacency_matrix, solution, nb_nodes), elapsed_time
+
+
+class ParameterTuner:
+    def __init__(
+            self,
+            algorithm_class,
+            instances: dict[str, np.ndarray],
+            fixed_parameters: dict,
+            parameter_space: dict = None,
+            seeds: list[int] = tuple(range(10)),
+            nb_configurations: int = 20,
+            min_blocks: int = 3,
+            alpha: float = 0.05,
+            nb_workers: int = None,
+            rng_seed: int = None
+        ):
+        """
+        Tunes the parameters of an algorithm with a Friedman race (F-race).
+
+        Configurations are sampled in the parameter space. For each instance, all the
+        surviving configurations are run in parallel on one seed at a time (a block).
+        Once `min_blocks` blocks are done, the Friedman test on the ranks of the
+        configurations decides whether they differ, and the configurations significantly
+        worse than the best one are eliminated, so that the remaining seeds are only
+        spent on promising configurations.
+
+        Args:
+            algorithm_class: The class of the algorithm, eg. `SimulatedAnnealingAlgorithm`.
+            instances (dict[str, np.ndarray]): The adjacency matrix of each map.
+            fixed_parameters (dict): The parameters that are not tuned, eg. max_colors.
+            parameter_space (dict): name -> (minimum, maximum, type), defaults to
+                                    `PARAMETER_SPACES[algorithm_class.__name__]`.
+            seeds (list[int]): The seeds of the blocks of the race.
+            nb_configurations (int): The number of sampled configurations.
+            min_blocks (int): The number of blocks before the first elimination.
+            alpha (float): The significance level of the tests.
+            nb_workers (int): The number of processes.
+            rng_seed (int): The seed used to sample the configurations.
+        """
+        self.algorithm_class = algorithm_class
+        self.instances: dict[str, np.ndarray] = instances
+        self.fixed_parameters: dict = fixed_parameters
+        self.parameter_space: dict = parameter_space or PARAMETER_SPACES[algorithm_class.__name__]
+        self.seeds: list[int] = list(seeds)
+        self.nb_configurations: int = nb_configurations
+        self.min_blocks: int = min_blocks
+        self.alpha: float = alpha
+        self.nb_workers: int = nb_workers
+        self.rng: np.random.Generator = np.random.default_rng(rng_seed)
+        self.configurations: list[dict] = self.sample_configurations()
+
+    def sample_configurations(self) -> list[dict]:
+        """
+        Samples configurations uniformly in the parameter space.
+
+        Returns:
+            list[dict]: The sampled configurations.
+        """
+        configurations = []
+        for _ in range(self.nb_configurations):
+            configuration = {}
+            for name, (minimum, maximum, kind) in self.parameter_space.items():
+                if kind is int:
+                    configuration[name] = int(self.rng.integers(minimum, maximum + 1))
+                else:
+                    configuration[name] = float(self.rng.uniform(minimum, maximum))
+            configurations.append(configuration)
+        return configurations
+
+    def eliminate(self, costs: np.ndarray) -> np.ndarray:
+        """
+        Friedman test on the costs of the surviving configurations, followed by
+        the Conover post-hoc comparison of each configuration with the best one.
+
+        Args:
+            costs (np.ndarray): A (nb_blocks x nb_alive) array of costs, lower is better.
+
+        Returns:
+            np.ndarray: A boolean mask of the configurations to keep.
+        """
+        nb_blocks, nb_alive = costs.shape
+        keep = np.ones(nb_alive, dtype=bool)
+        if nb_alive < 2:
+            return keep
+
+        # Ranks within each block, ties get the average rank
+        ranks = np.empty_like(costs, dtype=float)
+        for block in range(nb_blocks):
+            order = np.argsort(costs[block], kind="stable")
+            sorted_costs = costs[block][order]
+            block_ranks = np.arange(1, nb_alive + 1, dtype=float)
+            for value in np.unique(sorted_costs):
+                tied = sorted_costs == value
+                block_ranks[tied] = block_ranks[tied].mean()
+            ranks[block, order] = block_ranks
+
+        rank_sums = ranks.sum(axis=0)
+        a = (ranks ** 2).sum()
+        c = nb_blocks * nb_alive * (nb_alive + 1) ** 2 / 4
+        if a == c:
+            return keep  # Every configuration has the same rank in every block
+
+        statistic = (nb_alive - 1) * ((rank_sums ** 2).sum() - nb_blocks * c) / (a - c)
+        # Chi-squared quantile with the Wilson-Hilferty approximation
+        dof = nb_alive - 1
+        z = NormalDist().inv_cdf(1 - self.alpha)
+        critical = dof * (1 - 2 / (9 * dof) + z * np.sqrt(2 / (9 * dof))) ** 3
+        if statistic <= critical:
+            return keep
+
+        # Conover post-hoc test against the best configuration (normal approximation of Student)
+        t = NormalDist().inv_cdf(1 - self.alpha / 2)
+        difference = t * np.sqrt(max(
+            2 * nb_blocks * (1 - statistic / (nb_blocks * (nb_alive - 1))) * (a - c)
+            / ((nb_blocks - 1) * (nb_alive - 1)),
+            0
+        ))
+        return rank_sums - rank_sums.min() <= difference
+
+    def race(self, adjacency: SharedArrayDescriptor, executor: ProcessPoolExecutor) -> dict:
+        """
+        Races the configurations on one instance.
+
+        Args:
+            adjacency (SharedArrayDescriptor): The adjacency matrix of the instance in shared memory.
+            executor (ProcessPoolExecutor): The pool running the evaluations.
+
+        Returns:
+            dict: The best configuration, its mean number of conflicts, its mean time
+                  and the number of configurations still alive at the end.
+        """
+        alive = np.arange(len(self.configurations))
+        conflicts = np.full((len(self.seeds), len(self.configurations)), np.nan)
+        times = np.full((len(self.seeds), len(self.configurations)), np.nan)
+
+        for block, seed in enumerate(self.seeds):
+            futures = {
+                index: executor.submit(
+                    _evaluate,
+                    self.algorithm_class,
+                    {**self.fixed_parameters, **self.configurations[index]},
+                    adjacency,
+                    seed
+                )
+                for index in alive
+            }
+            for index, future in futures.items():
+                conflicts[block, index], times[block, index] = future.result()
+
+            if block + 1 >= self.min_blocks and len(alive) > 1:
+                # Conflicts first, computation time to break the ties
+                block_times = times[:block + 1][:, alive]
+                costs = conflicts[:block + 1][:, alive] + block_times / (block_times.max() + 1e-12)
+                alive = alive[self.eliminate(costs)]
+
+        nb_blocks = len(self.seeds)
+        mean_costs = conflicts[:, alive].mean(axis=0) + times[:, alive].mean(axis=0) / (np.nanmax(times) + 1e-12)
+        best = alive[np.argmin(mean_costs)]
+        return {
+            'parameters': self.configurations[best],
+            'mean_conflicts': float(conflicts[:nb_blocks, best].mean()),
+            'mean_time': float(times[:nb_blocks, best].mean()),
+            'nb_alive': int(len(alive)),
+        }
+
+    def run(self) -> dict[str, dict]:
+        """
+        Races the configurations on every instance.
+
+        Returns:
+            dict[str, dict]: The result of the race (see `race`) for each map.
+        """
+        with SharedGraphStore() as store, ProcessPoolExecutor(max_workers=self.nb_workers) as executor:
+            for map_name, adjacency_matrix in self.instances.items():
+                store.put(map_name, adjacency_matrix=adjacency_matrix)
+            return {
+                map_name: self.race(store.get(map_name)['adjacency_matrix'], executor)
+                for map_name in self.instances
+            }
+
+
+def save_best_configurations(algorithm: str, results: dict[str, dict], file_path: str = 'data/best_parameters.json') -> None:
+    """
+    Saves the best configuration of an algorithm for each map in a JSON file,
+    keeping the configurations of the other algorithms.
+
+    Args:
+        algorithm (str): The name of the algorithm.
+        results (dict[str, dict]): The results returned by `ParameterTuner.run`.
+        file_path (str): The path of the JSON file.
+
+    Returns:
+        None
+    """
+    try:
+        with open(file_path, encoding='utf-8') as file:
+            best_configurations = json.load(file)
+    except FileNotFoundError:
+        best_configurations = {}
+
+    for map_name, result in results.items():
+        best_configurations.setdefault(map_name, {})[algorithm] = result
+
+    with open(file_path, mode='w', encoding='utf-8') as file:
+        json.dump(best_configurations, file, indent=4, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    import sys
+    from geo_environment import GeoEnv
+    from app.SimulatedAnnealingAlgorithm import SimulatedAnnealingAlgorithm
+    from app.GeneticAlgorithm import GeneticAlgorithm
+    from app.AntColonyAlgorithm import AntColonyAlgorithm
+    from app.TabuSearchAlgorithm import TabuSearchAlgorithm
+    from app.PSOAlgorithm import PSOAlgorithm
+    from app.ParallelMinConflictsAlgorithm import ParallelMinConflictsAlgorithm
+    from app.PartialColAlgorithm import PartialColAlgorithm
+
+    # Parameters of the app that are not tuned
+    ALGORITHMS = {
+        'SimulatedAnnealingAlgorithm': (SimulatedAnnealingAlgorithm, {'max_colors': 4, 'iterations': 50000}),
+        'GeneticAlgorithm': (GeneticAlgorithm, {'max_colors': 4, 'nb_generations': 500}),
+        'AntColonyAlgorithm': (AntColonyAlgorithm, {'max_colors': 4, 'nb_iterations': 100}),
+        'TabuSearchAlgorithm': (TabuSearchAlgorithm, {'max_colors': 4, 'max_iterations': 500}),
+        'PSOAlgorithm': (PSOAlgorithm, {'max_colors': 4, 'max_iterations': 100}),
+        'ParallelMinConflictsAlgorithm': (ParallelMinConflictsAlgorithm, {'max_colors': 4, 'max_iterations': 5000}),
+        'PartialColAlgorithm': (PartialColAlgorithm, {'max_colors': 4, 'max_iterations': 5000}),
+    }
+
+    algorithm_name = sys.argv[1] if len(sys.argv) > 1 else 'SimulatedAnnealingAlgorithm'
+    algorithm_class, fixed_parameters = ALGORITHMS[algorithm_name]
+    instances = {choice: GeoEnv(choice).adjacency_matrix()[0] for choice in ('Régions', 'Départements')}
+
+    results = ParameterTuner(algorithm_class, instances, fixed_parameters).run()
+    save_best_configurations(algorithm_name, results)
+    print(json.dumps(results, indent=4, ensure_ascii=False))
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+Sujet  :  Coloration de graphes appliquée à la France
+Statistiques agrégées des résultats des algorithmes
+"""
+
+# Import libs
+import json
+import os
+import numpy as np
+import pandas as pd
+
+GROUP_COLUMNS = ['Map', 'Algorithm', 'Parameters']
+TIME_COLUMN = 'Computation Time (s)'
+CONFLICTS_COLUMN = 'Number of Conflicts'
+
+def get_algorithm_parameters(algorithm) -> str:
+    """
+    Describes the parameters of an algorithm, to tell apart the runs of a same
+    algorithm with different settings in the results.
+
+    The arguments are the ones the algorithm was created with (its `arguments`), not
+    values derived from them or from the graph. The arguments left to their default
+    None are omitted, and the random seeds are not recorded, so that the runs of a
+    same configuration with different seeds are grouped together.
+
+    Args:
+        algorithm: Any algorithm of the app folder, after its initialization.
+
+    Returns:
+        str: The arguments of the algorithm as a sorted JSON object.
+    """
+    parameters = {name: value for name, value in algorithm.arguments.items() if value is not None and name != 'seed'}
+    return json.dumps(parameters, sort_keys=True, default=lambda value: value.item())
+
+def get_results_version(file_path: str = 'data/results.csv') -> tuple[float, int]:
+    """
+    Identifies the content of the results file, as a cache key which only changes
+    when new results are saved.
+
+    Returns:
+        tuple[float, int]: The modification time and the size of the file, (0, 0) if it does not exist.
+    """
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return 0.0, 0
+    return stat.st_mtime, stat.st_size
+
+def _with_parameters(results: pd.DataFrame) -> pd.DataFrame:
+    # Results saved before the parameters were recorded are grouped together
+    if 'Parameters' not in results:
+        results = results.assign(Parameters="")
+    return results.assign(Parameters=results['Parameters'].fillna(""))
+
+def aggregate_results(
+        results: pd.DataFrame,
+        percentiles: tuple[float, ...] = (0.1, 0.25, 0.75, 0.9),
+        target_conflicts: int = 0
+    ) -> pd.DataFrame:
+    """
+    Summarizes the runs of each (map, algorithm, parameters) group.
+
+    The distributions of times and conflicts are skewed by a few long or failed runs,
+    so they are described by their median and percentiles rather than their mean.
+
+    Args:
+        results (pd.DataFrame): The results returned by `read_results_from_csv`.
+        percentiles (tuple[float, ...]): The percentiles of the time and of the conflicts.
+        target_conflicts (int): The number of conflicts of a successful run.
+
+    Returns:
+        pd.DataFrame: One row per group with the number of runs, the success rate,
+                      the median and percentiles of the time and of the conflicts, and
+                      the median time of the successful runs.
+    """
+    results = _with_parameters(results)
+    grouped = results.groupby(GROUP_COLUMNS, sort=True)
+    quantiles = sorted({0.5, *percentiles})
+
+    summary = pd.DataFrame({
+        'Runs': grouped.size(),
+        'Success rate': grouped[CONFLICTS_COLUMN].agg(lambda conflicts: (conflicts <= target_conflicts).mean()),
+    })
+    for column, label in ((TIME_COLUMN, 'Time'), (CONFLICTS_COLUMN, 'Conflicts')):
+        values = grouped[column].quantile(quantiles).unstack()
+        for quantile in quantiles:
+            name = 'median' if quantile == 0.5 else f"p{round(quantile * 100)}"
+            summary[f"{label} {name}"] = values[quantile]
+
+    successes = results[results[CONFLICTS_COLUMN] <= target_conflicts]
+    summary['Time to target median'] = successes.groupby(GROUP_COLUMNS)[TIME_COLUMN].median()
+    return summary.reset_index()
+
+def time_to_target(
+        results: pd.DataFrame,
+        nb_points: int = 50,
+        target_conflicts: int = 0
+    ) -> pd.DataFrame:
+    """
+    Time-to-target curves: for each (map, algorithm, parameters) group, the empirical
+    probability that a run reaches the target within a given time. Failed runs count
+    as never reaching it, so the curves of unreliable algorithms stay below 1.
+
+    The curves are sampled on a logarithmic grid of times shared by the groups of a map,
+    which keeps them small whatever the number of runs.
+
+    Args:
+        results (pd.DataFrame): The results returned by `read_results_from_csv`.
+        nb_points (int): The number of times of the grid.
+        target_conflicts (int): The number of conflicts of a successful run.
+
+    Returns:
+        pd.DataFrame: Columns 'Map', 'Algorithm', 'Parameters', 'Time (s)', 'Probability'.
+    """
+    results = _with_parameters(results)
+    curves = []
+    for map_name, map_results in results.groupby('Map', sort=True):
+        times = map_results[TIME_COLUMN].to_numpy(dtype=float)
+        positive = times[times > 0]
+        if positive.size == 0:
+            continue
+        grid = np.geomspace(positive.min(), positive.max(), nb_points) if positive.min() < positive.max() else positive[:1]
+
+        for (algorithm, parameters), group in map_results.groupby(['Algorithm', 'Parameters'], sort=True):
+            success_times = np.sort(group.loc[group[CONFLICTS_COLUMN] <= target_conflicts, TIME_COLUMN].to_numpy(dtype=float))
+            probability = np.searchsorted(success_times, grid, side='right') / len(group)
+            curves.append(pd.DataFrame({
+                'Map': map_name,
+                'Algorithm': algorithm,
+                'Parameters': parameters,
+                'Time (s)': grid,
+                'Probability': probability,
+            }))
+
+    if not curves:
+        return pd.DataFrame(columns=[*GROUP_COLUMNS, 'Time (s)', 'Probability'])
+    return pd.concat(curves, ignore_index=True)
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Sujet  :  Coloration de graphes appliquée à la France
+Partage des graphes entre processus sans copie (mémoire partagée)
+"""
+
+# Import libs
+import weakref
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+import numpy as np
+
+@dataclass(frozen=True)
+class SharedArrayDescriptor:
+    """
+    Small picklable description of an array placed in shared memory.
+    """
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+
+
+# Segments attached by the current process, kept alive as long as their views
+_attached: dict[str, shared_memory.SharedMemory] = {}
+
+def attach(descriptor: SharedArrayDescriptor) -> np.ndarray:
+    """
+    Attaches a read-only view on a shared array, without copying it. The segment is
+    attached once per process and reused by the next calls.
+
+    Args:
+        descriptor (SharedArrayDescriptor): The descriptor sent by the parent process.
+
+    Returns:
+        np.ndarray: A read-only array backed by the shared memory.
+    """
+    segment = _attached.get(descriptor.name)
+    if segment is None:
+        try:
+            segment = shared_memory.SharedMemory(name=descriptor.name, track=False)
+        except TypeError:  # Python < 3.13, the segment is tracked by the parent's resource tracker
+            segment = shared_memory.SharedMemory(name=descriptor.name)
+        _attached[descriptor.name] = segment
+    array = np.ndarray(descriptor.shape, dtype=descriptor.dtype, buffer=segment.buf)
+    array.flags.writeable = False
+    return array
+
+def detach_all() -> None:
+    """
+    Closes every segment attached by the current process. The views on them must
+    not be used afterwards.
+
+    Returns:
+        None
+    """
+    while _attached:
+        _, segment = _attached.popitem()
+        segment.close()
+
+
+def _release(segments: list[shared_memory.SharedMemory]) -> None:
+    for segment in segments:
+        segment.close()
+        try:
+            segment.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedGraphStore:
+    def __init__(self):
+        """
+        Places the arrays of graphs once in shared memory and hands out small descriptors,
+        so that worker processes attach them with `attach` instead of receiving a copy
+        of the dense adjacency matrix with every task.
+
+        The segments of a graph are released by `release`, when the store is closed or
+        used as a context manager, or when the store is garbage collected.
+        """
+        self.graphs: dict[str, dict[str, SharedArrayDescriptor]] = {}
+        self.segments: dict[str, list[shared_memory.SharedMemory]] = {}
+        self._finalizer = weakref.finalize(self, _release, [])
+
+    def put(self, key: str, **arrays: np.ndarray) -> dict[str, SharedArrayDescriptor]:
+        """
+        Copies the arrays of a graph into shared memory, eg. `put('Régions', adjacency_matrix=...)`.
+
+        Args:
+            key (str): The name of the graph.
+            arrays (np.ndarray): The arrays of the graph.
+
+        Returns:
+            dict[str, SharedArrayDescriptor]: The descriptor of each array.
+        """
+        if key in self.graphs:
+            self.release(key)
+
+        descriptors = {}
+        segments = []
+        try:
+            for name, array in arrays.items():
+                array = np.ascontiguousarray(array)
+                segment = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                segments.append(segment)
+                np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)[...] = array
+                descriptors[name] = SharedArrayDescriptor(segment.name, array.shape, array.dtype.str)
+        except BaseException:
+            # The segments of this graph are not registered yet, nothing else would release them
+            _release(segments)
+            raise
+
+        self.graphs[key] = descriptors
+        self.segments[key] = segments
+        self._finalizer.detach()
+        self._finalizer = weakref.finalize(self, _release, [s for group in self.segments.values() for s in group])
+        return descriptors
+
+    def get(self, key: str) -> dict[str, SharedArrayDescriptor]:
+        """
+        Returns the descriptors of a graph, to send to the workers.
+
+        Args:
+            key (str): The name of the graph.
+
+        Returns:
+            dict[str, SharedArrayDescriptor]: The descriptor of each array.
+        """
+        return self.graphs[key]
+
+    def release(self, key: str) -> None:
+        """
+        Releases the shared memory of a graph. The workers must not attach it anymore.
+
+        Args:
+            key (str): The name of the graph.
+
+        Returns:
+            None
+        """
+        del self.graphs[key]
+        _release(self.segments.pop(key))
+        self._finalizer.detach()
+        self._finalizer = weakref.finalize(self, _release, [s for group in self.segments.values() for s in group])
+
+    def close(self) -> None:
+        """
+        Releases the shared memory of every graph.
+
+        Returns:
+            None
+        """
+        for key in list(self.graphs):
+            self.release(key)
+
+    def __enter__(self) -> "SharedGraphStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from geo_ingestion import StreamedGeoGraph
+from utils import get_adjacency_matrix
+
+@pytest.fixture(scope="session")
+def regions():
+    """
+    The graph of the régions of `data/regions.geojson`, built like the app does.
+
+    Returns:
+        tuple[np.ndarray, list[str]]: The adjacency matrix and the names of the régions.
+    """
+    (indptr, indices), region_names = StreamedGeoGraph(os.path.join(ROOT, "data", "regions.geojson")).adjacency_lists()
+    return get_adjacency_matrix(indptr, indices), list(region_names)
@@ -0,0 +1,78 @@
+import json
+
+import pandas as pd
+import pytest
+
+from algorithm_selector import (
+    ALGORITHM_CLASSES, DEFAULT_PARAMETERS, FALLBACK_ALGORITHM, AlgorithmSelector, create_algorithm, get_graph_features
+)
+from app.IslandGeneticAlgorithm import IslandGeneticAlgorithm
+from app.ParallelTemperingAlgorithm import ParallelTemperingAlgorithm
+from app.SimulatedAnnealingAlgorithm import SimulatedAnnealingAlgorithm
+from results_statistics import get_algorithm_parameters
+
+# A configuration of each class of the app, as run and recorded by the app
+CONFIGURATIONS = [
+    (name, algorithm_class, DEFAULT_PARAMETERS[name])
+    for name, classes in ALGORITHM_CLASSES.items() for algorithm_class in classes[:1]
+] + [
+    ('Recuit simulé', SimulatedAnnealingAlgorithm, {'iterations': 1000, 'schedule': 'linear', 'initial_temperature': 2.0}),
+    ('Recuit simulé', ParallelTemperingAlgorithm, {'iterations': 100, 'min_temperature': 0.1, 'max_temperature': 2.0}),
+    ('Algorithme génétique', IslandGeneticAlgorithm,
+     {'pop_size': 20, 'nb_generations': 10, 'mutation_rate': 0.3, 'crossover_rate': 0.7, 'nb_islands': 2}),
+]
+
+@pytest.mark.parametrize("name, algorithm_class, parameters", CONFIGURATIONS,
+                         ids=[f"{algorithm_class.__name__}-{i}" for i, (_, algorithm_class, _) in enumerate(CONFIGURATIONS)])
+def test_create_recorded_algorithm(regions, name, algorithm_class, parameters):
+    adjacency_matrix, region_names = regions
+    kwargs = dict(parameters, adjacency_matrix=adjacency_matrix, max_colors=4)
+    if algorithm_class.__name__ != 'AntColonyAlgorithm':
+        kwargs['nb_nodes'] = len(region_names)
+    recorded = get_algorithm_parameters(algorithm_class(**kwargs))
+
+    algorithm = create_algorithm(name, json.loads(recorded), adjacency_matrix, 4)
+    assert type(algorithm) is algorithm_class
+    assert get_algorithm_parameters(algorithm) == recorded
+
+def test_create_with_missing_arguments(regions):
+    adjacency_matrix, _ = regions
+    # Island runs recorded without their rates get the rates of the app
+    algorithm = create_algorithm('Algorithme génétique', {'pop_size': 20, 'nb_generations': 10, 'nb_islands': 2}, adjacency_matrix, 4)
+    assert isinstance(algorithm, IslandGeneticAlgorithm)
+    assert algorithm.arguments['mutation_rate'] == DEFAULT_PARAMETERS['Algorithme génétique']['mutation_rate']
+
+def test_select(regions, tmp_path):
+    adjacency_matrix, _ = regions
+    results_path, features_path = str(tmp_path / "results.csv"), str(tmp_path / "graph_features.json")
+    selector = AlgorithmSelector(results_path, features_path)
+    assert selector.select(get_graph_features(adjacency_matrix))[0] == FALLBACK_ALGORITHM
+
+    pd.DataFrame({
+        'Algorithm': ['Recherche tabou'] * 2 + ['PSO'] * 2 + ['ACO'] * 2,
+        'Map': ['Régions'] * 6,
+        'Computation Time (s)': [2.0, 2.0, 1.0, 1.0, 0.1, 0.1],
+        'Number of Conflicts': [0, 0, 0, 0, 3, 2],
+        'Parameters': ['{"tabu_tenure": 7}'] * 2 + [""] * 2 + [""] * 2,
+    }).to_csv(results_path, index=False)
+    with open(features_path, 'w', encoding='utf-8') as file:
+        json.dump({'Régions': get_graph_features(adjacency_matrix)}, file)
+
+    # The fastest reliable configuration, the ant colony being faster but never successful
+    name, parameters, _ = selector.select(get_graph_features(adjacency_matrix))
+    assert (name, parameters) == ('PSO', {})
+
+def test_select_skips_legacy_defaults(regions, tmp_path):
+    adjacency_matrix, _ = regions
+    results_path, features_path = str(tmp_path / "results.csv"), str(tmp_path / "graph_features.json")
+    # The annealing results saved without parameters were run with the old defaults
+    pd.DataFrame({
+        'Algorithm': ['Recuit simulé'] * 2 + ['Recherche tabou'] * 2,
+        'Map': ['Régions'] * 4,
+        'Computation Time (s)': [0.01, 0.01, 2.0, 2.0],
+        'Number of Conflicts': [0, 0, 0, 0],
+    }).to_csv(results_path, index=False)
+    with open(features_path, 'w', encoding='utf-8') as file:
+        json.dump({'Régions': get_graph_features(adjacency_matrix)}, file)
+
+    assert AlgorithmSelector(results_path, features_path).select(get_graph_features(adjacency_matrix))[:2] == ('Recherche tabou', {})
@@ -0,0 +1,34 @@
+import os
+
+import geopandas as gpd
+import numpy as np
+import pytest
+from matplotlib.colors import to_rgba_array
+
+pytest.importorskip("streamlit")  # The colors of the maps are defined next to GeoEnv
+from animation_export import FrameFigure, export_animation, render_frames
+from geo_environment import COLORS_LIST
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture(scope="module")
+def departements() -> gpd.GeoSeries:
+    return gpd.read_file(os.path.join(ROOT, "data", "departements.geojson")).geometry
+
+def test_frame_colors(departements, tmp_path):
+    # The file has départements in several parts, which must still get a single color each
+    assert (departements.geom_type == "MultiPolygon").any()
+    figure = FrameFigure(departements, "Départements", COLORS_LIST)
+    solution = np.arange(len(departements)) % 4
+    figure.render(solution.tolist(), str(tmp_path / "frame.png"))
+
+    assert np.allclose(figure.collection.get_facecolor(), to_rgba_array(COLORS_LIST)[solution])
+
+def test_render_and_export(departements, tmp_path):
+    solutions = [[0] * len(departements), [1] * len(departements)]
+    paths = render_frames(departements, solutions, str(tmp_path), labels=["1 conflit", "0 conflits"], nb_workers=2)
+    assert [os.path.basename(path) for path in paths] == ["frame_00000.png", "frame_00001.png"]
+
+    gif_path = str(tmp_path / "convergence.gif")
+    export_animation(paths, gif_path, fps=4)
+    assert os.path.getsize(gif_path) > 0
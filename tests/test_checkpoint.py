@@ -0,0 +1,71 @@
+import random
+
+import numpy as np
+import pytest
+
+from app.SimulatedAnnealingAlgorithm import SimulatedAnnealingAlgorithm
+from app.TabuSearchAlgorithm import TabuSearchAlgorithm
+from checkpoint import Checkpointer, get_global_rng_state, get_signature, load_checkpoint, save_checkpoint
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "state.npz")
+    random.seed(0)
+    np.random.seed(0)
+    state = {
+        'solution': np.arange(5, dtype=np.uint8),
+        'iteration': 12,
+        'temperature': 0.5,
+        'found': True,
+        'best_solution': None,
+        'level': (1, 2, 3.5),
+        'rng': get_global_rng_state(),
+    }
+    save_checkpoint(path, state, signature="run")
+    loaded = load_checkpoint(path, signature="run")
+
+    assert np.array_equal(loaded['solution'], state['solution'])
+    assert loaded['solution'].dtype == np.uint8
+    assert loaded['iteration'] == 12 and isinstance(loaded['iteration'], int)
+    assert loaded['temperature'] == 0.5
+    assert loaded['found'] is True
+    assert loaded['best_solution'] is None
+    assert list(loaded['level']) == [1, 2, 3.5]
+
+    random.setstate(loaded['rng']['random'])
+    np.random.set_state(loaded['rng']['np_random'])
+    expected = (random.random(), np.random.random())
+    random.setstate(state['rng']['random'])
+    np.random.set_state(state['rng']['np_random'])
+    assert (random.random(), np.random.random()) == expected
+
+def test_signature_mismatch(tmp_path):
+    path = str(tmp_path / "state.npz")
+    save_checkpoint(path, {'iteration': 1}, signature=get_signature("Recherche tabou", {'tabu_tenure': 5}))
+
+    assert load_checkpoint(path)['iteration'] == 1
+    with pytest.raises(ValueError):
+        load_checkpoint(path, signature=get_signature("Recherche tabou", {'tabu_tenure': 6}))
+
+@pytest.mark.parametrize("algorithm_class, parameters, every_iterations", [
+    (SimulatedAnnealingAlgorithm, {'iterations': 3000}, 700),
+    (TabuSearchAlgorithm, {'max_iterations': 300, 'tabu_tenure': 5}, 70),
+])
+def test_exact_resume(tmp_path, regions, algorithm_class, parameters, every_iterations):
+    adjacency_matrix, region_names = regions
+    path = str(tmp_path / "state.npz")
+
+    def create(seed):
+        random.seed(seed)
+        np.random.seed(seed)
+        algorithm = algorithm_class(nb_nodes=len(region_names), adjacency_matrix=adjacency_matrix, max_colors=3, **parameters)
+        # Run every iteration, so that the last checkpoint is saved before the end
+        algorithm.target_conflicts = -1
+        return algorithm
+
+    algorithm = create(0)
+    algorithm.checkpointer = Checkpointer(path, every_iterations=every_iterations)
+    solution = algorithm.launch()
+
+    resumed = create(1)
+    resumed.set_state(load_checkpoint(path))
+    assert resumed.launch() == solution
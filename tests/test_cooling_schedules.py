@@ -0,0 +1,31 @@
+import math
+
+import numpy as np
+import pytest
+
+from cooling_schedules import (
+    FINAL_ACCEPTANCE, INITIAL_ACCEPTANCE, SCHEDULES, GeometricSchedule, estimate_initial_temperature, get_final_temperature
+)
+
+def test_initial_temperature():
+    temperature = estimate_initial_temperature(np.array([-1, 0, 2, 4]))
+    # The mean worsening move is accepted with the initial probability
+    assert math.exp(-3 / temperature) == pytest.approx(INITIAL_ACCEPTANCE)
+    assert estimate_initial_temperature(np.array([-1, 0])) == get_final_temperature()
+
+def test_final_temperature():
+    assert math.exp(-1 / get_final_temperature()) == pytest.approx(FINAL_ACCEPTANCE)
+
+@pytest.mark.parametrize("name", list(SCHEDULES))
+def test_reaches_final_temperature(name):
+    schedule = SCHEDULES[name]()
+    temperature, nb_levels = 10.0, 50
+    for level in range(nb_levels):
+        previous = temperature
+        temperature = schedule.next_temperature(temperature, nb_levels - level, cost_std=1.0)
+        assert temperature <= previous
+    assert temperature == pytest.approx(schedule.final_temperature)
+
+def test_geometric_factor():
+    schedule = GeometricSchedule(factor=0.9)
+    assert schedule.next_temperature(2.0, remaining_levels=10, cost_std=1.0) == pytest.approx(1.8)
@@ -0,0 +1,54 @@
+import itertools
+
+import numpy as np
+
+from app.GeneticAlgorithm import GeneticAlgorithm
+from utils import get_nb_conflicts
+
+def create(regions, **parameters) -> GeneticAlgorithm:
+    adjacency_matrix, region_names = regions
+    np.random.seed(0)
+    return GeneticAlgorithm(len(region_names), adjacency_matrix, max_colors=4, pop_size=6, nb_generations=10,
+                            mutation_rate=0.5, crossover_rate=0.8, **parameters)
+
+def test_canonicalize(regions):
+    algorithm = create(regions)
+    chromosome = algorithm.population[0]
+    permutations = np.array([np.array(permutation, dtype=np.uint8)[chromosome]
+                             for permutation in itertools.permutations(range(4))])
+    canonical = algorithm.canonicalize(permutations)
+
+    # Every permutation of the colors has the same canonical form, labelled in order of first appearance
+    assert (canonical == canonical[0]).all()
+    first_appearance = canonical[0][np.sort(np.unique(canonical[0], return_index=True)[1])]
+    assert first_appearance.tolist() == list(range(len(first_appearance)))
+    # The canonical form has the same color classes
+    assert all((canonical[0][i] == canonical[0][j]) == (chromosome[i] == chromosome[j])
+               for i, j in itertools.combinations(range(len(chromosome)), 2))
+
+def test_cached_fitness(regions):
+    adjacency_matrix, region_names = regions
+    algorithm = create(regions)
+    algorithm.population[1] = (algorithm.population[0] + 1) % 4
+    fitness = algorithm.get_fitness()
+
+    assert fitness.tolist() == [get_nb_conflicts(adjacency_matrix, solution, len(region_names)) for solution in algorithm.population]
+    assert len(algorithm.fitness_cache) < algorithm.pop_size
+
+def test_cache_size(regions):
+    algorithm = create(regions, cache_size=3)
+    algorithm.get_fitness()
+    assert len(algorithm.fitness_cache) == 3
+
+def test_replace_duplicates(regions):
+    algorithm = create(regions)
+    population = algorithm.population
+    population[2] = population[0]
+    population[3] = (population[0] + 2) % 4
+    kept = population[[0, 1, 4, 5]].copy()
+    algorithm.replace_duplicated_chromosomes()
+
+    # The first copy is kept and the permuted copies are replaced
+    assert np.array_equal(algorithm.population[[0, 1, 4, 5]], kept)
+    canonical = algorithm.canonicalize(algorithm.population)
+    assert len({chromosome.tobytes() for chromosome in canonical}) == algorithm.pop_size
@@ -0,0 +1,30 @@
+import numpy as np
+
+from app.HybridEvolutionaryAlgorithm import HybridEvolutionaryAlgorithm
+
+def test_distance_ignores_color_names(regions):
+    adjacency_matrix, region_names = regions
+    algorithm = HybridEvolutionaryAlgorithm(len(region_names), adjacency_matrix, max_colors=4, pop_size=4, nb_generations=0, seed=0)
+    solution = np.arange(len(region_names), dtype=np.uint8) % 4
+    permuted = np.array([2, 0, 3, 1], dtype=np.uint8)[solution]
+
+    assert algorithm.get_distance(solution, permuted) == 0
+    moved = permuted.copy()
+    moved[0] = (moved[0] + 1) % 4
+    assert algorithm.get_distance(solution, moved) == 1
+
+def test_distances_stay_up_to_date(regions):
+    adjacency_matrix, region_names = regions
+    # Too few colors for a legal coloring, so that every generation replaces an individual
+    algorithm = HybridEvolutionaryAlgorithm(
+        len(region_names), adjacency_matrix, max_colors=2, pop_size=6, nb_generations=100, tabu_iterations=5, seed=0
+    )
+    algorithm.target_conflicts = -1
+    algorithm.launch()
+
+    expected = np.full((algorithm.pop_size, algorithm.pop_size), algorithm.nb_nodes)
+    for i in range(algorithm.pop_size):
+        for j in range(algorithm.pop_size):
+            if i != j:
+                expected[i, j] = algorithm.get_distance(algorithm.population[i], algorithm.population[j])
+    assert np.array_equal(algorithm.distances, expected)
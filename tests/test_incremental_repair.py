@@ -0,0 +1,76 @@
+import numpy as np
+
+from app.IncrementalRepairAlgorithm import IncrementalRepairAlgorithm
+from utils import get_graph_diff, get_nb_conflicts
+
+def remove_node(adjacency_matrix: np.ndarray, region_names: list[str], name: str) -> tuple[np.ndarray, list[str]]:
+    kept = [i for i, region in enumerate(region_names) if region != name]
+    return adjacency_matrix[np.ix_(kept, kept)], [region_names[i] for i in kept]
+
+def greedy_coloring(adjacency_matrix: np.ndarray) -> list[int]:
+    solution = []
+    for node in range(len(adjacency_matrix)):
+        used = {solution[neighbor] for neighbor in np.flatnonzero(adjacency_matrix[node, :node])}
+        solution.append(min(set(range(len(adjacency_matrix))) - used))
+    return solution
+
+def test_graph_diff():
+    names = ['A', 'B', 'C']
+    old = np.array([[0, 1, 0], [1, 0, 1], [0, 1, 0]])
+    new_names = ['A', 'C', 'D']
+    new = np.array([[0, 1, 1], [1, 0, 0], [1, 0, 0]])
+
+    assert get_graph_diff(old, names, new, new_names) == {
+        'added_nodes': ['D'],
+        'removed_nodes': ['B'],
+        'added_edges': [('A', 'C'), ('A', 'D')],
+        'removed_edges': [('A', 'B'), ('B', 'C')],
+    }
+    assert get_graph_diff(old, names, old, names) == {'added_nodes': [], 'removed_nodes': [], 'added_edges': [], 'removed_edges': []}
+
+def test_repair_after_adding_a_zone(regions):
+    adjacency_matrix, region_names = regions
+    # A legal coloring of the map without Île-de-France, which is then added back
+    old_adjacency, old_names = remove_node(adjacency_matrix, region_names, 'Île-de-France')
+    solution = greedy_coloring(old_adjacency)
+
+    repair = IncrementalRepairAlgorithm(
+        adjacency_matrix=old_adjacency,
+        region_names=old_names,
+        solution=solution,
+        max_colors=4,
+        max_iterations=100,
+        seed=0,
+        **get_graph_diff(old_adjacency, old_names, adjacency_matrix, region_names)
+    )
+    repaired = repair.launch()
+
+    assert sorted(repair.region_names) == sorted(region_names)
+    assert get_nb_conflicts(repair.adjacency_matrix, repaired, repair.nb_nodes) == 0
+    # The zones which were already colored without conflict keep their color
+    colors = dict(zip(repair.region_names, repaired))
+    changed = [name for name, color in zip(old_names, solution) if colors[name] != color]
+    assert all(adjacency_matrix[region_names.index('Île-de-France'), region_names.index(name)] for name in changed)
+
+def test_repair_stops_at_target(regions):
+    adjacency_matrix, region_names = regions
+    # Île-de-France had no border in the old graph and shares the color of Centre-Val de Loire
+    node, neighbor = region_names.index('Île-de-France'), region_names.index('Centre-Val de Loire')
+    old_adjacency = adjacency_matrix.copy()
+    old_adjacency[node, :] = old_adjacency[:, node] = 0
+    solution = greedy_coloring(old_adjacency)
+    solution[node] = solution[neighbor]
+    diff = get_graph_diff(old_adjacency, region_names, adjacency_matrix, region_names)
+    projected_conflicts = get_nb_conflicts(adjacency_matrix, solution, len(region_names))
+    assert projected_conflicts > 0
+
+    def repair(target_conflicts: int) -> list[int]:
+        algorithm = IncrementalRepairAlgorithm(
+            adjacency_matrix=old_adjacency, region_names=region_names, solution=solution,
+            max_colors=4, max_iterations=100, seed=0, **diff
+        )
+        algorithm.target_conflicts = target_conflicts
+        return algorithm.launch()
+
+    assert repair(projected_conflicts) == solution
+    assert get_nb_conflicts(adjacency_matrix, repair(0), len(region_names)) == 0
@@ -0,0 +1,42 @@
+import random
+
+import numpy as np
+
+from app.AntColonyAlgorithm import AntColonyAlgorithm
+from app.SimulatedAnnealingAlgorithm import SimulatedAnnealingAlgorithm
+from instrumentation import DISABLED, Instrumentation
+
+def launch(create, instrumentation: Instrumentation = None):
+    random.seed(0)
+    np.random.seed(0)
+    algorithm = create()
+    algorithm.target_conflicts = -1
+    if instrumentation is not None:
+        algorithm.instrumentation = instrumentation
+    return algorithm.launch()
+
+def test_annealing_instrumentation(regions):
+    adjacency_matrix, region_names = regions
+    create = lambda: SimulatedAnnealingAlgorithm(len(region_names), adjacency_matrix, max_colors=3, iterations=2000)
+    instrumentation = Instrumentation(record_solutions=True)
+
+    # The instrumentation observes the search without changing it
+    assert launch(create, instrumentation) == launch(create)
+    assert instrumentation.counters['evaluations'] == 2000
+    assert instrumentation.counters['accepted_moves'] <= 2000
+    assert instrumentation.timers['moves'] > 0
+    assert instrumentation.convergence == sorted(instrumentation.convergence, reverse=True)
+    assert instrumentation.solutions_conflicts == sorted(set(instrumentation.solutions_conflicts), reverse=True)
+
+def test_ant_colony_instrumentation(regions):
+    adjacency_matrix, region_names = regions
+    create = lambda: AntColonyAlgorithm(adjacency_matrix, max_colors=3, evaporation_rate=0.5, alpha=1.0, beta=3.0,
+                                        nb_iterations=5, pheromone_quantity=10.0)
+    instrumentation = Instrumentation()
+
+    assert launch(create, instrumentation) == launch(create)
+    assert set(instrumentation.timers) == {'construction', 'fitness', 'pheromone_update'}
+    assert len(instrumentation.convergence) == 5
+
+def test_disabled_collects_nothing():
+    assert not DISABLED.timers and not DISABLED.counters and not DISABLED.convergence
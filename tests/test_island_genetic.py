@@ -0,0 +1,22 @@
+import pytest
+
+from app.IslandGeneticAlgorithm import IslandGeneticAlgorithm
+
+def test_failed_island_raises(regions):
+    adjacency_matrix, region_names = regions
+    algorithm = IslandGeneticAlgorithm(
+        nb_nodes=len(region_names),
+        adjacency_matrix=adjacency_matrix,
+        max_colors=3,
+        pop_size=20,
+        nb_generations=50,
+        mutation_rate=0.5,
+        crossover_rate=0.8,
+        migration_interval=1,
+        # The second island fails at its first mutation, while the others wait for it at the barrier
+        mutation_rates=[0.5, None, 0.5, 0.5],
+        seed=0
+    )
+    algorithm.target_conflicts = -1
+    with pytest.raises(RuntimeError):
+        algorithm.launch()
@@ -0,0 +1,47 @@
+import numpy as np
+
+from app.MultilevelAlgorithm import MultilevelAlgorithm
+from app.PartialColAlgorithm import PartialColAlgorithm
+from utils import get_adjacency_lists, get_adjacency_matrix, get_nb_conflicts
+
+class RecordingSolver(PartialColAlgorithm):
+    # Keeps the target given to the solver of the coarsest graph
+    targets: list[int] = []
+
+    def launch(self) -> list[int]:
+        RecordingSolver.targets.append(self.target_conflicts)
+        return super().launch()
+
+def create(regions, algorithm_class=PartialColAlgorithm, **parameters) -> MultilevelAlgorithm:
+    adjacency_matrix, region_names = regions
+    return MultilevelAlgorithm(len(region_names), adjacency_matrix, max_colors=4, algorithm_class=algorithm_class,
+                               parameters={'max_iterations': 1000, 'seed': 0}, min_nodes=5, seed=0, **parameters)
+
+def test_matching_merges_non_adjacent_nodes(regions):
+    adjacency_matrix, _ = regions
+    algorithm = create(regions)
+    indptr, indices = get_adjacency_lists(adjacency_matrix)
+    groups = algorithm.match(indptr, indices)
+
+    for group in range(groups.max() + 1):
+        nodes = np.flatnonzero(groups == group)
+        assert 1 <= len(nodes) <= 2
+        assert not adjacency_matrix[np.ix_(nodes, nodes)].any()
+
+    # Two coarse nodes are adjacent if and only if some of their nodes are
+    coarse = get_adjacency_matrix(*algorithm.contract(indptr, indices, groups))
+    one_hot = np.eye(groups.max() + 1, dtype=int)[groups]
+    assert np.array_equal(coarse, (one_hot.T @ adjacency_matrix @ one_hot > 0).astype(np.uint8))
+
+def test_parent_groups(regions):
+    adjacency_matrix, region_names = regions
+    # Groups of adjacent régions, whose projection has conflicts for the refinement to repair
+    parent_groups = np.arange(len(region_names)) // 3
+    RecordingSolver.targets = []
+    algorithm = create(regions, RecordingSolver, parent_groups=parent_groups)
+    algorithm.target_conflicts = 0
+    solution = algorithm.launch()
+
+    assert np.array_equal(algorithm.groups[0], parent_groups)
+    assert RecordingSolver.targets == [0]
+    assert get_nb_conflicts(adjacency_matrix, solution, len(region_names)) == 0
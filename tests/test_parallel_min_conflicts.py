@@ -0,0 +1,18 @@
+import numpy as np
+
+from app.ParallelMinConflictsAlgorithm import ParallelMinConflictsAlgorithm
+from utils import get_nb_conflicts
+
+def test_moves_independent_sets(regions):
+    adjacency_matrix, region_names = regions
+    nb_nodes = len(region_names)
+    algorithm = ParallelMinConflictsAlgorithm(nb_nodes, adjacency_matrix, max_colors=2, max_iterations=0, seed=0)
+    for iteration in range(50):
+        nodes = algorithm.select_moving_nodes()
+        colors = algorithm.colors
+        # Only conflicting nodes move, and no two of them are adjacent
+        assert all(adjacency_matrix[node][colors == colors[node]].any() for node in nodes)
+        assert not adjacency_matrix[np.ix_(nodes, nodes)].any()
+
+        algorithm.step(iteration)
+        assert algorithm.conflicts == get_nb_conflicts(adjacency_matrix, algorithm.colors, nb_nodes)
@@ -0,0 +1,41 @@
+import numpy as np
+
+from app.PartialColAlgorithm import PartialColAlgorithm
+from parameter_tuner import PARAMETER_SPACES, ParameterTuner
+
+def create_tuner(**parameters) -> ParameterTuner:
+    return ParameterTuner(PartialColAlgorithm, {}, {'max_colors': 4, 'max_iterations': 200}, rng_seed=0, **parameters)
+
+def test_configurations_in_space():
+    tuner = create_tuner(nb_configurations=50)
+    for configuration in tuner.configurations:
+        for name, (minimum, maximum, kind) in PARAMETER_SPACES['PartialColAlgorithm'].items():
+            assert isinstance(configuration[name], kind)
+            assert minimum <= configuration[name] <= maximum
+
+def test_eliminate_keeps_ties():
+    assert create_tuner().eliminate(np.ones((5, 4))).all()
+    assert create_tuner().eliminate(np.ones((5, 1))).all()
+
+def test_eliminate_worse_configurations():
+    # The third configuration is the worst and the first the best in every block
+    costs = np.tile([1.0, 2.0, 3.0], (10, 1))
+    keep = create_tuner().eliminate(costs)
+    assert keep[0] and not keep[2]
+
+def test_eliminate_needs_evidence():
+    # Configurations alternating between the best and the worst rank do not differ
+    costs = np.array([[1.0, 2.0], [2.0, 1.0], [1.0, 2.0], [2.0, 1.0]])
+    assert create_tuner().eliminate(costs).all()
+
+def test_race(regions):
+    adjacency_matrix, _ = regions
+    tuner = ParameterTuner(
+        PartialColAlgorithm, {'Régions': adjacency_matrix}, {'max_colors': 4, 'max_iterations': 200},
+        seeds=range(4), nb_configurations=3, min_blocks=3, nb_workers=2, rng_seed=0
+    )
+    result = tuner.run()['Régions']
+
+    assert result['parameters'] in tuner.configurations
+    assert result['mean_conflicts'] == 0
+    assert 1 <= result['nb_alive'] <= 3
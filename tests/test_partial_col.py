@@ -0,0 +1,19 @@
+import numpy as np
+
+from app.PartialColAlgorithm import PartialColAlgorithm
+from utils import get_nb_conflicts
+
+def test_partial_coloring_stays_legal(regions):
+    adjacency_matrix, region_names = regions
+    nb_nodes = len(region_names)
+    # Too few colors, so that some nodes stay uncolored until the end
+    algorithm = PartialColAlgorithm(nb_nodes, adjacency_matrix, max_colors=2, max_iterations=200, seed=0)
+    algorithm.target_conflicts = -1
+    solution = algorithm.launch()
+
+    colors = algorithm.colors
+    colored = np.flatnonzero(colors < algorithm.max_colors)
+    assert len(colored) < nb_nodes
+    assert get_nb_conflicts(adjacency_matrix[np.ix_(colored, colored)], colors[colored], len(colored)) == 0
+    # The returned coloring is complete
+    assert len(solution) == nb_nodes and max(solution) < algorithm.max_colors
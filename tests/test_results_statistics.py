@@ -0,0 +1,66 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.IslandGeneticAlgorithm import IslandGeneticAlgorithm
+from app.ParallelTemperingAlgorithm import ParallelTemperingAlgorithm
+from app.SimulatedAnnealingAlgorithm import SimulatedAnnealingAlgorithm
+from results_statistics import aggregate_results, get_algorithm_parameters, time_to_target
+
+RESULTS = pd.DataFrame({
+    'Algorithm': ['Recherche tabou'] * 4 + ['PSO'] * 2,
+    'Map': ['Régions'] * 6,
+    'Computation Time (s)': [1.0, 2.0, 3.0, 4.0, 0.5, 8.0],
+    'Number of Conflicts': [0, 0, 1, 0, 2, 0],
+    'Parameters': ['{"tabu_tenure": 5}'] * 4 + [np.nan] * 2,
+})
+
+def test_island_parameters(regions):
+    adjacency_matrix, region_names = regions
+    create = lambda: IslandGeneticAlgorithm(len(region_names), adjacency_matrix, max_colors=4, pop_size=20,
+                                            nb_generations=10, mutation_rate=0.3, crossover_rate=0.7)
+    parameters = json.loads(get_algorithm_parameters(create()))
+
+    assert parameters['mutation_rate'] == 0.3 and parameters['crossover_rate'] == 0.7
+    assert 'seed' not in parameters
+    # The runs of a same configuration share their parameters whatever their random seed
+    assert get_algorithm_parameters(create()) == get_algorithm_parameters(create())
+
+def test_tempering_parameters(regions):
+    adjacency_matrix, region_names = regions
+    parameters = json.loads(get_algorithm_parameters(ParallelTemperingAlgorithm(
+        len(region_names), adjacency_matrix, max_colors=4, iterations=100, min_temperature=0.1, max_temperature=2.0, seed=3
+    )))
+    assert parameters == {'max_colors': 4, 'iterations': 100, 'nb_replicas': 16, 'min_temperature': 0.1,
+                          'max_temperature': 2.0, 'swap_interval': 10}
+
+def test_annealing_parameters(regions):
+    adjacency_matrix, region_names = regions
+    parameters = json.loads(get_algorithm_parameters(SimulatedAnnealingAlgorithm(len(region_names), adjacency_matrix, max_colors=4)))
+    # Values derived from the graph, like the moves per level or the estimated temperature, are not arguments
+    assert 'moves_per_level' not in parameters and 'initial_temperature' not in parameters
+    assert parameters['schedule'] == 'geometric'
+
+def test_aggregate_results():
+    summary = aggregate_results(RESULTS).set_index('Algorithm')
+
+    tabu = summary.loc['Recherche tabou']
+    assert tabu['Runs'] == 4 and tabu['Success rate'] == 0.75
+    assert tabu['Time median'] == 2.5
+    assert tabu['Time to target median'] == 2.0
+    # Results without parameters are grouped together
+    pso = summary.loc['PSO']
+    assert pso['Parameters'] == "" and pso['Runs'] == 2 and pso['Success rate'] == 0.5
+
+def test_time_to_target():
+    curves = time_to_target(RESULTS, nb_points=10)
+    tabu = curves[curves['Algorithm'] == 'Recherche tabou']
+
+    assert len(tabu) == 10
+    assert tabu['Time (s)'].iloc[0] == pytest.approx(0.5) and tabu['Time (s)'].iloc[-1] == pytest.approx(8.0)
+    assert np.all(np.diff(tabu['Probability']) >= 0)
+    # The failed run never reaches the target
+    assert tabu['Probability'].iloc[-1] == 0.75
+    assert time_to_target(RESULTS.iloc[:0]).empty
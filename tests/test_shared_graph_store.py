@@ -0,0 +1,45 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+import shared_graph_store
+from shared_graph_store import SharedGraphStore, attach, detach_all
+
+def segment_exists(name: str) -> bool:
+    try:
+        shared_memory.SharedMemory(name=name).close()
+    except FileNotFoundError:
+        return False
+    return True
+
+def test_put_and_attach(regions):
+    adjacency_matrix, _ = regions
+    with SharedGraphStore() as store:
+        descriptor = store.put("Régions", adjacency_matrix=adjacency_matrix)["adjacency_matrix"]
+        shared = attach(descriptor)
+        assert np.array_equal(shared, adjacency_matrix)
+        assert not shared.flags.writeable
+        detach_all()
+    assert not segment_exists(descriptor.name)
+
+def test_failed_put_releases_segments(monkeypatch):
+    created = []
+    original = shared_graph_store.shared_memory.SharedMemory
+
+    def create_segment(*args, **kwargs):
+        # The second segment of the graph can not be created
+        if len(created) == 1:
+            raise OSError("No space left on device")
+        segment = original(*args, **kwargs)
+        created.append(segment.name)
+        return segment
+
+    store = SharedGraphStore()
+    monkeypatch.setattr(shared_graph_store.shared_memory, "SharedMemory", create_segment)
+    with pytest.raises(OSError):
+        store.put("graph", indptr=np.arange(4), indices=np.arange(3))
+    monkeypatch.undo()
+
+    assert created and not any(segment_exists(name) for name in created)
+    assert "graph" not in store.graphs
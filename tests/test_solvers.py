@@ -0,0 +1,48 @@
+import random
+
+import numpy as np
+import pytest
+
+from app.HybridEvolutionaryAlgorithm import HybridEvolutionaryAlgorithm
+from app.IslandGeneticAlgorithm import IslandGeneticAlgorithm
+from app.MultilevelAlgorithm import MultilevelAlgorithm
+from app.ParallelMinConflictsAlgorithm import ParallelMinConflictsAlgorithm
+from app.ParallelTemperingAlgorithm import ParallelTemperingAlgorithm
+from app.PartialColAlgorithm import PartialColAlgorithm
+from app.SimulatedAnnealingAlgorithm import SimulatedAnnealingAlgorithm
+from utils import get_nb_conflicts
+
+SOLVERS = [
+    (IslandGeneticAlgorithm, {'pop_size': 20, 'nb_generations': 50, 'mutation_rate': 0.5, 'crossover_rate': 0.8, 'seed': 0}),
+    (ParallelTemperingAlgorithm, {'iterations': 2000, 'seed': 0}),
+    (HybridEvolutionaryAlgorithm, {'pop_size': 10, 'nb_generations': 20, 'seed': 0}),
+    (ParallelMinConflictsAlgorithm, {'max_iterations': 1000, 'seed': 0}),
+    (PartialColAlgorithm, {'max_iterations': 1000, 'seed': 0}),
+    (MultilevelAlgorithm, {'algorithm_class': PartialColAlgorithm, 'parameters': {'max_iterations': 1000, 'seed': 0},
+                           'min_nodes': 5, 'seed': 0}),
+    (SimulatedAnnealingAlgorithm, {'iterations': 5000}),
+]
+
+# Solvers drawing a color different from the current one, which must not fail with a single color
+SINGLE_COLOR_SOLVERS = [
+    (ParallelTemperingAlgorithm, {'iterations': 100, 'seed': 0}),
+    (ParallelMinConflictsAlgorithm, {'max_iterations': 100, 'seed': 0}),
+    (SimulatedAnnealingAlgorithm, {'iterations': 100}),
+]
+
+@pytest.mark.parametrize("algorithm_class, parameters", SOLVERS, ids=[solver.__name__ for solver, _ in SOLVERS])
+def test_colors_regions(regions, algorithm_class, parameters):
+    adjacency_matrix, region_names = regions
+    random.seed(0)
+    np.random.seed(0)
+    algorithm = algorithm_class(nb_nodes=len(region_names), adjacency_matrix=adjacency_matrix, max_colors=4, **parameters)
+    solution = algorithm.launch()
+
+    assert len(solution) == len(region_names)
+    assert get_nb_conflicts(adjacency_matrix, solution, len(region_names)) == 0
+
+@pytest.mark.parametrize("algorithm_class, parameters", SINGLE_COLOR_SOLVERS, ids=[solver.__name__ for solver, _ in SINGLE_COLOR_SOLVERS])
+def test_single_color(regions, algorithm_class, parameters):
+    adjacency_matrix, region_names = regions
+    algorithm = algorithm_class(nb_nodes=len(region_names), adjacency_matrix=adjacency_matrix, max_colors=1, **parameters)
+    assert algorithm.launch() == [0] * len(region_names)
@@ -0,0 +1,70 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from app.SimulatedAnnealingAlgorithm import SimulatedAnnealingAlgorithm
+from utils import get_conflicts_lower_bound, get_max_clique, get_nb_conflicts, get_nb_conflicts_bitset, pack_adjacency
+
+def random_graph(nb_nodes: int, density: float, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    adjacency_matrix = np.triu(rng.random((nb_nodes, nb_nodes)) < density, 1).astype(np.uint8)
+    return adjacency_matrix + adjacency_matrix.T
+
+@pytest.mark.parametrize("nb_nodes", [1, 7, 8, 13, 64, 101])
+def test_bitset_conflicts(nb_nodes):
+    adjacency_matrix = random_graph(nb_nodes, 0.3, seed=nb_nodes)
+    packed_adjacency = pack_adjacency(adjacency_matrix)
+    rng = np.random.default_rng(0)
+    for max_colors in (1, 3, 8):
+        solution = rng.integers(0, max_colors, size=nb_nodes, dtype=np.uint8)
+        assert get_nb_conflicts_bitset(packed_adjacency, solution, max_colors) == get_nb_conflicts(adjacency_matrix, solution, nb_nodes)
+
+def test_bitset_conflicts_regions(regions):
+    adjacency_matrix, region_names = regions
+    solution = np.zeros(len(region_names), dtype=np.uint8)
+    # With a single color every border is a conflict
+    assert get_nb_conflicts_bitset(pack_adjacency(adjacency_matrix), solution, 1) == adjacency_matrix.sum() // 2
+
+def is_clique(adjacency_matrix: np.ndarray, nodes: list[int]) -> bool:
+    return all(adjacency_matrix[i, j] for i, j in itertools.combinations(nodes, 2))
+
+def test_max_clique_planted():
+    adjacency_matrix = random_graph(60, 0.1, seed=1)
+    planted = [3, 11, 17, 25, 40, 52]
+    for i, j in itertools.combinations(planted, 2):
+        adjacency_matrix[i, j] = adjacency_matrix[j, i] = 1
+
+    clique = get_max_clique(adjacency_matrix)
+    assert is_clique(adjacency_matrix, clique)
+    assert len(clique) >= len(planted)
+
+def test_max_clique_regions(regions):
+    adjacency_matrix, region_names = regions
+    clique = get_max_clique(adjacency_matrix)
+    largest = max(size for size in range(1, 6)
+                  if any(is_clique(adjacency_matrix, nodes) for nodes in itertools.combinations(range(len(region_names)), size)))
+    assert is_clique(adjacency_matrix, clique) and len(clique) == largest
+
+def test_max_clique_without_edges():
+    assert len(get_max_clique(np.zeros((5, 5), dtype=np.uint8))) == 1
+    assert get_max_clique(np.zeros((0, 0), dtype=np.uint8)) == []
+
+@pytest.mark.parametrize("clique_size, max_colors", [(3, 4), (4, 4), (5, 4), (7, 3), (4, 1), (6, 2)])
+def test_conflicts_lower_bound(clique_size, max_colors):
+    # The fewest conflicts of a clique over every coloring
+    fewest = min(
+        sum(colors[i] == colors[j] for i, j in itertools.combinations(range(clique_size), 2))
+        for colors in itertools.product(range(max_colors), repeat=clique_size)
+    )
+    assert get_conflicts_lower_bound(clique_size, max_colors) == fewest
+
+def test_solver_stops_at_lower_bound():
+    # Five nodes all adjacent need at least one conflict with four colors
+    adjacency_matrix = np.ones((5, 5), dtype=np.uint8) - np.eye(5, dtype=np.uint8)
+    algorithm = SimulatedAnnealingAlgorithm(5, adjacency_matrix, max_colors=4, iterations=100000)
+    algorithm.target_conflicts = get_conflicts_lower_bound(len(get_max_clique(adjacency_matrix)), 4)
+    solution = algorithm.launch()
+
+    assert get_nb_conflicts(adjacency_matrix, solution, 5) == algorithm.target_conflicts == 1
+    assert algorithm.iteration < algorithm.iterations
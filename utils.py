@@ -20,11 +20,176 @@ def get_nb_conflicts(adjacency_matrix, solution, nb_nodes) -> int:
 
     return conflicts
 
+def get_adjacency_lists(adjacency_matrix: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Converts an adjacency matrix into adjacency lists in CSR form: the neighbours of
+    node i are `indices[indptr[i]:indptr[i + 1]]`.
+
+    Args:
+        adjacency_matrix (np.ndarray): The adjacency matrix of the graph.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The (nb_nodes + 1) offsets and the neighbours.
+    """
+    rows, indices = np.nonzero(adjacency_matrix == 1)
+    return np.searchsorted(rows, np.arange(len(adjacency_matrix) + 1)), indices
+
+def get_adjacency_matrix(indptr: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """
+    Converts adjacency lists in CSR form back into a dense adjacency matrix.
+
+    Args:
+        indptr (np.ndarray), indices (np.ndarray): The graph in CSR form.
+
+    Returns:
+        np.ndarray: The (nb_nodes x nb_nodes) adjacency matrix.
+    """
+    nb_nodes = len(indptr) - 1
+    adjacency_matrix = np.zeros((nb_nodes, nb_nodes), dtype=np.uint8)
+    adjacency_matrix[np.repeat(np.arange(nb_nodes), np.diff(indptr)), indices] = 1
+    return adjacency_matrix
+
+def get_max_clique(adjacency_matrix: np.ndarray, nb_starts: int = 64) -> list[int]:
+    """
+    Finds a large clique with a greedy heuristic: starting from each of the `nb_starts`
+    nodes of highest degree, the clique is extended with the candidate having the most
+    neighbours among the remaining candidates, until no candidate is left.
+
+    The clique is not always maximum, but its size is a valid lower bound of the
+    chromatic number: the nodes of a clique all need different colors.
+
+    Args:
+        adjacency_matrix (np.ndarray): The adjacency matrix of the graph.
+        nb_starts (int): The number of starting nodes.
+
+    Returns:
+        list[int]: The nodes of the largest clique found.
+    """
+    neighbors = adjacency_matrix == 1
+    np.fill_diagonal(neighbors, False)
+    degrees = neighbors.sum(axis=1)
+
+    best_clique = [int(np.argmax(degrees))] if len(degrees) else []
+    for start in np.argsort(-degrees, kind="stable")[:nb_starts]:
+        # A clique containing the start node is not larger than its degree + 1
+        if degrees[start] + 1 <= len(best_clique):
+            break
+        clique = [int(start)]
+        candidates = np.flatnonzero(neighbors[start])
+        while len(candidates) > 0:
+            inner_degrees = neighbors[np.ix_(candidates, candidates)].sum(axis=1)
+            if len(clique) + inner_degrees.max() + 1 <= len(best_clique):
+                break
+            node = candidates[np.argmax(inner_degrees)]
+            clique.append(int(node))
+            candidates = candidates[neighbors[node, candidates]]
+        if len(clique) > len(best_clique):
+            best_clique = clique
+    return best_clique
+
+def get_conflicts_lower_bound(clique_size: int, max_colors: int) -> int:
+    """
+    Lower bound of the number of conflicts of any coloring with `max_colors` colors,
+    given a clique of the graph: the fewest conflicts inside the clique are obtained by
+    spreading its nodes as evenly as possible over the colors.
+
+    Args:
+        clique_size (int): The size of a clique of the graph (see `get_max_clique`).
+        max_colors (int): The number of colors.
+
+    Returns:
+        int: The number of conflicts below which no algorithm can go, 0 if the clique
+             fits in the colors.
+    """
+    size, nb_larger = divmod(clique_size, max_colors)
+    return nb_larger * (size + 1) * size // 2 + (max_colors - nb_larger) * size * (size - 1) // 2
+
+# Number of bits set in each byte, used to count the bits of packed bit vectors
+POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+def pack_adjacency(adjacency_matrix: np.ndarray) -> np.ndarray:
+    """
+    Packs each row of the adjacency matrix into a bit vector.
+
+    Args:
+        adjacency_matrix (np.ndarray): The (nb_nodes x nb_nodes) adjacency matrix.
+
+    Returns:
+        np.ndarray: A (nb_nodes x ceil(nb_nodes / 8)) uint8 array, where row i is the
+                    neighbourhood of node i packed 8 nodes per byte.
+    """
+    return np.packbits(adjacency_matrix.astype(bool), axis=1)
+
+def pack_color_classes(solution: np.ndarray, max_colors: int) -> np.ndarray:
+    """
+    Packs each color class of a solution into a bit vector.
+
+    Args:
+        solution (np.ndarray): The color of each node.
+        max_colors (int): The number of colors.
+
+    Returns:
+        np.ndarray: A (max_colors x ceil(nb_nodes / 8)) uint8 array, where row c is the
+                    set of nodes having the color c.
+    """
+    solution = np.asarray(solution)
+    return np.packbits(solution[None, :] == np.arange(max_colors)[:, None], axis=1)
+
+def get_nb_conflicts_bitset(packed_adjacency: np.ndarray, solution: np.ndarray, max_colors: int) -> int:
+    """
+    Computes the number of conflicts in the solution with bitsets: the conflicts of
+    a node are the bits set in the AND of its packed neighbourhood and its packed
+    color class.
+
+    Args:
+        packed_adjacency (np.ndarray): The packed adjacency matrix (see `pack_adjacency`).
+        solution (np.ndarray): The color of each node.
+        max_colors (int): The number of colors.
+
+    Returns:
+        conflicts (int) : the number of conflicts in the solution
+    """
+    color_classes = pack_color_classes(solution, max_colors)
+    same_class_neighbors = packed_adjacency & color_classes[np.asarray(solution)]
+    return int(POPCOUNT_TABLE[same_class_neighbors].sum(dtype=np.int64)) // 2
+
+def get_graph_diff(
+        old_adjacency: np.ndarray,
+        old_names: list[str],
+        new_adjacency: np.ndarray,
+        new_names: list[str]
+    ) -> dict[str, list]:
+    """
+    Computes the nodes and edges added and removed between two graphs.
+
+    Args:
+        old_adjacency (np.ndarray): The adjacency matrix of the old graph.
+        old_names (list[str]): The names of the nodes of the old graph.
+        new_adjacency (np.ndarray): The adjacency matrix of the new graph.
+        new_names (list[str]): The names of the nodes of the new graph.
+
+    Returns:
+        dict[str, list]: The 'added_nodes', 'removed_nodes', 'added_edges' and 'removed_edges'
+                         of the diff, edges being pairs of names.
+    """
+    def edges(adjacency: np.ndarray, names: list[str]) -> set[tuple[str, str]]:
+        return {tuple(sorted((names[i], names[j]))) for i, j in zip(*np.nonzero(np.triu(adjacency)))}
+
+    old_edges = edges(old_adjacency, old_names)
+    new_edges = edges(new_adjacency, new_names)
+    return {
+        'added_nodes': [name for name in new_names if name not in set(old_names)],
+        'removed_nodes': [name for name in old_names if name not in set(new_names)],
+        'added_edges': sorted(new_edges - old_edges),
+        'removed_edges': sorted(old_edges - new_edges),
+    }
+
 def save_results_to_csv(
         algorithm: str,
         map_choice: str,
         elapsed_time: float,
-        nb_conflicts: int
+        nb_conflicts: int,
+        parameters: str = ""
     ) -> None:
     """
     Save the results of the graph coloring algorithm to a CSV file.
@@ -39,6 +204,7 @@ def save_results_to_csv(
         map_choice (str): The map choice ('Regions' or 'Departments').
         elapsed_time (float): The time taken for the algorithm to complete, in seconds.
         nb_conflicts (int): The number of conflicts found during the solution process.
+        parameters (str): The parameters of the algorithm (see `get_algorithm_parameters`).
     
     Returns:
         None: This function does not return any value. It writes to a file.
@@ -47,6 +213,13 @@ def save_results_to_csv(
     # Check if the file already exists
     file_path = 'data/results.csv'
     file_exists = os.path.exists(file_path)
+
+    # Files written before the parameters were recorded get the new column
+    if file_exists:
+        with open(file_path, encoding='utf-8') as file:
+            header = file.readline().strip().split(',')
+        if 'Parameters' not in header:
+            pd.read_csv(file_path).assign(Parameters="").to_csv(file_path, index=False)
     
     # Open file in append mode
     with open(file_path, mode='a', newline='', encoding='utf-8') as file:
@@ -54,22 +227,25 @@ def save_results_to_csv(
         
         # If the file doesn't exist, write the header
         if not file_exists:
-            writer.writerow(['Algorithm', 'Map', 'Computation Time (s)', 'Number of Conflicts'])
+            writer.writerow(['Algorithm', 'Map', 'Computation Time (s)', 'Number of Conflicts', 'Parameters'])
         
         # Save results
-        writer.writerow([algorithm, map_choice, elapsed_time, nb_conflicts])
+        writer.writerow([algorithm, map_choice, elapsed_time, nb_conflicts, parameters])
 
-def read_results_from_csv() -> pd.DataFrame:
+def read_results_from_csv(file_path: str = 'data/results.csv') -> pd.DataFrame:
     """
     Reads the results from the 'data/results.csv' file and returns them as a pandas DataFrame.
     
     If the file does not exist or is empty, an empty DataFrame is returned.
 
+    Args:
+        file_path (str): The path of the results file.
+
     Returns:
         pd.DataFrame: A pandas DataFrame containing the algorithm results, with columns:
-                      'Algorithm', 'Map', 'Computation Time (s)', 'Number of Conflicts'.
+                      'Algorithm', 'Map', 'Computation Time (s)', 'Number of Conflicts'
+                      and 'Parameters' when it was recorded.
     """
-    file_path = 'data/results.csv'
 
     # Check if the file exists
     if not os.path.exists(file_path):
@@ -78,4 +254,47 @@ def read_results_from_csv() -> pd.DataFrame:
     # Read the CSV file into a pandas DataFrame
     df = pd.read_csv(file_path)
 
-    return df
\ No newline at end of file
+    return df
+
+def save_profile_to_csv(
+        algorithm: str,
+        map_choice: str,
+        rows: list[tuple[str, str, float]]
+    ) -> None:
+    """
+    Save the timers and counters of an instrumented run to the 'data/profiles.csv' file.
+
+    Args:
+        algorithm (str): The name of the algorithm used.
+        map_choice (str): The map choice ('Regions' or 'Departments').
+        rows (list[tuple[str, str, float]]): The (kind, name, value) rows returned by
+                                             `Instrumentation.to_rows`.
+
+    Returns:
+        None: This function does not return any value. It writes to a file.
+    """
+    file_path = 'data/profiles.csv'
+    file_exists = os.path.exists(file_path)
+
+    with open(file_path, mode='a', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+
+        if not file_exists:
+            writer.writerow(['Algorithm', 'Map', 'Kind', 'Name', 'Value'])
+
+        for kind, name, value in rows:
+            writer.writerow([algorithm, map_choice, kind, name, value])
+
+def read_profiles_from_csv() -> pd.DataFrame:
+    """
+    Reads the instrumented runs from the 'data/profiles.csv' file.
+
+    Returns:
+        pd.DataFrame: A pandas DataFrame with columns 'Algorithm', 'Map', 'Kind', 'Name', 'Value'.
+    """
+    file_path = 'data/profiles.csv'
+
+    if not os.path.exists(file_path):
+        return pd.DataFrame(columns=['Algorithm', 'Map', 'Kind', 'Name', 'Value'])
+
+    return pd.read_csv(file_path)